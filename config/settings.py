@@ -1,4 +1,5 @@
 from pydantic_settings import BaseSettings
+from typing import Dict, Optional
 
 
 class Settings(BaseSettings):
@@ -8,6 +9,77 @@ class Settings(BaseSettings):
     max_retries: int = 3
     user_agent: str = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
 
+    # Page detail: timeout par extracteur, surcharges par section et budget global (secondes)
+    extractor_timeout: float = 10.0
+    section_timeouts: Dict[str, float] = {}
+    details_budget: float = 45.0
+
+    # Onglets paralleles du processus (get_many, /hotel_details/batch): plafond, budget de tas JS
+    # (Mo, mesure CDP; non calibre contre la RSS de Chromium) qui ajuste la limite, taille max d'un lot
+    details_max_tabs: int = 4
+    details_tab_heap_budget_mb: float = 512
+    details_batch_size: int = 20
+
+    # Ordonnanceur des scrapes: slots simultanes, attente max en file par classe de priorite
+    # (secondes, scrape abandonne au-dela) et vieillissement (une classe gagnee par periode d'attente)
+    scheduler_slots: int = 6
+    scheduler_deadlines: Dict[str, float] = {"interactive": 30, "batch": 300, "background": 900}
+    scheduler_aging: float = 20
+    # Admission: scrapes en file au-dela desquels un nouveau scrape est refuse (503 + Retry-After),
+    # memoire disponible minimale (Mo) pour en lancer un de plus, fenetre de mesure du debit (secondes)
+    admission_max_queue: int = 20
+    admission_min_free_mb: float = 768
+    admission_window: float = 60
+
+    # Chemin rapide httpx (page detail sans Chromium quand le HTML serveur suffit)
+    fast_path: bool = True
+
+    # Sessions navigateur pre-chauffees (storage_state: cookies de consentement, premiere visite)
+    session_reuse: bool = True
+    session_pool_size: int = 3
+    session_max_age: float = 12 * 3600
+    session_max_uses: int = 200
+
+    # Client httpx partage (chemin rapide, images)
+    http2: bool = True
+    http_max_connections: int = 20
+
+    # Pipeline d'images: stockage, connexions par hote, seuil de quasi-doublon (bits sur 64)
+    assets_dir: str = "data/assets"
+    assets_per_host: int = 6
+    assets_hash_threshold: int = 6
+
+    # Liste d'avis paginee (/reviewlist.html): taille de page, pages en vol, avis par page detail
+    reviews_page_size: int = 25
+    reviews_concurrency: int = 4
+    details_reviews_limit: int = 100
+
+    # Donnees persistees (store d'avis...) et fraicheur des avis (secondes)
+    data_dir: str = "data"
+    reviews_ttl: float = 6 * 3600
+    # Cache des recherches re-filtrables localement (secondes, nombre de resultats gardes)
+    search_cache_ttl: float = 15 * 60
+    search_cache_size: int = 256
+
+    # Journal des requetes API (JSON lines, vide = desactive; tourne au-dela de request_log_max_mb) et
+    # prechauffage des caches qui s'en nourrit: combinaisons retenues, fenetre d'analyse (jours), delai apres
+    # demarrage et intervalle entre passes (secondes)
+    request_log_path: Optional[str] = "data/requests.jsonl"
+    request_log_max_mb: float = 64
+    warmer_enabled: bool = True
+    warmer_top: int = 20
+    warmer_window_days: float = 7
+    warmer_delay: float = 30
+    warmer_interval: float = 600
+
+    # Requetes geographiques: une zone sans hotel vu depuis spatial_ttl est perimee; une ville dont
+    # la derniere recherche n'a donne aucune coordonnee n'est pas re-cherchee avant spatial_refresh_cooldown
+    spatial_ttl: float = 24 * 3600
+    spatial_refresh_cooldown: float = 3600
+
+    # Traces de scraping (fichier OTLP/JSON, une trace par ligne)
+    trace_export_path: Optional[str] = None
+
     class Config:
         env_file = ".env"
 
@@ -1,19 +1,61 @@
-from fastapi import FastAPI
-from src.api.routes import search, details
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request, Response
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+from config.settings import settings
+from src.api.routes import search, details, reviews, hotels, assets, export, cache, scheduler
+from src.utils.http_client import close_http_client
+from src.utils.metrics import monitor_event_loop_lag
+from src.utils.request_log import get_request_log
+from src.warmer import get_cache_warmer
+import asyncio
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    lag_monitor = asyncio.create_task(monitor_event_loop_lag())
+    # Prechauffage de fond a partir du journal des requetes (priorite basse)
+    warmer = None
+    if settings.warmer_enabled and settings.request_log_path:
+        warmer = asyncio.create_task(get_cache_warmer().run(settings.warmer_delay, settings.warmer_interval))
+    yield
+    lag_monitor.cancel()
+    if warmer is not None:
+        warmer.cancel()
+    await close_http_client()
+    get_request_log().close()
+
 
 app = FastAPI(
     title="Travliaq Booking Scraper API",
     description="API de scraping Booking.com pour hotels",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 app.include_router(search.router, prefix="/api/v1", tags=["search"])
 app.include_router(details.router, prefix="/api/v1", tags=["details"])
+app.include_router(reviews.router, prefix="/api/v1", tags=["reviews"])
+app.include_router(hotels.router, prefix="/api/v1", tags=["hotels"])
+app.include_router(assets.router, prefix="/api/v1", tags=["assets"])
+app.include_router(export.router, prefix="/api/v1", tags=["export"])
+app.include_router(cache.router, prefix="/api/v1", tags=["cache"])
+app.include_router(scheduler.router, prefix="/api/v1", tags=["scheduler"])
+
+
+@app.middleware("http")
+async def log_requests(request: Request, call_next):
+    """Journal des requetes API (alimente le prechauffage des caches)."""
+    return await get_request_log().track(request, call_next)
 
 @app.get("/")
 async def root():
     return {
         "service": "Travliaq Booking Scraper API",
         "version": "1.0.0",
-        "endpoints": ["/api/v1/search_hotels", "/api/v1/hotel_details"]
+        "endpoints": ["/api/v1/search_hotels", "/api/v1/hotel_details", "/api/v1/hotel_details/batch", "/api/v1/hotel_reviews", "/api/v1/hotels/nearby", "/api/v1/hotels/bbox", "/api/v1/export/search_hotels", "/api/v1/export/hotel_rooms", "/api/v1/cache/warmer", "/api/v1/scheduler", "/metrics"]
     }
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Metriques Prometheus (latences par etape, retries, pool navigateurs...)."""
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
@@ -0,0 +1,85 @@
+"""
+Serialisation JSON rapide (orjson) et projection `fields=` des reponses.
+
+Les handlers renvoient directement une ORJSONResponse: le modele deja valide
+par le scraper n'est pas revalide par le chemin `response_model` de FastAPI,
+et `fields=` limite le dump pydantic aux champs demandes.
+
+Syntaxe de `fields`: chemins separes par des virgules, la notation pointee
+descend dans les sous-modeles et les listes (ex: `name,rooms.price,address.city`).
+"""
+
+from typing import Any, Dict, List, Optional, Type, Union, get_args, get_origin
+
+from fastapi import HTTPException
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel
+
+from src.scrapers.scheduler import Overloaded
+
+Include = Dict[str, Any]
+
+
+def _submodel(annotation) -> Optional[Type[BaseModel]]:
+    """Modele pydantic porte par une annotation (Optional[X], List[X], X)."""
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return annotation
+    if get_origin(annotation) in (list, List, Union):
+        for arg in get_args(annotation):
+            model = _submodel(arg)
+            if model is not None:
+                return model
+    return None
+
+
+def _is_list(annotation) -> bool:
+    if get_origin(annotation) in (list, List):
+        return True
+    return get_origin(annotation) is Union and any(_is_list(arg) for arg in get_args(annotation))
+
+
+def _add_path(model: Type[BaseModel], include: Include, path: List[str], full: str):
+    name, rest = path[0], path[1:]
+    field = model.model_fields.get(name)
+    if field is None:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Champ inconnu dans fields: {full} (valides: {', '.join(model.model_fields)})"
+        )
+    if not rest:
+        include[name] = True
+        return
+    submodel = _submodel(field.annotation)
+    if submodel is None:
+        raise HTTPException(status_code=422, detail=f"Champ non imbrique dans fields: {full}")
+    if include.get(name) is True:
+        return  # champ deja demande en entier
+
+    if _is_list(field.annotation):
+        nested = include.setdefault(name, {"__all__": {}})["__all__"]
+    else:
+        nested = include.setdefault(name, {})
+    _add_path(submodel, nested, rest, full)
+
+
+def parse_fields(model: Type[BaseModel], fields: Optional[str]) -> Optional[Include]:
+    """`fields=` -> argument `include` de model_dump (None = tous les champs)."""
+    if not fields:
+        return None
+    include: Include = {}
+    for item in fields.split(","):
+        item = item.strip()
+        if item:
+            _add_path(model, include, item.split("."), item)
+    return include or None
+
+
+def json_response(model: BaseModel, include: Optional[Include] = None, status_code: int = 200) -> ORJSONResponse:
+    """Reponse orjson du modele, projetee sur `include` (voir parse_fields)."""
+    return ORJSONResponse(model.model_dump(mode="json", include=include), status_code=status_code)
+
+
+def unavailable(error: Overloaded, prefix: str = "Service surcharge") -> HTTPException:
+    """503 + Retry-After pour un scrape refuse ou abandonne par l'ordonnanceur."""
+    return HTTPException(status_code=503, detail=f"{prefix}: {str(error)}",
+                         headers={"Retry-After": str(error.retry_after)})
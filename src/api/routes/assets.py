@@ -0,0 +1,15 @@
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import FileResponse
+from src.assets import get_asset_pipeline
+
+router = APIRouter()
+
+
+@router.get("/assets/{path:path}", include_in_schema=False)
+async def get_asset(path: str):
+    """Sert une image stockee par le pipeline (chemin `ImageAsset.path`)."""
+    root = get_asset_pipeline().storage_dir.resolve()
+    target = (root / path).resolve()
+    if root not in target.parents or not target.is_file():
+        raise HTTPException(status_code=404, detail="Image introuvable")
+    return FileResponse(target)
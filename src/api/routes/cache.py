@@ -0,0 +1,13 @@
+from fastapi import APIRouter, Depends
+from src.warmer import CacheWarmer, get_cache_warmer
+
+router = APIRouter()
+
+
+@router.get("/cache/warmer")
+async def warmer_report(warmer: CacheWarmer = Depends(get_cache_warmer)):
+    """
+    Rapport du prechauffage: passes effectuees, entrees prechauffees et part des
+    consultations de cache servies par une entree prechauffee (warm_hit_ratio).
+    """
+    return warmer.report()
@@ -1,25 +1,56 @@
-from fastapi import APIRouter, HTTPException, Query
-from src.models.hotel import HotelDetailsRequest, HotelDetails
+from fastapi import APIRouter, Depends, HTTPException, Query
+from src.models.hotel import (
+    HotelDetails, HotelDetailsBatch, HotelDetailsBatchRequest, HotelDetailsBatchResult, HotelDetailsRequest
+)
+from src.api.responses import json_response, parse_fields, unavailable
+from src.assets import get_asset_pipeline
 from src.scrapers.details import DetailsScraper
-from typing import Optional
+from src.scrapers.scheduler import Overloaded, Priority, get_scheduler
+from src.storage import HotelRegistry, get_hotel_registry, get_reviews_store, record_quietly
+from config.settings import settings
+from typing import List, Optional
+from pydantic import ValidationError
+import logging
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
 
+def _store(registry: HotelRegistry, request: HotelDetailsRequest, details: HotelDetails, reviews: List):
+    registry.record_details(details, request.country_code)
+    # Les avis extraits alimentent le store servi par /hotel_reviews
+    if reviews:
+        get_reviews_store().add(request.hotel_id, reviews, mark_fetched=False)
+
+
+async def _record(registry: HotelRegistry, request: HotelDetailsRequest, details: HotelDetails, reviews: List):
+    await record_quietly(f"details {request.hotel_id}", _store, registry, request, details, reviews)
+
+
 @router.get("/hotel_details", response_model=HotelDetails)
 async def get_hotel_details(
-        hotel_id: str = Query(..., description="ID de l'hotel (ex: moder-flat-heart-of-iveme)"),
-        country_code: Optional[str] = Query("fr", description="Code pays (ex: fr, gb, us)"),
+        hotel_id: str = Query(..., description="Slug ou id numerique Booking (ex: moder-flat-heart-of-iveme)"),
+        country_code: Optional[str] = Query(None, description="Code pays (ex: fr, gb, us); deduit du registre si omis"),
         checkin: Optional[str] = Query(None, description="Date checkin (YYYY-MM-DD) pour prix chambres"),
         checkout: Optional[str] = Query(None, description="Date checkout (YYYY-MM-DD)"),
         adults: Optional[int] = Query(2, description="Nombre d'adultes"),
-        rooms: Optional[int] = Query(1, description="Nombre de chambres")
+        rooms: Optional[int] = Query(1, description="Nombre de chambres"),
+        sections: Optional[str] = Query(None, description="Sections a extraire, separees par des virgules (ex: rooms,images)"),
+        assets: bool = Query(False, description="Telecharger et dedupliquer les images de la galerie"),
+        fields: Optional[str] = Query(None, description="Champs renvoyes, notation pointee (ex: name,rooms.price,address.city)"),
+        registry: HotelRegistry = Depends(get_hotel_registry)
 ):
     """
     Recupere les details complets d'un hotel specifique.
 
     Exemple: /hotel_details?hotel_id=moder-flat-heart-of-iveme&country_code=fr&checkin=2025-12-12&checkout=2025-12-15&adults=2
     """
+    include = parse_fields(HotelDetails, fields)
+    try:
+        hotel_id, country_code = registry.resolve(hotel_id, country_code)
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Hotel {hotel_id} inconnu du registre (lancer une recherche d'abord)")
     try:
         request = HotelDetailsRequest(
             hotel_id=hotel_id,
@@ -27,12 +58,74 @@ async def get_hotel_details(
             checkin=checkin,
             checkout=checkout,
             adults=adults,
-            rooms=rooms
+            rooms=rooms,
+            sections=sections
         )
+    except ValidationError as e:
+        raise HTTPException(status_code=422, detail=str(e))
 
+    try:
         async with DetailsScraper() as scraper:
             details, reviews = await scraper.get_hotel_details(request)
-            return details
+        await _record(registry, request, details, reviews)
 
+        # Etape optionnelle: un echec du pipeline d'images ne fait pas echouer la requete
+        if assets and details.images:
+            try:
+                details.image_assets = await get_asset_pipeline().process(details.images)
+            except Exception as e:
+                logger.warning(f"Pipeline d'images en echec pour {request.hotel_id}: {e}")
+        return json_response(details, include)
+
+    except Overloaded as e:
+        raise unavailable(e, "Erreur scraping details")
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Erreur scraping details: {str(e)}")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"Erreur scraping details: {str(e)}")
+
+
+@router.post("/hotel_details/batch", response_model=HotelDetailsBatch)
+async def get_hotel_details_batch(
+        batch: HotelDetailsBatchRequest,
+        registry: HotelRegistry = Depends(get_hotel_registry)
+):
+    """
+    Details de plusieurs hotels en un appel: un seul navigateur, un onglet par
+    hotel (DETAILS_MAX_TABS en parallele, limite abaissee selon la memoire
+    mesuree par onglet). Un hotel en echec n'empeche pas les autres: son erreur
+    est renvoyee a sa place.
+
+    Exemple: {"hotels": [{"hotel_id": "le-grand-hotel-lyon"}, {"hotel_id": "123456", "checkin": "2025-12-12", "checkout": "2025-12-15"}]}
+    """
+    if len(batch.hotels) > settings.details_batch_size:
+        raise HTTPException(status_code=422, detail=f"Lot limite a {settings.details_batch_size} hotels")
+
+    results = [HotelDetailsBatchResult(hotel_id=item.hotel_id) for item in batch.hotels]
+    requests = {}
+    for index, item in enumerate(batch.hotels):
+        try:
+            hotel_id, country_code = registry.resolve(item.hotel_id, item.country_code)
+        except KeyError:
+            results[index].error = "Hotel inconnu du registre (lancer une recherche d'abord)"
+            continue
+        requests[index] = item.model_copy(update={"hotel_id": hotel_id, "country_code": country_code})
+
+    if requests:
+        try:
+            get_scheduler().admit(Priority.BATCH)
+            async with DetailsScraper() as scraper:
+                outcomes = await scraper.get_many(list(requests.values()))
+        except Overloaded as e:
+            raise unavailable(e, "Erreur scraping details")
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Erreur scraping details: {str(e)}")
+
+        for (index, request), outcome in zip(requests.items(), outcomes):
+            if isinstance(outcome, BaseException):
+                results[index].error = f"Erreur scraping details: {str(outcome)}"
+                continue
+            details, reviews = outcome
+            await _record(registry, request, details, reviews)
+            results[index].details = details
+
+    succeeded = sum(1 for r in results if r.details is not None)
+    return json_response(HotelDetailsBatch(results=results, succeeded=succeeded, failed=len(results) - succeeded))
@@ -0,0 +1,84 @@
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse
+from starlette.background import BackgroundTask
+from src.export import FORMATS, export_table, hotel_rows, price_rows, room_rows
+from src.models.hotel import HotelDetailsRequest
+from src.models.search import HotelSearchRequest
+from src.scrapers.details import DetailsScraper
+from src.scrapers.scheduler import Overloaded, Priority
+from src.api.responses import unavailable
+from src.scrapers.search import SearchScraper
+from src.storage import get_hotel_registry, record_quietly
+from datetime import date
+from typing import Iterable, Optional
+import os
+import tempfile
+
+router = APIRouter()
+
+MEDIA_TYPES = {"parquet": "application/vnd.apache.parquet", "arrow": "application/vnd.apache.arrow.file"}
+FORMAT_PATTERN = f"^({'|'.join(FORMATS)})$"
+
+
+async def _export_file(table: str, rows: Iterable[dict], fmt: str, name: str) -> FileResponse:
+    """Ecrit la table dans un fichier temporaire supprime apres l'envoi."""
+    fd, path = tempfile.mkstemp(suffix=f".{fmt}")
+    os.close(fd)
+    try:
+        await run_in_threadpool(export_table, table, rows, path, fmt)
+    except Exception:
+        os.unlink(path)
+        raise
+    return FileResponse(path, media_type=MEDIA_TYPES[fmt], filename=f"{name}.{fmt}",
+                        background=BackgroundTask(os.unlink, path))
+
+
+@router.get("/export/search_hotels")
+async def export_search_hotels(
+    city: str,
+    checkin: date,
+    checkout: date,
+    adults: int = 2,
+    children: int = 0,
+    rooms: int = 1,
+    table: str = Query("hotels", pattern="^(hotels|prices)$", description="hotels (resultats) ou prices (points de prix)"),
+    format: str = Query("parquet", pattern=FORMAT_PATTERN, description="parquet ou arrow (IPC)")
+):
+    """Resultats d'une recherche en table colonnaire (Parquet / Arrow)."""
+    try:
+        request = HotelSearchRequest(city=city, checkin=checkin, checkout=checkout,
+                                     adults=adults, children=children, rooms=rooms)
+        async with SearchScraper() as scraper:
+            result = await scraper.search_hotels(request, Priority.BATCH)
+        await record_quietly(f"recherche {city}", get_hotel_registry().record_search, result)
+        to_rows = hotel_rows if table == "hotels" else price_rows
+        return await _export_file(table, to_rows([result]), format, f"{table}_{city}_{checkin}")
+
+    except Overloaded as e:
+        raise unavailable(e, "Erreur export")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Erreur export: {str(e)}")
+
+
+@router.get("/export/hotel_rooms")
+async def export_hotel_rooms(
+    hotel_id: str,
+    country_code: str = "fr",
+    checkin: Optional[str] = None,
+    checkout: Optional[str] = None,
+    adults: int = 2,
+    format: str = Query("parquet", pattern=FORMAT_PATTERN, description="parquet ou arrow (IPC)")
+):
+    """Tarifs des chambres d'un hotel en table colonnaire (Parquet / Arrow)."""
+    try:
+        request = HotelDetailsRequest(hotel_id=hotel_id, country_code=country_code, checkin=checkin,
+                                      checkout=checkout, adults=adults, sections=["name", "rooms"])
+        async with DetailsScraper() as scraper:
+            details, _ = await scraper.get_hotel_details(request, Priority.BATCH)
+        return await _export_file("rooms", room_rows([details]), format, f"rooms_{hotel_id}")
+
+    except Overloaded as e:
+        raise unavailable(e, "Erreur export")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Erreur export: {str(e)}")
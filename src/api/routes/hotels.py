@@ -0,0 +1,118 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from src.models.hotel import HotelMatch, HotelRecord, HotelsArea
+from src.models.search import HotelSearchRequest
+from src.scrapers.search import SearchScraper
+from src.storage import HotelRegistry, get_hotel_registry, record_quietly
+from config.settings import settings
+from datetime import date, datetime, timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+# Ville -> instant (time.monotonic()) de la derniere recherche live sans aucune coordonnee
+_unlocated: Dict[str, float] = {}
+
+
+def _is_stale(records: List[HotelRecord]) -> bool:
+    cutoff = (datetime.utcnow() - timedelta(seconds=settings.spatial_ttl)).isoformat()
+    return not any(record.last_seen >= cutoff for record in records)
+
+
+async def refresh_area(registry: HotelRegistry, city: str) -> int:
+    """
+    Recherche live sur la ville (dates proches: seules les coordonnees comptent).
+    Renvoie le nombre d'hotels avec coordonnees (0 quand seul le DOM a repondu).
+    """
+    checkin = date.today() + timedelta(days=1)
+    request = HotelSearchRequest(city=city, checkin=checkin, checkout=checkin + timedelta(days=1), max_results=100)
+    async with SearchScraper() as scraper:
+        result = await scraper.search_hotels(request)
+    await record_quietly(f"recherche {city}", registry.record_search, result)
+    return sum(1 for hotel in result.hotels if hotel.latitude is not None and hotel.longitude is not None)
+
+
+def _recently_unlocated(city: str) -> bool:
+    searched = _unlocated.get(city.strip().lower())
+    return searched is not None and time.monotonic() - searched < settings.spatial_refresh_cooldown
+
+
+async def _area(registry: HotelRegistry, query: Callable[[], List[Tuple[HotelRecord, Optional[float]]]],
+                city: Optional[str]) -> HotelsArea:
+    matches = query()
+    stale, refreshed, skipped = _is_stale([record for record, _ in matches]), False, False
+    if stale and city and _recently_unlocated(city):
+        # Une nouvelle recherche renverrait encore des hotels sans coordonnees
+        skipped = True
+    elif stale and city:
+        try:
+            if await refresh_area(registry, city):
+                _unlocated.pop(city.strip().lower(), None)
+            else:
+                _unlocated[city.strip().lower()] = time.monotonic()
+                logger.warning(f"Recherche sans coordonnees pour {city}: pas de nouvel essai avant "
+                               f"{settings.spatial_refresh_cooldown:.0f}s")
+            matches = query()
+            stale, refreshed = _is_stale([record for record, _ in matches]), True
+        except Exception as e:
+            logger.warning(f"Rafraichissement de zone en echec ({city}): {e}")
+
+    hotels = [
+        HotelMatch(**record.model_dump(), distance_km=round(distance, 3) if distance is not None else None)
+        for record, distance in matches
+    ]
+    return HotelsArea(hotels=hotels, total=len(hotels), stale=stale, refreshed=refreshed, refresh_skipped=skipped)
+
+
+@router.get("/hotels/nearby", response_model=HotelsArea)
+async def hotels_nearby(
+        lat: float = Query(..., ge=-90, le=90, description="Latitude du point"),
+        lon: float = Query(..., ge=-180, le=180, description="Longitude du point"),
+        radius_km: float = Query(2.0, gt=0, le=50, description="Rayon de recherche (km)"),
+        k: Optional[int] = Query(None, ge=1, le=500, description="k plus proches voisins (ignore radius_km)"),
+        limit: int = Query(50, ge=1, le=500, description="Nombre max d'hotels"),
+        city: Optional[str] = Query(None, description="Ville a rechercher si la zone est perimee"),
+        registry: HotelRegistry = Depends(get_hotel_registry)
+):
+    """
+    Hotels connus autour d'un point, du plus proche au plus lointain.
+
+    Servi depuis le registre local; une recherche live sur `city` n'est lancee
+    que si aucun hotel de la zone n'a ete vu depuis SPATIAL_TTL, et pas avant
+    SPATIAL_REFRESH_COOLDOWN si la precedente n'a renvoye aucune coordonnee.
+
+    Exemple: /hotels/nearby?lat=48.8606&lon=2.3376&radius_km=2&city=Paris
+    """
+    if k:
+        return await _area(registry, lambda: registry.nearest(lat, lon, k), city)
+    return await _area(registry, lambda: registry.nearby(lat, lon, radius_km, limit), city)
+
+
+@router.get("/hotels/bbox", response_model=HotelsArea)
+async def hotels_in_bbox(
+        min_lat: float = Query(..., ge=-90, le=90),
+        min_lon: float = Query(..., ge=-180, le=180),
+        max_lat: float = Query(..., ge=-90, le=90),
+        max_lon: float = Query(..., ge=-180, le=180),
+        limit: int = Query(500, ge=1, le=5000, description="Nombre max d'hotels"),
+        city: Optional[str] = Query(None, description="Ville a rechercher si la zone est perimee"),
+        registry: HotelRegistry = Depends(get_hotel_registry)
+):
+    """
+    Hotels connus dans un rectangle lat/lon (min <= max sur chaque axe, sinon 422).
+    Les rectangles qui traversent l'antimeridien ne sont pas pris en charge: les
+    decouper en deux requetes de part et d'autre de +/-180.
+
+    Exemple: /hotels/bbox?min_lat=45.70&min_lon=4.78&max_lat=45.80&max_lon=4.90
+    """
+    if min_lat > max_lat or min_lon > max_lon:
+        raise HTTPException(status_code=422, detail="Rectangle inverse: min_lat <= max_lat et min_lon <= max_lon "
+                                                    "(antimeridien non pris en charge)")
+
+    def query():
+        return [(record, None) for record in registry.within_bbox(min_lat, min_lon, max_lat, max_lon)[:limit]]
+
+    return await _area(registry, query, city)
@@ -0,0 +1,76 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from src.models.hotel import HotelReviewsPage
+from src.scrapers.scheduler import Overloaded
+from src.api.responses import unavailable
+from src.storage import HotelRegistry, ReviewsStore, get_hotel_registry, get_reviews_store
+from src.storage.refresh import refresh_reviews
+from src.utils.metrics import record_cache
+from config.settings import settings
+from typing import Optional
+
+router = APIRouter()
+
+
+@router.get("/hotel_reviews", response_model=HotelReviewsPage)
+async def get_hotel_reviews(
+        hotel_id: str = Query(..., description="Slug ou id numerique Booking (ex: moder-flat-heart-of-iveme)"),
+        country_code: Optional[str] = Query(None, description="Code pays (ex: fr, gb, us); deduit du registre si omis"),
+        cursor: Optional[str] = Query(None, description="Curseur renvoye par la page precedente (next_cursor)"),
+        limit: int = Query(50, ge=1, le=500, description="Nombre d'avis par page"),
+        format: str = Query("json", pattern="^(json|ndjson)$", description="json (page) ou ndjson (flux complet)"),
+        refresh: bool = Query(False, description="Forcer un fetch incremental des avis"),
+        store: ReviewsStore = Depends(get_reviews_store),
+        registry: HotelRegistry = Depends(get_hotel_registry)
+):
+    """
+    Avis clients d'un hotel, du plus recent au plus ancien.
+
+    Les avis sont servis depuis le store et rafraichis (fetch incremental de la
+    liste paginee Booking) lorsqu'ils sont absents ou plus vieux que REVIEWS_TTL.
+
+    Exemple: /hotel_reviews?hotel_id=moder-flat-heart-of-iveme&country_code=fr&limit=100
+    Flux:    /hotel_reviews?hotel_id=moder-flat-heart-of-iveme&format=ndjson
+    """
+    try:
+        hotel_id, country_code = registry.resolve(hotel_id, country_code)
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Hotel {hotel_id} inconnu du registre (lancer une recherche d'abord)")
+
+    fresh = not refresh and store.is_fresh(hotel_id, settings.reviews_ttl)
+    record_cache("reviews", fresh, hotel_id)
+    if not fresh:
+        try:
+            await refresh_reviews(store, hotel_id, country_code)
+        except Exception as e:
+            # Sans avis en store: refus (503 si surcharge), sinon les avis stockes sont servis
+            if store.fetched_at(hotel_id) is None:
+                if isinstance(e, Overloaded):
+                    raise unavailable(e, "Erreur scraping avis")
+                raise HTTPException(status_code=500, detail=f"Erreur scraping avis: {str(e)}")
+
+    try:
+        if format == "ndjson":
+            rows = store.iter_reviews(hotel_id, cursor)
+            first = next(rows, None)
+        else:
+            reviews, next_cursor = store.page(hotel_id, cursor, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+    if format == "ndjson":
+        def stream():
+            if first is not None:
+                yield first.model_dump_json() + "\n"
+            for review in rows:
+                yield review.model_dump_json() + "\n"
+
+        return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+    return HotelReviewsPage(
+        hotel_id=hotel_id,
+        total=store.count(hotel_id),
+        reviews=reviews,
+        next_cursor=next_cursor,
+        fetched_at=store.fetched_at(hotel_id)
+    )
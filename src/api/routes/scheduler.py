@@ -0,0 +1,13 @@
+from fastapi import APIRouter, Depends
+from src.scrapers.scheduler import ScrapeScheduler, get_scheduler
+
+router = APIRouter()
+
+
+@router.get("/scheduler")
+async def scheduler_stats(scheduler: ScrapeScheduler = Depends(get_scheduler)):
+    """
+    Etat de l'ordonnanceur des scrapes: slots occupes, file par priorite, debit
+    recent, Retry-After courant, scrapes abandonnes (echeance) et refuses (admission).
+    """
+    return scheduler.stats()
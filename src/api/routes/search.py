@@ -1,7 +1,14 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
+from src.api.responses import json_response, parse_fields, unavailable
 from src.models.search import HotelSearchRequest, HotelSearchResult
+from src.scrapers.classifier import PageOutcome, PageOutcomeError
+from src.scrapers.scheduler import Overloaded
 from src.scrapers.search import SearchScraper
+from src.storage import get_hotel_registry, get_search_cache, record_quietly
+from src.storage.search_cache import base_key
+from src.utils.metrics import record_cache
 from datetime import date
+from typing import List, Optional
 
 router = APIRouter()
 
@@ -12,13 +19,25 @@ async def search_hotels(
     checkout: date,
     adults: int = 2,
     children: int = 0,
-    rooms: int = 1
+    rooms: int = 1,
+    min_price: Optional[int] = Query(None, description="Prix minimum par nuit (EUR)"),
+    max_price: Optional[int] = Query(None, description="Prix maximum par nuit (EUR)"),
+    min_review_score: Optional[float] = Query(None, description="Note minimum (0-10)"),
+    star_rating: Optional[List[int]] = Query(None, description="Etoiles acceptees (repetable: star_rating=4&star_rating=5)"),
+    sort_by: str = Query("popularity", description="Tri: popularity, price, review_score, distance"),
+    max_results: int = Query(25, description="Nombre max de resultats"),
+    fields: Optional[str] = Query(None, description="Champs renvoyes, notation pointee (ex: total_found,hotels.name,hotels.price)")
 ):
     """
     Recherche des hotels disponibles sur Booking.com
 
     Exemple: /search_hotels?city=Paris&checkin=2025-12-01&checkout=2025-12-05&adults=2
+
+    Une requete qui ne change que le prix, la note, les etoiles, le tri ou le
+    nombre de resultats d'une recherche recente est servie depuis le cache;
+    les scrapes de requetes equivalentes simultanees sont regroupes.
     """
+    include = parse_fields(HotelSearchResult, fields)
     try:
         request = HotelSearchRequest(
             city=city,
@@ -26,12 +45,37 @@ async def search_hotels(
             checkout=checkout,
             adults=adults,
             children=children,
-            rooms=rooms
+            rooms=rooms,
+            min_price=min_price,
+            max_price=max_price,
+            min_review_score=min_review_score,
+            star_rating=star_rating,
+            sort_by=sort_by,
+            max_results=max_results
         )
 
-        async with SearchScraper() as scraper:
-            result = await scraper.search_hotels(request)
-            return result
+        cache = get_search_cache()
+        result = cache.lookup(request)
+        record_cache("search", result is not None, base_key(request))
+        if result is None:
+            async def scrape() -> HotelSearchResult:
+                async with SearchScraper() as scraper:
+                    scraped = await scraper.search_hotels(request)
+                await record_quietly(f"recherche {request.city}", get_hotel_registry().record_search, scraped)
+                return scraped
+
+            # Requetes equivalentes concurrentes: un seul scrape
+            result = await cache.fetch(request, scrape)
+        return json_response(result, include)
 
+    except Overloaded as e:
+        # File saturee ou memoire insuffisante: refus rapide, reessayable apres Retry-After
+        raise unavailable(e, "Erreur scraping")
+    except PageOutcomeError as e:
+        # Challenge/blocage: le client peut reessayer apres Retry-After; erreur de page: amont en echec
+        if e.outcome is PageOutcome.BLOCKED:
+            raise HTTPException(status_code=503, detail=f"Erreur scraping: {str(e)}",
+                                headers={"Retry-After": str(e.retry_after)})
+        raise HTTPException(status_code=502, detail=f"Erreur scraping: {str(e)}")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Erreur scraping: {str(e)}")
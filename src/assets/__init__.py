@@ -0,0 +1,14 @@
+from functools import lru_cache
+
+from config.settings import settings
+from .pipeline import AssetPipeline, dhash, hamming, image_id_from_url
+
+
+@lru_cache
+def get_asset_pipeline() -> AssetPipeline:
+    """Pipeline d'images partage (cache par id commun a toutes les requetes)."""
+    return AssetPipeline(
+        settings.assets_dir,
+        per_host_limit=settings.assets_per_host,
+        hash_threshold=settings.assets_hash_threshold
+    )
@@ -0,0 +1,170 @@
+"""
+Pipeline d'images des galeries d'hotels.
+
+- telechargement via le client httpx partage (pool HTTP/2 ferme par le lifespan
+  de l'API), plafonne par hote
+- cache par identifiant d'image Booking: une image partagee n'est jamais
+  telechargee deux fois (ni en parallele, ni d'un scrape a l'autre)
+- stockage adresse par contenu (sha256) avec dimensions
+- hash perceptuel (dHash 64 bits) pour ecarter les quasi-doublons
+"""
+
+from concurrent.futures import Executor
+from io import BytesIO
+from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+import asyncio
+import hashlib
+import json
+import logging
+import re
+
+import httpx
+from PIL import Image
+
+from src.models.hotel import ImageAsset
+from src.utils.http_client import get_http_client
+from src.utils.metrics import record_cache
+
+logger = logging.getLogger(__name__)
+
+_IMAGE_ID = re.compile(r'/(\d+)\.(?:jpg|jpeg|png|webp)', re.IGNORECASE)
+
+
+def image_id_from_url(url: str) -> str:
+    """Identifiant Booking de l'image (stable entre tailles), sinon empreinte du chemin."""
+    match = _IMAGE_ID.search(urlparse(url).path)
+    if match:
+        return match.group(1)
+    return hashlib.sha1(urlparse(url).path.encode()).hexdigest()[:16]
+
+
+def dhash(image: Image.Image, size: int = 8) -> int:
+    """Difference hash: gradient horizontal d'une vignette (size+1) x size en niveaux de gris."""
+    pixels = image.convert("L").resize((size + 1, size), Image.LANCZOS).tobytes()
+    value = 0
+    for row in range(size):
+        for col in range(size):
+            left = pixels[row * (size + 1) + col]
+            right = pixels[row * (size + 1) + col + 1]
+            value = (value << 1) | (left > right)
+    return value
+
+
+def hamming(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+
+def _analyse(content: bytes):
+    """Decodage (thread de l'executor) -> (largeur, hauteur, format, dhash)."""
+    with Image.open(BytesIO(content)) as image:
+        image.load()
+        return image.width, image.height, (image.format or "jpeg").lower(), dhash(image)
+
+
+class AssetPipeline:
+    """Telecharge, deduplique et stocke les images d'une galerie."""
+
+    def __init__(self, storage_dir: str, client: Optional[httpx.AsyncClient] = None, per_host_limit: int = 6,
+                 hash_threshold: int = 6, executor: Optional[Executor] = None):
+        self.storage_dir = Path(storage_dir)
+        self.storage_dir.mkdir(parents=True, exist_ok=True)
+        self.client = client
+        self.per_host_limit = per_host_limit
+        self.hash_threshold = hash_threshold
+        self.executor = executor
+        self._host_slots: Dict[str, asyncio.Semaphore] = {}
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._index_path = self.storage_dir / "index.json"
+        self._index: Dict[str, ImageAsset] = self._load_index()
+
+    def _load_index(self) -> Dict[str, ImageAsset]:
+        if not self._index_path.exists():
+            return {}
+        try:
+            data = json.loads(self._index_path.read_text(encoding="utf-8"))
+            return {image_id: ImageAsset(**asset) for image_id, asset in data.items()}
+        except Exception as e:
+            logger.warning(f"Index d'images illisible, reconstruit: {e}")
+            return {}
+
+    def _save_index(self):
+        tmp = self._index_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps({k: v.model_dump() for k, v in self._index.items()}), encoding="utf-8")
+        tmp.replace(self._index_path)
+
+    def file_path(self, asset: ImageAsset) -> Path:
+        return self.storage_dir / asset.path
+
+    async def process(self, urls: List[str]) -> List[ImageAsset]:
+        """
+        Images de la galerie dans l'ordre, sans quasi-doublons (la premiere
+        occurrence est conservee). Les echecs de telechargement sont ignores.
+        """
+        results = await asyncio.gather(*(self.get(url) for url in urls), return_exceptions=True)
+
+        kept: List[ImageAsset] = []
+        seen_ids = set()
+        for url, result in zip(urls, results):
+            if isinstance(result, Exception):
+                logger.warning(f"⚠️  Image ignoree ({url}): {result}")
+                continue
+            if result.image_id in seen_ids:
+                continue
+            seen_ids.add(result.image_id)
+            phash = int(result.phash, 16)
+            if any(hamming(phash, int(k.phash, 16)) <= self.hash_threshold for k in kept):
+                continue
+            kept.append(result)
+
+        self._save_index()
+        logger.info(f"🖼️  {len(kept)}/{len(urls)} images conservees apres deduplication")
+        return kept
+
+    async def get(self, url: str) -> ImageAsset:
+        """Asset d'une image: depuis le cache par id, sinon un seul telechargement partage."""
+        image_id = image_id_from_url(url)
+        cached = self._index.get(image_id)
+        if cached is not None and self.file_path(cached).exists():
+            record_cache("images", True)
+            return cached
+
+        if image_id not in self._inflight:
+            record_cache("images", False)
+            self._inflight[image_id] = asyncio.ensure_future(self._fetch(image_id, url))
+            self._inflight[image_id].add_done_callback(lambda _: self._inflight.pop(image_id, None))
+        return await asyncio.shield(self._inflight[image_id])
+
+    async def _fetch(self, image_id: str, url: str) -> ImageAsset:
+        host = urlparse(url).netloc
+        slots = self._host_slots.setdefault(host, asyncio.Semaphore(self.per_host_limit))
+        async with slots:
+            response = await (self.client or get_http_client()).get(url)
+            response.raise_for_status()
+            content = response.content
+
+        loop = asyncio.get_running_loop()
+        width, height, fmt, phash = await loop.run_in_executor(self.executor, _analyse, content)
+
+        sha256 = hashlib.sha256(content).hexdigest()
+        relative = Path(sha256[:2]) / f"{sha256}.{'jpg' if fmt == 'jpeg' else fmt}"
+        target = self.storage_dir / relative
+        if not target.exists():
+            target.parent.mkdir(parents=True, exist_ok=True)
+            tmp = target.with_suffix(".part")
+            tmp.write_bytes(content)
+            tmp.replace(target)
+
+        asset = ImageAsset(
+            image_id=image_id,
+            source_url=url,
+            sha256=sha256,
+            path=relative.as_posix(),
+            width=width,
+            height=height,
+            size_bytes=len(content),
+            phash=f"{phash:016x}",
+        )
+        self._index[image_id] = asset
+        return asset
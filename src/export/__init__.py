@@ -0,0 +1,4 @@
+from .columnar import (
+    FORMATS, SCHEMAS, ColumnarWriter, export_table, hotel_rows, price_rows, room_rows
+)
+from .sweep import price_sweep
@@ -0,0 +1,89 @@
+"""
+Export Parquet / Arrow en ligne de commande.
+
+    python -m src.export hotels results.ndjson -o hotels.parquet
+    python -m src.export rooms details.ndjson -o rooms.arrow --format arrow
+    python -m src.export prices results.ndjson -o prices.parquet
+    python -m src.export sweep --city Paris --start 2025-12-01 --days 30 --nights 2 -o prices.parquet
+
+Les entrees sont des fichiers NDJSON (lus ligne par ligne) ou JSON (objet ou liste)
+de HotelSearchResult (hotels, prices) ou HotelDetails (rooms).
+"""
+
+from datetime import date
+from pathlib import Path
+from typing import Iterator, Type
+import argparse
+import asyncio
+import json
+import logging
+
+from pydantic import BaseModel
+
+from src.export.columnar import (
+    DEFAULT_BATCH_SIZE, FORMATS, PRICES_SCHEMA, ColumnarWriter, export_table, hotel_rows, price_rows, room_rows
+)
+from src.export.sweep import price_sweep
+from src.models.hotel import HotelDetails
+from src.models.search import HotelSearchRequest, HotelSearchResult
+
+ROWS = {
+    "hotels": (HotelSearchResult, hotel_rows),
+    "rooms": (HotelDetails, room_rows),
+    "prices": (HotelSearchResult, price_rows),
+}
+
+
+def read_models(path: Path, model: Type[BaseModel]) -> Iterator[BaseModel]:
+    if path.suffix in (".ndjson", ".jsonl"):
+        with path.open(encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield model.model_validate_json(line)
+        return
+    data = json.loads(path.read_text(encoding="utf-8"))
+    for item in data if isinstance(data, list) else [data]:
+        yield model.model_validate(item)
+
+
+async def run_sweep(args) -> int:
+    request = HotelSearchRequest(city=args.city, checkin=args.start, checkout=args.start,
+                                 adults=args.adults, max_results=args.max_results)
+    with ColumnarWriter(args.output, PRICES_SCHEMA, args.format, args.batch_size) as writer:
+        async for result in price_sweep(request, args.start, args.days, args.nights):
+            writer.write_rows(price_rows([result]))
+    return writer.rows_written
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("table", choices=[*ROWS, "sweep"])
+    parser.add_argument("input", nargs="?", type=Path, help="Fichier NDJSON/JSON (sauf sweep)")
+    parser.add_argument("-o", "--output", type=Path, required=True)
+    parser.add_argument("--format", choices=FORMATS, default="parquet")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="Lignes par row group")
+    sweep = parser.add_argument_group("sweep")
+    sweep.add_argument("--city")
+    sweep.add_argument("--start", type=date.fromisoformat)
+    sweep.add_argument("--days", type=int, default=30)
+    sweep.add_argument("--nights", type=int, default=1)
+    sweep.add_argument("--adults", type=int, default=2)
+    sweep.add_argument("--max-results", type=int, default=25)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    if args.table == "sweep":
+        if not (args.city and args.start):
+            parser.error("sweep exige --city et --start")
+        rows = asyncio.run(run_sweep(args))
+    else:
+        if args.input is None:
+            parser.error(f"{args.table} exige un fichier d'entree")
+        model, to_rows = ROWS[args.table]
+        rows = export_table(args.table, to_rows(read_models(args.input, model)), args.output,
+                            args.format, args.batch_size)
+    print(f"{rows} lignes -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
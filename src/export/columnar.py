@@ -0,0 +1,221 @@
+"""
+Export colonnaire (Parquet / Arrow IPC) des resultats de scraping.
+
+Trois tables a colonnes typees:
+- hotels : une ligne par HotelSummary d'une recherche
+- rooms  : une ligne par RoomOption (tarif) d'une page detail
+- prices : une ligne par (hotel, sejour) d'un balayage de dates de recherche
+
+Les lignes sont produites par des generateurs et ecrites par lots
+(`batch_size` lignes = un row group Parquet / un record batch Arrow): la
+memoire reste bornee quel que soit le nombre de lignes exportees.
+"""
+
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from src.models.hotel import HotelDetails
+from src.models.search import HotelSearchResult
+
+FORMATS = ("parquet", "arrow")
+DEFAULT_BATCH_SIZE = 10_000
+
+_TIMESTAMP = pa.timestamp("us")
+
+HOTELS_SCHEMA = pa.schema([
+    ("hotel_id", pa.string()),
+    ("booking_id", pa.int64()),
+    ("country_code", pa.string()),
+    ("name", pa.string()),
+    ("price", pa.float64()),
+    ("currency", pa.string()),
+    ("rating", pa.float32()),
+    ("review_score", pa.float32()),
+    ("review_count", pa.int32()),
+    ("location", pa.string()),
+    ("latitude", pa.float64()),
+    ("longitude", pa.float64()),
+    ("image_url", pa.string()),
+    ("url", pa.string()),
+    ("city", pa.string()),
+    ("checkin", pa.date32()),
+    ("checkout", pa.date32()),
+    ("adults", pa.int16()),
+    ("scraped_at", _TIMESTAMP),
+])
+
+ROOMS_SCHEMA = pa.schema([
+    ("hotel_id", pa.string()),
+    ("room_type", pa.string()),
+    ("price", pa.float64()),
+    ("currency", pa.string()),
+    ("capacity", pa.int16()),
+    ("max_occupancy", pa.int16()),
+    ("bed_type", pa.string()),
+    ("room_size", pa.string()),
+    ("amenities", pa.list_(pa.string())),
+    ("cancellation_policy", pa.string()),
+    ("breakfast_included", pa.bool_()),
+    ("refundable", pa.bool_()),
+    ("room_id", pa.string()),
+    ("block_id", pa.string()),
+    ("meal_plan", pa.string()),
+    ("cancellation_terms", pa.string()),
+    ("checkin", pa.date32()),
+    ("checkout", pa.date32()),
+    ("scraped_at", _TIMESTAMP),
+])
+
+PRICES_SCHEMA = pa.schema([
+    ("hotel_id", pa.string()),
+    ("city", pa.string()),
+    ("checkin", pa.date32()),
+    ("checkout", pa.date32()),
+    ("nights", pa.int16()),
+    ("adults", pa.int16()),
+    ("price", pa.float64()),
+    ("price_per_night", pa.float64()),
+    ("currency", pa.string()),
+    ("scraped_at", _TIMESTAMP),
+])
+
+SCHEMAS = {"hotels": HOTELS_SCHEMA, "rooms": ROOMS_SCHEMA, "prices": PRICES_SCHEMA}
+
+Row = Dict[str, Any]
+
+
+def _timestamp(value: Optional[str]) -> Optional[datetime]:
+    try:
+        return datetime.fromisoformat(value) if value else None
+    except ValueError:
+        return None
+
+
+def _date(value: Union[str, date, None]) -> Optional[date]:
+    if value is None or isinstance(value, date):
+        return value
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        return None
+
+
+def hotel_rows(results: Iterable[HotelSearchResult]) -> Iterator[Row]:
+    for result in results:
+        request, scraped_at = result.request, _timestamp(result.scrape_timestamp)
+        for hotel in result.hotels:
+            yield {
+                **hotel.model_dump(),
+                "city": request.city,
+                "checkin": request.checkin,
+                "checkout": request.checkout,
+                "adults": request.adults,
+                "scraped_at": scraped_at,
+            }
+
+
+def room_rows(details: Iterable[HotelDetails]) -> Iterator[Row]:
+    for hotel in details:
+        params = hotel.scrape_parameters or {}
+        checkin, checkout = _date(params.get("checkin")), _date(params.get("checkout"))
+        scraped_at = _timestamp(hotel.scrape_timestamp)
+        for room in hotel.rooms:
+            yield {
+                **room.model_dump(),
+                "hotel_id": hotel.hotel_id,
+                "checkin": checkin,
+                "checkout": checkout,
+                "scraped_at": scraped_at,
+            }
+
+
+def price_rows(results: Iterable[HotelSearchResult]) -> Iterator[Row]:
+    """Points de prix d'un balayage: une recherche par date d'arrivee -> une ligne par hotel avec prix."""
+    for result in results:
+        request, scraped_at = result.request, _timestamp(result.scrape_timestamp)
+        nights = (request.checkout - request.checkin).days
+        for hotel in result.hotels:
+            if hotel.price is None:
+                continue
+            yield {
+                "hotel_id": hotel.hotel_id,
+                "city": request.city,
+                "checkin": request.checkin,
+                "checkout": request.checkout,
+                "nights": nights,
+                "adults": request.adults,
+                "price": hotel.price,
+                "price_per_night": hotel.price / nights if nights > 0 else None,
+                "currency": hotel.currency,
+                "scraped_at": scraped_at,
+            }
+
+
+class ColumnarWriter:
+    """Ecriture en flux d'une table: les lignes sont tamponnees par colonne puis videes par lot."""
+
+    def __init__(self, path: Union[str, Path], schema: pa.Schema, fmt: str = "parquet",
+                 batch_size: int = DEFAULT_BATCH_SIZE):
+        if fmt not in FORMATS:
+            raise ValueError(f"Format inconnu: {fmt} (valides: {', '.join(FORMATS)})")
+        self.path = Path(path)
+        self.schema = schema
+        self.fmt = fmt
+        self.batch_size = batch_size
+        self.rows_written = 0
+        self._columns: Dict[str, List[Any]] = {name: [] for name in schema.names}
+        self._buffered = 0
+        self._writer = None
+
+    def __enter__(self) -> "ColumnarWriter":
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if self.fmt == "parquet":
+            self._writer = pq.ParquetWriter(str(self.path), self.schema, compression="zstd")
+        else:
+            self._writer = pa.ipc.new_file(str(self.path), self.schema)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            if exc_type is None:
+                self.flush()
+        finally:
+            self._writer.close()
+
+    def write(self, row: Row):
+        for name, column in self._columns.items():
+            column.append(row.get(name))
+        self._buffered += 1
+        if self._buffered >= self.batch_size:
+            self.flush()
+
+    def write_rows(self, rows: Iterable[Row]) -> int:
+        for row in rows:
+            self.write(row)
+        return self.rows_written + self._buffered
+
+    def flush(self):
+        if not self._buffered:
+            return
+        batch = pa.RecordBatch.from_pydict(self._columns, schema=self.schema)
+        if self.fmt == "parquet":
+            self._writer.write_batch(batch, row_group_size=self.batch_size)
+        else:
+            self._writer.write_batch(batch)
+        self.rows_written += self._buffered
+        self._columns = {name: [] for name in self.schema.names}
+        self._buffered = 0
+
+
+def export_table(table: str, rows: Iterable[Row], path: Union[str, Path], fmt: str = "parquet",
+                 batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+    """Ecrit les lignes de `table` (hotels, rooms, prices) -> nombre de lignes ecrites."""
+    if table not in SCHEMAS:
+        raise ValueError(f"Table inconnue: {table} (valides: {', '.join(SCHEMAS)})")
+    with ColumnarWriter(path, SCHEMAS[table], fmt, batch_size) as writer:
+        writer.write_rows(rows)
+    return writer.rows_written
@@ -0,0 +1,28 @@
+"""Balayage de prix: une recherche par date d'arrivee sur une plage de jours."""
+
+from datetime import date, timedelta
+from typing import AsyncIterator
+import logging
+
+from src.models.search import HotelSearchRequest, HotelSearchResult
+from src.scrapers.scheduler import Priority
+from src.scrapers.search import SearchScraper
+
+logger = logging.getLogger(__name__)
+
+
+async def price_sweep(request: HotelSearchRequest, start: date, days: int,
+                      nights: int) -> AsyncIterator[HotelSearchResult]:
+    """
+    Recherches successives (un seul navigateur) pour chaque arrivee de
+    `start` a `start + days - 1`, sejour de `nights` nuits. Une date en
+    echec est journalisee et sautee.
+    """
+    async with SearchScraper() as scraper:
+        for offset in range(days):
+            checkin = start + timedelta(days=offset)
+            dated = request.model_copy(update={"checkin": checkin, "checkout": checkin + timedelta(days=nights)})
+            try:
+                yield await scraper.search_hotels(dated, Priority.BATCH)
+            except Exception as e:
+                logger.warning(f"Balayage {request.city} {checkin}: recherche en echec ({e})")
@@ -0,0 +1 @@
+from .mock_booking import MockBooking, MockSettings, create_app
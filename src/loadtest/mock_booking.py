@@ -0,0 +1,223 @@
+"""
+Serveur Booking simule pour tests de charge et de non-regression hors ligne.
+
+Sert /searchresults.html, /hotel/{cc}/{id}.html, /reviewlist.html et /dml/graphql depuis les fixtures
+enregistrees (fixtures/hotels.json), avec latence configurable, injection
+d'erreurs 500/429 et sections chargees paresseusement.
+
+Lancement:
+    uvicorn src.loadtest.mock_booking:app --port 8090
+    BOOKING_BASE_URL=http://localhost:8090 uvicorn src.api.main:app --port 8000
+"""
+
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import HTMLResponse, PlainTextResponse
+from pydantic import BaseModel
+from pydantic_settings import BaseSettings
+from pathlib import Path
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+from urllib.parse import urlencode
+import asyncio
+import json
+import logging
+import random
+
+from src.loadtest import pages
+
+logger = logging.getLogger(__name__)
+
+FIXTURES_PATH = Path(__file__).parent / "fixtures" / "hotels.json"
+
+
+class MockSettings(BaseSettings):
+    """Comportement du mock (variables d'environnement MOCK_*)."""
+    latency_ms: int = 0
+    latency_jitter_ms: int = 0
+    error_rate: float = 0.0
+    throttle_rate: float = 0.0
+    retry_after: int = 5
+    lazy_sections: bool = True
+    lazy_delay_ms: int = 200
+    # Ville inconnue: tout le catalogue (tests de charge sur des villes arbitraires) plutot qu'aucun resultat
+    any_city: bool = False
+    seed: Optional[int] = None
+
+    class Config:
+        env_prefix = "MOCK_"
+
+
+class MockStats(BaseModel):
+    requests: int = 0
+    errors_injected: int = 0
+    throttled: int = 0
+    not_found: int = 0
+
+
+def load_fixtures(path: Path = FIXTURES_PATH) -> List[Dict]:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+class MockBooking:
+    """Etat du mock: fixtures, configuration et compteurs."""
+
+    def __init__(self, config: Optional[MockSettings] = None, fixtures: Optional[List[Dict]] = None):
+        self.config = config or MockSettings()
+        self.hotels = fixtures if fixtures is not None else load_fixtures()
+        self.by_id = {h["hotel_id"]: h for h in self.hotels}
+        self.stats = MockStats()
+        self.rng = random.Random(self.config.seed)
+
+    def configure(self, **changes) -> MockSettings:
+        self.config = self.config.model_copy(update=changes)
+        if "seed" in changes:
+            self.rng = random.Random(self.config.seed)
+        return self.config
+
+    def hotels_for_city(self, city: str) -> List[Dict]:
+        city = city.strip().lower()
+        matches = [h for h in self.hotels if h["city"].lower() == city]
+        # Ville inconnue: page "aucun resultat", sauf si les tests de charge demandent des villes arbitraires
+        return matches or (self.hotels if self.config.any_city else [])
+
+    def hotel(self, hotel_id: str) -> Dict:
+        if hotel_id in self.by_id:
+            return self.by_id[hotel_id]
+        # Identifiant inconnu: fixture deterministe derivee de l'identifiant
+        base = self.hotels[sum(hotel_id.encode()) % len(self.hotels)]
+        return {**base, "hotel_id": hotel_id, "name": f"{base['name']} ({hotel_id})"}
+
+    def reviews(self, hotel: Dict) -> List[Dict]:
+        """Avis enregistres completes par des avis synthetiques jusqu'a review_count."""
+        recorded = [
+            {**r, "id": f"{hotel['hotel_id']}-r{i}", "tags": r.get("tags", ["Couple", "Leisure trip"])}
+            for i, r in enumerate(hotel["reviews"])
+        ]
+        last = datetime.strptime(recorded[-1]["date"], "%d %B %Y") if recorded else datetime(2025, 10, 1)
+        synthetic = []
+        for i in range(len(recorded), hotel.get("review_count", len(recorded))):
+            day = last - timedelta(days=i - len(recorded) + 1)
+            synthetic.append({
+                "id": f"{hotel['hotel_id']}-r{i}",
+                "name": f"Guest {i}",
+                "country": ("France", "Germany", "Italy", "Spain")[i % 4],
+                "date": f"{day.day} {day.strftime('%B %Y')}",
+                "score": float(6 + i % 5),
+                "positive": f"Pleasant stay number {i}.",
+                "negative": "" if i % 3 else "Breakfast could be better.",
+                "tags": ["Solo traveler"] if i % 2 else ["Family"],
+            })
+        return recorded + synthetic
+
+    async def simulate_latency(self):
+        delay = self.config.latency_ms
+        if self.config.latency_jitter_ms:
+            delay += self.rng.randint(0, self.config.latency_jitter_ms)
+        if delay > 0:
+            await asyncio.sleep(delay / 1000)
+
+    def roll_failure(self) -> Optional[PlainTextResponse]:
+        roll = self.rng.random()
+        if roll < self.config.throttle_rate:
+            self.stats.throttled += 1
+            return PlainTextResponse(
+                "Too Many Requests", status_code=429,
+                headers={"Retry-After": str(self.config.retry_after)}
+            )
+        if roll < self.config.throttle_rate + self.config.error_rate:
+            self.stats.errors_injected += 1
+            return PlainTextResponse("Internal Server Error", status_code=500)
+        return None
+
+
+def create_app(mock: Optional[MockBooking] = None) -> FastAPI:
+    mock = mock or MockBooking()
+    app = FastAPI(title="Mock Booking.com", version="1.0.0")
+    app.state.mock = mock
+
+    @app.middleware("http")
+    async def inject_faults(request: Request, call_next):
+        if request.url.path.startswith("/_mock/config") or request.url.path.startswith("/_mock/stats"):
+            return await call_next(request)
+
+        mock.stats.requests += 1
+        await mock.simulate_latency()
+        failure = mock.roll_failure()
+        if failure is not None:
+            return failure
+        return await call_next(request)
+
+    @app.get("/searchresults.html", response_class=HTMLResponse)
+    async def searchresults(request: Request, ss: str = ""):
+        hotels = mock.hotels_for_city(ss)
+        forwarded = {
+            k: v for k, v in request.query_params.items()
+            if k in ("checkin", "checkout", "group_adults", "no_rooms")
+        }
+        return pages.render_search_page(ss, hotels, urlencode(forwarded))
+
+    @app.get("/hotel/{country_code}/{page_name}", response_class=HTMLResponse)
+    async def hotel_page(country_code: str, page_name: str):
+        if not page_name.endswith(".html"):
+            mock.stats.not_found += 1
+            raise HTTPException(status_code=404)
+        hotel = mock.hotel(page_name[:-len(".html")])
+        return pages.render_hotel_page(
+            {**hotel, "country_code": country_code},
+            lazy_sections=mock.config.lazy_sections
+        )
+
+    @app.get("/reviewlist.html", response_class=HTMLResponse)
+    async def review_list(pagename: str, cc1: str = "fr", offset: int = 0, rows: int = 10):
+        reviews = mock.reviews(mock.hotel(pagename))
+        return pages.render_review_list_page(reviews, offset, rows)
+
+    @app.post("/dml/graphql")
+    async def graphql(body: Dict):
+        operation = body.get("operationName")
+        variables = body.get("variables") or {}
+        if operation == "FullSearch":
+            return pages.search_payload(mock.hotels_for_city(variables.get("city", "")))
+        if operation == "RoomsAvailability":
+            return pages.rooms_payload(mock.hotel(variables["pagename"]))
+        if operation == "ReviewList":
+            reviews = mock.reviews(mock.hotel(variables["pagename"]))
+            return pages.review_list_payload(reviews, variables.get("offset", 0), variables.get("rows", 10))
+        mock.stats.not_found += 1
+        raise HTTPException(status_code=404, detail=f"Operation inconnue: {operation}")
+
+    @app.get("/_mock/section/{country_code}/{hotel_id}/{name}", response_class=HTMLResponse)
+    async def lazy_section(country_code: str, hotel_id: str, name: str):
+        if mock.config.lazy_delay_ms > 0:
+            await asyncio.sleep(mock.config.lazy_delay_ms / 1000)
+        try:
+            return pages.render_section(mock.hotel(hotel_id), name)
+        except KeyError:
+            mock.stats.not_found += 1
+            raise HTTPException(status_code=404, detail=f"Section inconnue: {name}")
+
+    @app.get("/_mock/config")
+    async def get_config():
+        return mock.config
+
+    @app.post("/_mock/config")
+    async def update_config(changes: Dict):
+        unknown = set(changes) - set(MockSettings.model_fields)
+        if unknown:
+            raise HTTPException(status_code=422, detail=f"Parametres inconnus: {sorted(unknown)}")
+        return mock.configure(**changes)
+
+    @app.get("/_mock/stats", response_model=MockStats)
+    async def get_stats():
+        return mock.stats
+
+    @app.post("/_mock/stats/reset", response_model=MockStats)
+    async def reset_stats():
+        mock.stats = MockStats()
+        return mock.stats
+
+    return app
+
+
+app = create_app()
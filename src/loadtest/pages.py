@@ -0,0 +1,411 @@
+"""
+Rendu HTML des pages Booking simulees a partir des fixtures enregistrees.
+
+Les balises reprennent les selecteurs utilises par SearchScraper et
+DetailsScraper pour que les scrapers tournent sans modification contre le mock.
+"""
+
+from datetime import datetime, timezone
+from html import escape
+from typing import Dict, List, Optional
+import hashlib
+import json
+
+# Sections chargees paresseusement (IntersectionObserver) quand lazy_sections est actif
+LAZY_SECTIONS = ("facilities", "house_rules", "nearby", "reviews")
+
+IMAGE_BASE = "https://cf.bstatic.com/xdata/images/hotel"
+
+
+def _image_url(image_id: int, size: str = "max500") -> str:
+    token = hashlib.sha256(str(image_id).encode()).hexdigest()
+    return f"{IMAGE_BASE}/{size}/{image_id}.jpg?k={token}&amp;o=&amp;hp=1"
+
+
+def _price(value: float) -> str:
+    return f"€ {value:,.0f}"
+
+
+def cheapest_rate(hotel: Dict) -> Optional[float]:
+    prices = [rate["price"] for room in hotel.get("rooms", []) for rate in room["rates"]]
+    return min(prices, default=None)
+
+
+def hotel_path(hotel: Dict) -> str:
+    return f"/hotel/{hotel['country_code']}/{hotel['hotel_id']}.html"
+
+
+def _layout(title: str, body: str, head: str = "") -> str:
+    return (
+        "<!DOCTYPE html><html lang=\"en\"><head><meta charset=\"utf-8\">"
+        f"<title>{escape(title)}</title>{head}</head><body>{body}</body></html>"
+    )
+
+
+# === Page de resultats ===
+
+def render_property_card(hotel: Dict, query: str) -> str:
+    price = cheapest_rate(hotel)
+    href = f"{hotel_path(hotel)}?{query}" if query else hotel_path(hotel)
+    score = hotel.get("review_score")
+    parts = [
+        f'<div data-testid="property-card" data-hotelid="{hotel["numeric_id"]}">',
+        f'<div data-testid="image" data-src="{_image_url(hotel["images"][0], "square240")}"></div>',
+        f'<a data-testid="title-link" href="{escape(href)}"><div data-testid="title">{escape(hotel["name"])}</div></a>',
+        f'<span data-testid="address">{escape(hotel["city"])}</span>',
+    ]
+    if score:
+        parts.append(
+            f'<div data-testid="review-score"><div>Scored {score}</div>'
+            f'<div>{score}</div><div>{hotel.get("review_count", 0)} reviews</div></div>'
+        )
+    if price:
+        parts.append(f'<span data-testid="price-and-discounted-price">{_price(price)}</span>')
+    parts.append("</div>")
+    return "".join(parts)
+
+
+def render_search_page(city: str, hotels: List[Dict], query: str) -> str:
+    cards = "".join(render_property_card(h, query) for h in hotels)
+    if not hotels:
+        cards = f'<div data-testid="no-results-message">No properties found in {escape(city)}</div>'
+    body = (
+        f'<h1>{escape(city)}: {len(hotels)} properties found</h1>'
+        f'<div data-testid="property-list">{cards}</div>'
+    )
+    head = _GRAPHQL_SCRIPT % {"operations": json.dumps([["FullSearch", {"city": city}]])}
+    return _layout(f"Hotels in {city}", body, head)
+
+
+# === Page detail ===
+
+def _json_ld(hotel: Dict) -> str:
+    address = hotel["address"]
+    data = {
+        "@context": "http://schema.org",
+        "@type": hotel.get("property_type", "Hotel"),
+        "name": hotel["name"],
+        "description": hotel["description"],
+        "telephone": hotel.get("phone"),
+        "address": {
+            "streetAddress": address["street"],
+            "addressLocality": address["city"],
+            "postalCode": address["postal_code"],
+            "addressCountry": address["country"],
+        },
+        "geo": {"latitude": address["latitude"], "longitude": address["longitude"]},
+        "aggregateRating": {
+            "ratingValue": hotel["review_score"],
+            "reviewCount": hotel["review_count"],
+        },
+    }
+    if hotel.get("star_rating"):
+        data["starRating"] = {"ratingValue": hotel["star_rating"]}
+    return f'<script type="application/ld+json">{json.dumps(data)}</script>'
+
+
+def render_rooms(hotel: Dict) -> str:
+    rows = []
+    for room_index, room in enumerate(hotel["rooms"]):
+        room_id = f"{hotel['numeric_id']}0{room_index + 1}"
+        for rate_index, rate in enumerate(room["rates"]):
+            cells = []
+            if rate_index == 0:
+                cells.append(
+                    f'<td class="hprt-table-cell-roomtype" rowspan="{len(room["rates"])}">'
+                    f'<a class="hprt-roomtype-link" href="#RD{room_id}">'
+                    f'<span class="hprt-roomtype-icon-link">{escape(room["room_type"])}</span></a>'
+                    f'<div class="hprt-roomtype-bed">{escape(room["bed"])}</div>'
+                    f'<div class="hprt-facilities-block">'
+                    f'<span class="hprt-facilities-facility" data-name-en="{room["room_size"]} m²">{room["room_size"]} m²</span>'
+                    f'<span class="hprt-facilities-facility" data-name-en="Free WiFi">Free WiFi</span>'
+                    f'</div></td>'
+                )
+            conditions = []
+            if rate.get("meal_plan"):
+                conditions.append(f'<li class="hprt-conditions-meal">{escape(rate["meal_plan"])}</li>')
+            conditions.append(f'<li class="hprt-conditions-cancellation">{escape(rate["cancellation"])}</li>')
+            cells.append(
+                f'<td class="hprt-table-cell-occupancy">'
+                f'<span class="bui-u-sr-only">Max. people: {rate["occupancy"]}</span>'
+                + '<i class="bicon-occupancy"></i>' * rate["occupancy"] + '</td>'
+            )
+            cells.append(
+                f'<td class="hprt-table-cell-price">'
+                f'<div class="bui-price-display__value prco-valign-middle-helper">{_price(rate["price"])}</div></td>'
+            )
+            cells.append(f'<td class="hprt-table-cell-conditions"><ul class="hprt-conditions">{"".join(conditions)}</ul></td>')
+            rows.append(
+                f'<tr class="js-rt-block-row" data-room-id="{room_id}" '
+                f'data-block-id="{room_id}_{rate_index + 1}">{"".join(cells)}</tr>'
+            )
+    return (
+        '<section id="availability"><table class="hprt-table"><tbody>'
+        + "".join(rows) + "</tbody></table></section>"
+    )
+
+
+def render_section(hotel: Dict, name: str) -> str:
+    """Rend une section paresseuse (meme balisage que la version inline)."""
+    if name == "facilities":
+        groups = "".join(
+            '<div data-testid="facility-group-container">'
+            f'<h3>{escape(title)}</h3><ul>'
+            + "".join(f'<li><span class="f6b6d2a959">{escape(item)}</span></li>' for item in items)
+            + '</ul></div>'
+            for title, items in hotel["facility_groups"].items()
+        )
+        return f'<section id="hp_facilities_box">{groups}</section>'
+
+    if name == "house_rules":
+        rules = "".join(
+            f'<div class="b0400e5749"><div class="e7addce19e">{escape(title)}</div>'
+            f'<div class="c92998be48">{escape(content)}</div></div>'
+            for title, content in hotel["house_rules"]
+        )
+        return (
+            '<section id="hp_policies_box">'
+            f'<div data-testid="property-section--checkin">Check-in From {hotel["checkin_from"]}</div>'
+            f'<div data-testid="property-section--checkout">Check-out Until {hotel["checkout_until"]}</div>'
+            f'{rules}</section>'
+        )
+
+    if name == "nearby":
+        blocks = "".join(
+            f'<div data-testid="poi-block"><h3><div>{escape(category)}</div></h3>'
+            '<ul data-testid="poi-block-list">'
+            + "".join(
+                f'<li><div class="d1bc97eb82">{escape(poi)}</div><div class="a0a56631d6">{escape(distance)}</div></li>'
+                for poi, distance in items
+            )
+            + '</ul></div>'
+            for category, items in hotel["nearby_attractions"].items()
+        )
+        return f'<section id="hotel_surroundings">{blocks}</section>'
+
+    if name == "reviews":
+        featured = "".join(
+            '<div data-testid="featuredreview">'
+            f'<div class="b08850ce41 f546354b44">{escape(review["name"])}</div>'
+            f'<div class="d838fb5f41 aea5eccb71">{escape(review["country"])}</div>'
+            f'<div data-testid="featuredreview-text"><div class="b99b6ef58f">"{escape(review["positive"])}"</div></div>'
+            '</div>'
+            for review in hotel["reviews"]
+        )
+        subscores = "".join(
+            f'<div data-testid="review-subscore"><span>{label}</span><span>{hotel["review_scores_detail"][key]}</span></div>'
+            for key, label in (
+                ("staff", "Staff"), ("facilities", "Facilities"), ("cleanliness", "Cleanliness"),
+                ("comfort", "Comfort"), ("value_for_money", "Value for money"),
+                ("location", "Location"), ("wifi", "Free WiFi"),
+            )
+        )
+        return (
+            f'<section id="guest-reviews">{subscores}{featured}'
+            '<button data-testid="fr-read-all-reviews">Read all reviews</button>'
+            '<div id="review_list_page_container"></div></section>'
+        )
+
+    if name == "review_list":
+        return render_review_list(hotel["reviews"])
+
+    raise KeyError(name)
+
+
+def _review_item(review: Dict) -> str:
+    negative = (
+        f'<div class="review_neg"><span>{escape(review["negative"])}</span></div>'
+        if review.get("negative") else ""
+    )
+    tags = "".join(f'<li class="bui-list__item">{escape(tag)}</li>' for tag in review.get("tags", []))
+    return (
+        f'<li class="review_list_new_item_block" data-review-url="{escape(review.get("id", ""))}">'
+        f'<span class="bui-avatar-block__title">{escape(review["name"])}</span>'
+        f'<span class="bui-avatar-block__subtitle">{escape(review["country"])}</span>'
+        f'<span class="c-review-block__date">Reviewed: {escape(review["date"])}</span>'
+        f'<div class="bui-review-score__badge">{review["score"]}</div>'
+        f'<ul class="review-panel-wide__traveller_type">{tags}</ul>'
+        f'<div class="review_pos"><span>{escape(review["positive"])}</span></div>'
+        f'{negative}</li>'
+    )
+
+
+def render_review_list(reviews: List[Dict]) -> str:
+    return f'<ul class="review_list">{"".join(_review_item(r) for r in reviews)}</ul>'
+
+
+def render_review_list_page(reviews: List[Dict], offset: int, rows: int) -> str:
+    """Fragment renvoye par /reviewlist.html (liste paginee + pagination)."""
+    page = reviews[offset:offset + rows]
+    last_page = max(1, -(-len(reviews) // rows))
+    pagination = "".join(
+        f'<div class="bui-pagination__item"><a class="bui-pagination__link" href="#">{n}</a></div>'
+        for n in range(1, last_page + 1)
+    )
+    return (
+        f'<div id="review_list_page_container">{render_review_list(page)}'
+        f'<div class="bui-pagination__list">{pagination}</div></div>'
+    )
+
+
+_LAZY_SCRIPT = """
+<script>
+(function () {
+  const load = (el) => fetch(el.dataset.mockLazy).then(r => r.text()).then(html => { el.outerHTML = html; });
+  const io = new IntersectionObserver((entries) => {
+    for (const entry of entries) {
+      if (!entry.isIntersecting) continue;
+      io.unobserve(entry.target);
+      load(entry.target);
+    }
+  }, {rootMargin: '200px'});
+  document.querySelectorAll('[data-mock-lazy]').forEach(el => io.observe(el));
+  document.addEventListener('click', (event) => {
+    const btn = event.target.closest('[data-testid="fr-read-all-reviews"]');
+    if (!btn) return;
+    fetch('%(review_list)s')
+      .then(r => r.text())
+      .then(html => { document.getElementById('review_list_page_container').innerHTML = html; });
+  });
+})();
+</script>
+"""
+
+
+def render_hotel_page(hotel: Dict, lazy_sections: bool = True) -> str:
+    section_base = f"/_mock/section/{hotel['country_code']}/{hotel['hotel_id']}"
+    address = hotel["address"]
+    full_address = f"{address['street']}, {address['postal_code']} {address['city']}, {address['country']}"
+
+    gallery = "".join(
+        f'<a class="bh-photo-grid-item" data-thumb-url="{_image_url(image_id)}"></a>'
+        for image_id in hotel["images"]
+    )
+    popular = "".join(
+        f'<li><span class="f6b6d2a959">{escape(item)}</span></li>' for item in hotel["popular_amenities"]
+    )
+
+    sections = []
+    for name in LAZY_SECTIONS:
+        if lazy_sections:
+            sections.append(
+                f'<div data-mock-lazy="{section_base}/{name}" style="min-height: 1200px"></div>'
+            )
+        else:
+            sections.append(render_section(hotel, name))
+
+    body = (
+        f'<h2 data-testid="property-name">{escape(hotel["name"])}</h2>'
+        f'<span data-testid="address">{escape(full_address)}</span>'
+        f'<div data-testid="review-score-badge">{hotel["review_score"]}</div>'
+        f'<span>{hotel["review_score"]} {escape(hotel.get("review_category") or "")} · {hotel["review_count"]} reviews</span>'
+        f'<div id="photo_wrapper" style="min-height: 900px">{gallery}</div>'
+        f'<div id="property_description_content"><p>{escape(hotel["description"])}</p></div>'
+        f'<div data-testid="property-most-popular-facilities-wrapper"><ul>{popular}</ul></div>'
+        f'<div id="contact">Phone: {escape(hotel.get("phone") or "")}</div>'
+        + render_rooms(hotel)
+        + "".join(sections)
+    )
+    operations = [
+        ["RoomsAvailability", {"pagename": hotel["hotel_id"]}],
+        ["ReviewList", {"pagename": hotel["hotel_id"], "offset": 0, "rows": 10}],
+    ]
+    head = (
+        _json_ld(hotel)
+        + _LAZY_SCRIPT % {"review_list": f"{section_base}/review_list"}
+        + _GRAPHQL_SCRIPT % {"operations": json.dumps(operations)}
+    )
+    return _layout(hotel["name"], body, head)
+
+
+# === Payloads JSON (/dml/graphql) ===
+# Memes formes que les reponses interceptees par src.scrapers.interception.
+
+_GRAPHQL_SCRIPT = """
+<script>
+(function () {
+  const operations = %(operations)s;
+  for (const [operationName, variables] of operations) {
+    fetch('/dml/graphql', {
+      method: 'POST',
+      headers: {'Content-Type': 'application/json'},
+      body: JSON.stringify({operationName, variables}),
+    });
+  }
+})();
+</script>
+"""
+
+
+def search_payload(hotels: List[Dict]) -> Dict:
+    results = []
+    for hotel in hotels:
+        price = cheapest_rate(hotel)
+        results.append({
+            "basicPropertyData": {
+                "id": hotel["numeric_id"],
+                "pageName": hotel["hotel_id"],
+                "location": {
+                    "countryCode": hotel["country_code"],
+                    "city": hotel["city"],
+                    "address": hotel["address"]["street"],
+                    "latitude": hotel["address"]["latitude"],
+                    "longitude": hotel["address"]["longitude"],
+                },
+                "reviews": {"totalScore": hotel.get("review_score"), "reviewsCount": hotel.get("review_count")},
+                "starRating": {"value": hotel.get("star_rating")} if hotel.get("star_rating") else None,
+                "photos": {"main": {"highResUrl": {
+                    "relativeUrl": _image_url(hotel["images"][0], "max1024x768")[len("https://cf.bstatic.com"):]
+                }}},
+            },
+            "displayName": {"text": hotel["name"]},
+            "location": {"displayLocation": hotel["city"]},
+            "priceDisplayInfoIrene": {"displayPrice": {"amountPerStay": {
+                "amountUnformatted": price, "currency": "EUR"
+            }}} if price else None,
+        })
+    return {"data": {"searchQueries": {"search": {"results": results}}}}
+
+
+def rooms_payload(hotel: Dict) -> Dict:
+    rooms = []
+    for room_index, room in enumerate(hotel["rooms"]):
+        room_id = f"{hotel['numeric_id']}0{room_index + 1}"
+        rooms.append({
+            "b_id": int(room_id),
+            "b_name": room["room_type"],
+            "b_surface_in_m2": room["room_size"],
+            "b_bed_type": room["bed"],
+            "b_facilities": ["Free WiFi"],
+            "b_blocks": [
+                {
+                    "b_block_id": f"{room_id}_{rate_index + 1}",
+                    "b_raw_price": rate["price"],
+                    "b_currency": "EUR",
+                    "b_max_persons": rate["occupancy"],
+                    "b_mealplan_included_name": rate.get("meal_plan") or None,
+                    "b_cancellation_type": (
+                        "free_cancellation" if "free cancellation" in rate["cancellation"].lower() else "non_refundable"
+                    ),
+                    "b_cancellation_text": rate["cancellation"],
+                }
+                for rate_index, rate in enumerate(room["rates"])
+            ],
+        })
+    return {"data": {"b_rooms_available_and_soldout": rooms}}
+
+
+def review_list_payload(reviews: List[Dict], offset: int, rows: int) -> Dict:
+    cards = []
+    for review in reviews[offset:offset + rows]:
+        reviewed = datetime.strptime(review["date"], "%d %B %Y").replace(tzinfo=timezone.utc)
+        cards.append({
+            "reviewUrl": review.get("id", ""),
+            "guestDetails": {"username": review["name"], "countryName": review["country"]},
+            "reviewedDate": int(reviewed.timestamp()),
+            "reviewScore": review["score"],
+            "textDetails": {"positiveText": review["positive"], "negativeText": review.get("negative") or None},
+            "bookingDetails": {"customerType": (review.get("tags") or [None])[0]},
+        })
+    return {"data": {"reviewListFrontend": {"reviewsCount": len(reviews), "reviewCard": cards}}}
+
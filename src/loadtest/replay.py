@@ -0,0 +1,220 @@
+"""
+Rejeu du journal des requetes (REQUEST_LOG_PATH) contre une API en marche.
+
+Les requetes sont envoyees en boucle ouverte: chacune part a son instant
+enregistre (ecart au premier appel, divise par --speed), qu'elle que soit la
+latence des precedentes, ce qui reproduit la distribution des inter-arrivees.
+Le rapport donne par endpoint le debit, les statuts et les percentiles de
+latence; avec --mock, les requetes recues par le serveur Booking simule pendant
+le rejeu (appels amont par requete API, erreurs injectees, 429).
+
+Lancement:
+    uvicorn src.loadtest.mock_booking:app --port 8090
+    BOOKING_BASE_URL=http://localhost:8090 uvicorn src.api.main:app --port 8000
+    python -m src.loadtest.replay data/requests.jsonl --target http://localhost:8000 \\
+        --speed 4 --mock http://localhost:8090 --shift-dates
+"""
+
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Optional
+from urllib.parse import parse_qsl, urlencode
+import argparse
+import asyncio
+import json
+import logging
+import math
+import time
+
+import httpx
+
+from src.utils.request_log import read_request_log
+
+logger = logging.getLogger(__name__)
+
+_DATE_PARAMS = ("checkin", "checkout")
+
+
+@dataclass
+class ReplayRequest:
+    offset: float                   # secondes depuis la premiere requete enregistree
+    method: str
+    path: str
+    query: str
+
+
+@dataclass
+class ReplayResult:
+    path: str
+    status: Optional[int]           # None: erreur de transport / timeout
+    latency_ms: float
+    lag_ms: float                   # retard au depart par rapport a l'instant prevu
+
+
+@dataclass
+class ReplayReport:
+    duration_s: float
+    speed: float
+    results: List[ReplayResult] = field(default_factory=list)
+    mock: Optional[dict] = None
+
+    def endpoints(self) -> Dict[str, dict]:
+        by_path: Dict[str, List[ReplayResult]] = {}
+        for result in self.results:
+            by_path.setdefault(result.path, []).append(result)
+        return {path: summarize(results, self.duration_s) for path, results in sorted(by_path.items())}
+
+    def to_dict(self) -> dict:
+        return {
+            "duration_s": round(self.duration_s, 3),
+            "speed": self.speed,
+            "total": summarize(self.results, self.duration_s),
+            "endpoints": self.endpoints(),
+            "mock": self.mock,
+        }
+
+
+def percentile(values: List[float], q: float) -> Optional[float]:
+    """Percentile par rang le plus proche (q dans [0, 100])."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(q / 100 * len(ordered)) - 1)]
+
+
+def summarize(results: List[ReplayResult], duration_s: float) -> dict:
+    latencies = [r.latency_ms for r in results]
+    statuses: Dict[str, int] = {}
+    for r in results:
+        key = str(r.status) if r.status is not None else "transport_error"
+        statuses[key] = statuses.get(key, 0) + 1
+    return {
+        "requests": len(results),
+        "throughput_rps": round(len(results) / duration_s, 2) if duration_s > 0 else None,
+        "errors": sum(1 for r in results if r.status is None or r.status >= 500),
+        "statuses": statuses,
+        **{f"p{q}_ms": round(v, 1) if (v := percentile(latencies, q)) is not None else None for q in (50, 90, 95, 99)},
+        "max_ms": round(max(latencies), 1) if latencies else None,
+        "max_lag_ms": round(max(r.lag_ms for r in results), 1) if results else None,
+    }
+
+
+def shift_query_dates(query: str, days: int) -> str:
+    """Decale checkin/checkout de `days` jours (garde l'avance de reservation enregistree)."""
+    if not days:
+        return query
+    params = []
+    for key, value in parse_qsl(query, keep_blank_values=True):
+        if key in _DATE_PARAMS:
+            try:
+                value = (date.fromisoformat(value) + timedelta(days=days)).isoformat()
+            except ValueError:
+                pass
+        params.append((key, value))
+    return urlencode(params)
+
+
+def load_schedule(entries: Iterable[dict], path_prefix: Optional[str] = None, limit: Optional[int] = None,
+                  shift_dates: bool = False, today: Optional[date] = None) -> List[ReplayRequest]:
+    """Requetes du journal triees par horodatage, avec leur ecart a la premiere."""
+    entries = sorted((e for e in entries if "ts" in e and (not path_prefix or e["path"].startswith(path_prefix))),
+                     key=lambda e: e["ts"])[:limit]
+    if not entries:
+        return []
+    first = entries[0]["ts"]
+    today = today or date.today()
+    schedule = []
+    for entry in entries:
+        query = entry.get("query") or ""
+        if shift_dates:
+            query = shift_query_dates(query, (today - datetime.fromtimestamp(entry["ts"]).date()).days)
+        schedule.append(ReplayRequest(entry["ts"] - first, entry.get("method", "GET"), entry["path"], query))
+    return schedule
+
+
+async def _send(client: httpx.AsyncClient, request: ReplayRequest, scheduled: float) -> ReplayResult:
+    start = time.monotonic()
+    try:
+        response = await client.request(request.method, request.path, params=httpx.QueryParams(request.query))
+        status = response.status_code
+    except httpx.HTTPError as e:
+        logger.debug(f"{request.method} {request.path}: {e}")
+        status = None
+    return ReplayResult(request.path, status, (time.monotonic() - start) * 1000, (start - scheduled) * 1000)
+
+
+async def replay(schedule: List[ReplayRequest], client: httpx.AsyncClient, speed: float = 1.0) -> ReplayReport:
+    """Envoie chaque requete a son instant (offset / speed) sans attendre les reponses precedentes."""
+    start = time.monotonic()
+    tasks = []
+    for request in schedule:
+        scheduled = start + request.offset / speed
+        delay = scheduled - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.create_task(_send(client, request, scheduled)))
+    results = await asyncio.gather(*tasks)
+    return ReplayReport(time.monotonic() - start, speed, list(results))
+
+
+async def _mock_stats(mock_url: str, reset: bool = False) -> dict:
+    async with httpx.AsyncClient(base_url=mock_url, timeout=10) as client:
+        response = await (client.post("/_mock/stats/reset") if reset else client.get("/_mock/stats"))
+        response.raise_for_status()
+        return response.json()
+
+
+async def run(args) -> ReplayReport:
+    schedule = load_schedule(read_request_log(args.log), args.path_prefix, args.limit, args.shift_dates)
+    if not schedule:
+        raise SystemExit(f"Aucune requete a rejouer dans {args.log}")
+    logger.info(f"Rejeu de {len(schedule)} requetes ({schedule[-1].offset / args.speed:.1f}s a x{args.speed})")
+
+    if args.mock:
+        await _mock_stats(args.mock, reset=True)
+    limits = httpx.Limits(max_connections=args.connections, max_keepalive_connections=args.connections)
+    async with httpx.AsyncClient(base_url=args.target, timeout=args.timeout, limits=limits) as client:
+        report = await replay(schedule, client, args.speed)
+    if args.mock:
+        stats = await _mock_stats(args.mock)
+        stats["upstream_per_request"] = round(stats["requests"] / len(schedule), 2)
+        report.mock = stats
+    return report
+
+
+def print_report(report: ReplayReport):
+    columns = ("requests", "throughput_rps", "errors", "p50_ms", "p90_ms", "p95_ms", "p99_ms", "max_ms")
+    print(f"Rejeu x{report.speed}: {len(report.results)} requetes en {report.duration_s:.1f}s")
+    print(f"{'endpoint':32s} " + " ".join(f"{c:>14s}" for c in columns))
+    rows = {**report.endpoints(), "TOTAL": summarize(report.results, report.duration_s)}
+    for path, summary in rows.items():
+        print(f"{path:32s} " + " ".join(f"{str(summary[c]):>14s}" for c in columns))
+    if report.mock:
+        print(f"Mock Booking: {report.mock}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rejeu du journal des requetes contre l'API")
+    parser.add_argument("log", help="Journal des requetes (JSON lines)")
+    parser.add_argument("--target", default="http://localhost:8000", help="URL de l'API")
+    parser.add_argument("--speed", type=float, default=1.0, help="Facteur d'acceleration (x N)")
+    parser.add_argument("--limit", type=int, default=None, help="Nombre max de requetes rejouees")
+    parser.add_argument("--path-prefix", default=None, help="Ne rejouer que ce prefixe (ex: /api/v1/hotel_details)")
+    parser.add_argument("--shift-dates", action="store_true", help="Decaler checkin/checkout a aujourd'hui")
+    parser.add_argument("--mock", default=None, help="URL du mock Booking (stats amont remises a zero puis relevees)")
+    parser.add_argument("--connections", type=int, default=100)
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument("--json", default=None, help="Ecrire aussi le rapport JSON dans ce fichier")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    report = asyncio.run(run(args))
+    print_report(report)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report.to_dict(), f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
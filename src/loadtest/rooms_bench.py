@@ -0,0 +1,79 @@
+"""
+Benchmark de l'extraction de la table des chambres (Chromium requis).
+
+Page detail du mock dont la table est gonflee a N types de chambre x M tarifs,
+chargee via `page.set_content`, puis:
+- rowwise : ancienne extraction (query_selector + inner_text par ligne, 30 lignes max)
+- bulk    : un seul page.evaluate + parsing Python (src.scrapers.rooms)
+
+Lancement:
+    python -m src.loadtest.rooms_bench --room-types 12 --rates 4 --repeat 20
+"""
+
+from typing import Awaitable, Callable, Dict
+import argparse
+import asyncio
+import copy
+import statistics
+import time
+
+from playwright.async_api import async_playwright
+
+from src.loadtest import MockBooking, MockSettings
+from src.loadtest.pages import render_hotel_page
+from src.scrapers.details import DetailsScraper
+
+
+def inflated_hotel(room_types: int, rates: int) -> Dict:
+    hotel = copy.deepcopy(MockBooking(MockSettings()).hotel("le-grand-hotel-lyon"))
+    templates = hotel["rooms"]
+    hotel["rooms"] = []
+    for i in range(room_types):
+        room = copy.deepcopy(templates[i % len(templates)])
+        room["room_type"] = f"{room['room_type']} #{i + 1}"
+        room["rates"] = [{**room["rates"][j % len(room["rates"])], "price": 100 + 10 * i + j} for j in range(rates)]
+        hotel["rooms"].append(room)
+    return hotel
+
+
+async def timed(fn: Callable[[], Awaitable[list]], repeat: int) -> Dict[str, float]:
+    durations, found = [], 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        found = len(await fn())
+        durations.append((time.perf_counter() - start) * 1000)
+    return {"mean_ms": statistics.mean(durations), "p95_ms": sorted(durations)[int(len(durations) * 0.95)], "rates": found}
+
+
+async def run(args):
+    hotel = inflated_hotel(args.room_types, args.rates)
+    scraper = DetailsScraper()
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True)
+        page = await browser.new_page()
+        await page.set_content(render_hotel_page(hotel, lazy_sections=False))
+        variants = {
+            "rowwise": lambda: scraper._extract_rooms_rowwise(page),
+            "bulk": lambda: scraper._extract_rooms_complete(page, ""),
+        }
+        print(f"{args.room_types} types de chambre x {args.rates} tarifs = {args.room_types * args.rates} lignes, "
+              f"{args.repeat} iterations")
+        baseline = None
+        for name, fn in variants.items():
+            stats = await timed(fn, args.repeat)
+            baseline = baseline or stats["mean_ms"]
+            print(f"{name:<8} mean={stats['mean_ms']:.1f}ms p95={stats['p95_ms']:.1f}ms "
+                  f"tarifs={stats['rates']} x{baseline / stats['mean_ms']:.1f}")
+        await browser.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--room-types", type=int, default=12)
+    parser.add_argument("--rates", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=20)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
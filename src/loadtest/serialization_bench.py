@@ -0,0 +1,84 @@
+"""
+Benchmark de serialisation des reponses /hotel_details.
+
+Compare, sur les payloads d'exemple `hotel_details_*.json` (gonfles a une
+galerie et une table de chambres realistes):
+- response_model : revalidation + jsonable_encoder + json.dumps (chemin FastAPI par defaut)
+- orjson         : model_dump + orjson (json_response)
+- fields         : idem, projete sur quelques champs
+
+Lancement:
+    python -m src.loadtest.serialization_bench --images 50 --rooms 30
+"""
+
+from pathlib import Path
+from typing import Callable, Dict, List
+import argparse
+import json
+import statistics
+import time
+
+from fastapi.encoders import jsonable_encoder
+
+from src.api.responses import json_response, parse_fields
+from src.models.hotel import HotelDetails
+
+ROOT = Path(__file__).parent.parent.parent
+DEFAULT_FIELDS = "name,cheapest_price,review_score,rooms.room_type,rooms.price"
+
+
+def load_samples(images: int, rooms: int) -> List[HotelDetails]:
+    """Payloads d'exemple, listes repetees jusqu'a la taille demandee."""
+    samples = []
+    for path in sorted(ROOT.glob("hotel_details_*.json")):
+        data = json.loads(path.read_text(encoding="utf-8"))
+        for key, size in (("images", images), ("rooms", rooms)):
+            items = data.get(key) or []
+            if items:
+                data[key] = (items * (size // len(items) + 1))[:size]
+        samples.append(HotelDetails(**data))
+    return samples
+
+
+def response_model_path(details: HotelDetails) -> bytes:
+    validated = HotelDetails.model_validate(details.model_dump())
+    return json.dumps(jsonable_encoder(validated), ensure_ascii=False).encode("utf-8")
+
+
+def timed(fn: Callable[[HotelDetails], bytes], samples: List[HotelDetails], repeat: int) -> Dict[str, float]:
+    durations, size = [], 0
+    for _ in range(repeat):
+        for details in samples:
+            start = time.perf_counter()
+            size = len(fn(details))
+            durations.append((time.perf_counter() - start) * 1000)
+    return {"mean_ms": statistics.mean(durations), "p95_ms": sorted(durations)[int(len(durations) * 0.95)], "bytes": size}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--images", type=int, default=50)
+    parser.add_argument("--rooms", type=int, default=30)
+    parser.add_argument("--repeat", type=int, default=500)
+    parser.add_argument("--fields", default=DEFAULT_FIELDS)
+    args = parser.parse_args()
+
+    samples = load_samples(args.images, args.rooms)
+    include = parse_fields(HotelDetails, args.fields)
+    variants = {
+        "response_model": response_model_path,
+        "orjson": lambda details: json_response(details).body,
+        "fields": lambda details: json_response(details, include).body,
+    }
+
+    print(f"{len(samples)} payloads, {args.images} images, {args.rooms} chambres, {args.repeat} iterations")
+    baseline = None
+    for name, fn in variants.items():
+        stats = timed(fn, samples, args.repeat)
+        baseline = baseline or stats["mean_ms"]
+        print(f"{name:<15} mean={stats['mean_ms']:.3f}ms p95={stats['p95_ms']:.3f}ms "
+              f"taille={stats['bytes']}o x{baseline / stats['mean_ms']:.1f}")
+
+
+if __name__ == "__main__":
+    main()
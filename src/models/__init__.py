@@ -1,2 +1,2 @@
 from .search import HotelSearchRequest, HotelSearchResult, HotelSummary
-from .hotel import HotelDetailsRequest, HotelDetails
+from .hotel import HotelDetailsRequest, HotelDetails, GuestReview, HotelReviewsPage, HotelRecord, HotelMatch, HotelsArea, DETAIL_SECTIONS
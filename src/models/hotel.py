@@ -1,8 +1,16 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 from typing import List, Optional, Dict
 from datetime import time
 
 
+# Sections extraites de la page detail (sélectionnables via HotelDetailsRequest.sections)
+DETAIL_SECTIONS = (
+    "name", "address", "description", "property_type", "star_rating",
+    "review_summary", "review_scores", "images", "amenities", "rooms",
+    "policies", "house_rules", "nearby", "languages", "contact", "guest_reviews",
+)
+
+
 class HotelDetailsRequest(BaseModel):
     hotel_id: str = Field(..., description="ID de l'hotel (depuis search results)")
     country_code: str = Field(..., description="Code pays (ex: fr, gb, us)")
@@ -10,6 +18,20 @@ class HotelDetailsRequest(BaseModel):
     checkout: Optional[str] = Field(None, description="Date checkout pour prix chambres (YYYY-MM-DD)")
     adults: Optional[int] = Field(2, description="Nombre d'adultes pour prix chambres")
     rooms: Optional[int] = Field(1, description="Nombre de chambres")
+    sections: Optional[List[str]] = Field(None, description="Sections a extraire (toutes par defaut)")
+
+    @field_validator('sections', mode='before')
+    @classmethod
+    def parse_sections(cls, v):
+        if v is None:
+            return v
+        # Accepter "rooms,images" (query string) ou une liste
+        if isinstance(v, str):
+            v = [item.strip() for item in v.split(',') if item.strip()]
+        unknown = [item for item in v if item not in DETAIL_SECTIONS]
+        if unknown:
+            raise ValueError(f"Sections inconnues: {unknown} (valides: {', '.join(DETAIL_SECTIONS)})")
+        return v
 
 
 class Address(BaseModel):
@@ -34,6 +56,7 @@ class ReviewScores(BaseModel):
 
 
 class RoomOption(BaseModel):
+    """Un tarif: type de chambre x plan tarifaire (une ligne de la table des chambres)."""
     room_type: str
     price: Optional[float] = None
     currency: str = "EUR"
@@ -45,6 +68,34 @@ class RoomOption(BaseModel):
     cancellation_policy: Optional[str] = None
     breakfast_included: bool = False
     refundable: bool = False
+    room_id: Optional[str] = None
+    block_id: Optional[str] = None
+    meal_plan: Optional[str] = None
+    cancellation_terms: Optional[str] = None  # texte Booking (ex: "Free cancellation before 10 December 2025")
+
+
+class RatePlan(BaseModel):
+    """Plan tarifaire d'un type de chambre."""
+    block_id: Optional[str] = None
+    price: Optional[float] = None
+    currency: str = "EUR"
+    max_occupancy: Optional[int] = None
+    meal_plan: Optional[str] = None
+    breakfast_included: bool = False
+    cancellation_policy: Optional[str] = None
+    cancellation_terms: Optional[str] = None
+    refundable: bool = False
+
+
+class RoomType(BaseModel):
+    """Type de chambre et tous ses plans tarifaires."""
+    room_id: Optional[str] = None
+    room_type: str
+    bed_type: Optional[str] = None
+    room_size: Optional[str] = None
+    amenities: List[str] = []
+    rates: List[RatePlan] = []
+    cheapest_price: Optional[float] = None
 
 
 class NearbyAttraction(BaseModel):
@@ -65,6 +116,43 @@ class HotelPolicies(BaseModel):
     age_restriction: Optional[str] = None
 
 
+class GuestReview(BaseModel):
+    """Avis client complet."""
+    review_id: Optional[str] = Field(None, description="Identifiant stable attribue par le store d'avis")
+    reviewer_name: str
+    reviewer_country: str
+    review_date: str
+    positive_text: str = ""
+    negative_text: str = ""
+    score: float
+    tags: List[str] = Field(default_factory=list)
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "reviewer_name": "John Smith",
+                "reviewer_country": "United States",
+                "review_date": "December 15, 2024",
+                "positive_text": "Great location, clean room",
+                "negative_text": "Wifi was slow",
+                "score": 8.5,
+                "tags": ["Couple", "Leisure"]
+            }
+        }
+
+
+class ImageAsset(BaseModel):
+    """Image de galerie telechargee et stockee par contenu (pipeline d'assets)."""
+    image_id: str
+    source_url: str
+    sha256: str
+    path: str = Field(..., description="Chemin relatif dans le stockage (adresse par contenu)")
+    width: int
+    height: int
+    size_bytes: int
+    phash: str = Field(..., description="dHash 64 bits (hexadecimal)")
+
+
 class HotelDetails(BaseModel):
     # Identifiants
     hotel_id: str
@@ -87,6 +175,7 @@ class HotelDetails(BaseModel):
 
     # Visuels
     images: List[str] = []
+    image_assets: List[ImageAsset] = []
     main_image: Optional[str] = None
 
     # Equipements
@@ -94,8 +183,9 @@ class HotelDetails(BaseModel):
     popular_amenities: List[str] = []
     room_amenities: List[str] = []
 
-    # Chambres disponibles
+    # Chambres disponibles: un element par tarif, et les memes tarifs groupes par type de chambre
     rooms: List[RoomOption] = []
+    room_types: List[RoomType] = []
 
     # Prix
     cheapest_price: Optional[float] = None
@@ -119,25 +209,69 @@ class HotelDetails(BaseModel):
     scrape_timestamp: str
     scrape_parameters: Optional[Dict] = None
 
-    class GuestReview(BaseModel):
-        """Avis client complet."""
-        reviewer_name: str
-        reviewer_country: str
-        review_date: str
-        positive_text: str = ""
-        negative_text: str = ""
-        score: float
-        tags: List[str] = Field(default_factory=list)
-
-        class Config:
-            json_schema_extra = {
-                "example": {
-                    "reviewer_name": "John Smith",
-                    "reviewer_country": "United States",
-                    "review_date": "December 15, 2024",
-                    "positive_text": "Great location, clean room",
-                    "negative_text": "Wifi was slow",
-                    "score": 8.5,
-                    "tags": ["Couple", "Leisure"]
-                }
-            }
+    # Résultat partiel (sections en échec ou hors délai)
+    partial: bool = False
+    missing_sections: List[str] = []
+
+
+# Compatibilite: ancien modele imbrique HotelDetails.GuestReview
+HotelDetails.GuestReview = GuestReview
+
+
+class HotelRecord(BaseModel):
+    """Entree du registre d'hotels: relie le slug, l'id numerique et le pays d'un hotel."""
+    hotel_id: str = Field(..., description="Slug Booking (pageName)")
+    booking_id: Optional[int] = None
+    country_code: Optional[str] = None
+    name: Optional[str] = None
+    city: Optional[str] = None
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
+    last_seen: str
+
+
+class HotelMatch(HotelRecord):
+    """Hotel du registre renvoye par une requete geographique."""
+    distance_km: Optional[float] = None
+
+
+class HotelsArea(BaseModel):
+    """Resultat d'une requete geographique sur le registre (/hotels/nearby, /hotels/bbox)."""
+    hotels: List[HotelMatch] = []
+    total: int
+    stale: bool = Field(False, description="Aucune donnee de la zone plus recente que SPATIAL_TTL")
+    refreshed: bool = Field(False, description="Zone rafraichie par une recherche live")
+    refresh_skipped: bool = Field(
+        False, description="Recherche live non relancee: la derniere sur cette ville n'a renvoye aucune coordonnee"
+    )
+
+
+class HotelReviewsPage(BaseModel):
+    """Page d'avis servie par /hotel_reviews (pagination par curseur)."""
+    hotel_id: str
+    total: int
+    reviews: List[GuestReview] = []
+    next_cursor: Optional[str] = None
+    fetched_at: Optional[str] = None
+
+
+class HotelDetailsBatchItem(HotelDetailsRequest):
+    """Hotel d'un lot /hotel_details/batch (slug ou id numerique, code pays deduit du registre si omis)."""
+    country_code: Optional[str] = Field(None, description="Code pays (ex: fr, gb, us)")
+
+
+class HotelDetailsBatchRequest(BaseModel):
+    hotels: List[HotelDetailsBatchItem] = Field(..., min_length=1)
+
+
+class HotelDetailsBatchResult(BaseModel):
+    hotel_id: str
+    details: Optional[HotelDetails] = None
+    error: Optional[str] = None
+
+
+class HotelDetailsBatch(BaseModel):
+    """Reponse de /hotel_details/batch: un resultat par hotel, dans l'ordre du lot."""
+    results: List[HotelDetailsBatchResult] = []
+    succeeded: int = 0
+    failed: int = 0
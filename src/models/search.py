@@ -92,6 +92,8 @@ class HotelSearchRequest(BaseModel):
 
 class HotelSummary(BaseModel):
     hotel_id: str
+    booking_id: Optional[int] = Field(None, description="Identifiant numerique Booking")
+    country_code: Optional[str] = None
     name: str
     price: Optional[float] = None
     currency: str = "EUR"
@@ -99,6 +101,8 @@ class HotelSummary(BaseModel):
     review_score: Optional[float] = None
     review_count: Optional[int] = None
     location: Optional[str] = None
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
     image_url: Optional[str] = None
     url: str
 
@@ -1,6 +1,9 @@
 from playwright.async_api import async_playwright, Page, Browser
 from config.settings import settings
 from tenacity import retry, stop_after_attempt, wait_exponential
+from src.utils.metrics import BROWSERS_OPEN, count_retry, track_page
+from src.scrapers.session import check_session, open_context
+import asyncio
 import logging
 
 logging.basicConfig(level=logging.INFO)
@@ -9,40 +12,61 @@ logger = logging.getLogger(__name__)
 class BaseScraper:
     """Scraper de base avec gestion navigateur, retry, timeout."""
 
+    # Label des metriques Prometheus
+    scraper_name = "base"
+
     def __init__(self):
         self.browser: Browser = None
         self.context = None
+        self.session = None
+        self.playwright = None
+        self._launch_lock = asyncio.Lock()
 
     async def __aenter__(self):
+        # Chromium n'est lance qu'a la premiere page, donc apres l'obtention d'un slot de
+        # l'ordonnanceur: une requete en file ou refusee ne tient aucun navigateur ouvert
+        return self
+
+    async def _launch_browser(self):
+        async with self._launch_lock:
+            if self.context is None:
+                await self._start_browser()
+
+    async def _start_browser(self):
         self.playwright = await async_playwright().start()
         self.browser = await self.playwright.chromium.launch(
             headless=settings.headless,
             args=['--disable-blink-features=AutomationControlled']
         )
-        self.context = await self.browser.new_context(
+        BROWSERS_OPEN.labels(self.scraper_name).inc()
+        self.context, self.session = await open_context(
+            self.browser,
             user_agent=settings.user_agent,
             viewport={'width': 1920, 'height': 1080}
         )
-        return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         if self.context:
             await self.context.close()
         if self.browser:
             await self.browser.close()
+            BROWSERS_OPEN.labels(self.scraper_name).dec()
         if self.playwright:
             await self.playwright.stop()
 
     async def new_page(self) -> Page:
-        page = await self.context.new_page()
+        await self._launch_browser()
+        page = track_page(await self.context.new_page(), self.scraper_name)
         await page.set_extra_http_headers({
             'Accept-Language': 'en-US,en;q=0.9'
         })
         return page
 
-    @retry(stop=stop_after_attempt(3), wait=wait_exponential(min=1, max=10))
+    @retry(stop=stop_after_attempt(3), wait=wait_exponential(min=1, max=10), before_sleep=count_retry)
     async def safe_goto(self, page: Page, url: str):
-        """Navigation avec retry automatique."""
+        """Navigation avec retry automatique; renvoie la reponse principale."""
         logger.info(f"Navigation vers: {url}")
-        await page.goto(url, timeout=settings.timeout, wait_until='domcontentloaded')
+        response = await page.goto(url, timeout=settings.timeout, wait_until='domcontentloaded')
+        await check_session(page, self.session)
         await page.wait_for_timeout(2000)  # Attente anti-detection
+        return response
@@ -0,0 +1,117 @@
+"""
+Classification rapide d'une page apres navigation.
+
+Au lieu d'attendre jusqu'au timeout le selecteur attendu (cartes de resultats),
+on le met en course avec les signatures connues des pages "aucun resultat",
+challenge/captcha et erreur: la premiere signature presente decide de l'issue,
+en general des le chargement du DOM. Le statut HTTP et l'URL finale sont
+verifies avant toute attente.
+"""
+
+from enum import Enum
+from typing import Dict, Optional, Tuple
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class PageOutcome(str, Enum):
+    RESULTS = "results"
+    EMPTY = "empty"
+    BLOCKED = "blocked"
+    ERROR = "error"
+
+
+# Delai (secondes) avant de retenter apres un blocage, sans Retry-After exploitable de Booking
+BLOCKED_RETRY_AFTER = 300
+
+
+class PageOutcomeError(Exception):
+    """
+    Page bloquee (captcha, 403/429) ou en erreur: inutile de poursuivre le scrape.
+    `retry_after` (secondes): delai conseille avant de retenter une page bloquee.
+    """
+
+    def __init__(self, outcome: PageOutcome, detail: str = "", retry_after: Optional[int] = None):
+        self.outcome = outcome
+        self.retry_after = retry_after or (BLOCKED_RETRY_AFTER if outcome is PageOutcome.BLOCKED else None)
+        super().__init__(f"Page {outcome.value}{f': {detail}' if detail else ''}")
+
+
+SIGNATURES: Dict[PageOutcome, Tuple[str, ...]] = {
+    PageOutcome.EMPTY: (
+        '[data-testid="no-results-message"]',
+        'h1:has-text(": 0 properties found")',
+        'text=/no properties found/i',
+    ),
+    PageOutcome.BLOCKED: (
+        '#challenge-container',
+        '#px-captcha',
+        '[data-testid="captcha"]',
+        'iframe[src*="captcha"]',
+        'form[action*="challenge"]',
+        'text=/verify (that )?you are (a )?human/i',
+    ),
+    PageOutcome.ERROR: (
+        '[data-testid="error-page"]',
+        'text=/something went wrong/i',
+    ),
+}
+
+BLOCKED_URL_MARKERS = ("/captcha", "/challenge", "/blocked")
+BLOCKED_STATUSES = (403, 429)
+
+
+def upstream_retry_after(response) -> Optional[int]:
+    """Retry-After en secondes renvoye par Booking (None si absent ou sous forme de date HTTP)."""
+    headers = getattr(response, "headers", None) or {}
+    value = str(headers.get("retry-after", "")).strip()
+    return int(value) if value.isdigit() else None
+
+
+def classify_response(response, url: str = "") -> Optional[PageOutcome]:
+    """Issue deductible sans attendre le DOM (statut HTTP, redirection vers un challenge)."""
+    if any(marker in url for marker in BLOCKED_URL_MARKERS):
+        return PageOutcome.BLOCKED
+    status = getattr(response, "status", None)
+    if status in BLOCKED_STATUSES:
+        return PageOutcome.BLOCKED
+    if status is not None and status >= 400:
+        return PageOutcome.ERROR
+    return None
+
+
+async def classify_page(page, expected: str, timeout: float = 90.0, response=None) -> PageOutcome:
+    """
+    Course entre `expected` (RESULTS) et les signatures connues; ERROR si rien
+    n'apparait en `timeout` secondes.
+    """
+    early = classify_response(response, getattr(page, "url", "") or "")
+    if early is not None:
+        return early
+
+    watchers = {
+        asyncio.ensure_future(page.wait_for_selector(selector, state="attached", timeout=timeout * 1000)): (outcome, selector)
+        for outcome, selectors in [(PageOutcome.RESULTS, (expected,)), *SIGNATURES.items()]
+        for selector in selectors
+    }
+    pending = set(watchers)
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+            if not done:
+                break
+            # Signature absente a l'expiration: exception de wait_for_selector, ignoree
+            matched = [task for task in watchers if task in done and task.exception() is None]
+            if matched:
+                outcome, selector = watchers[matched[0]]
+                logger.info(f"Page classee {outcome.value} ({selector})")
+                return outcome
+    finally:
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+    logger.warning(f"Aucune signature reconnue en {timeout:.0f}s")
+    return PageOutcome.ERROR
@@ -6,45 +6,150 @@ Version corrigée pour attractions, house rules, équipements, langues
 from playwright.async_api import Page, Browser
 from playwright.async_api import async_playwright
 from config.settings import settings
-from datetime import datetime
+from datetime import date, datetime
 from typing import Optional, List, Dict, Any, Tuple
+import asyncio
+import contextvars
 import logging
 import re
 import json
+import time
 import html as html_module
-
+import httpx
+
+from src.utils.tracing import Trace, traced
+from src.utils.metrics import BROWSERS_OPEN, SCROLL_SAVED, record_fast_path, record_payload_source, track_page
+from src.scrapers.extraction import ExtractionScheduler, DOM, HTML
+from src.scrapers.reviews import ReviewsFetcher
+from src.scrapers.interception import ResponseCapture, map_reviews, map_rooms
+from src.scrapers.rooms import extract_room_blocks, group_rates
+from src.scrapers.fast_path import FAST_PATH_SECTIONS, StaticPage, fetch_html, present_sections
+from src.scrapers.scheduler import Priority, get_scheduler
+from src.scrapers.session import check_session, open_context
+from src.scrapers.tabs import get_tab_pool
 from src.models.hotel import (
     HotelDetailsRequest, HotelDetails, Address, ReviewScores,
-    RoomOption, NearbyAttraction, HotelPolicies
+    RoomOption, NearbyAttraction, HotelPolicies, GuestReview, DETAIL_SECTIONS
 )
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-
-class GuestReview:
-    """Modèle pour un avis client."""
-
-    def __init__(self, reviewer_name: str, reviewer_country: str, review_date: str,
-                 positive_text: str, negative_text: str, score: float, tags: List[str] = None):
-        self.reviewer_name = reviewer_name
-        self.reviewer_country = reviewer_country
-        self.review_date = review_date
-        self.positive_text = positive_text
-        self.negative_text = negative_text
-        self.score = score
-        self.tags = tags or []
+# Vrai dans les tâches d'un lot get_many: seuls ces onglets sont mesurés pour la limite d'onglets
+_IN_TAB_BATCH = contextvars.ContextVar("details_tab_batch", default=False)
+
+# Sections chargées paresseusement et sélecteur qui prouve leur présence dans le DOM
+LAZY_SECTION_SELECTORS = {
+    "review_scores": '[data-testid="review-subscore"]',
+    "amenities": '[data-testid="facility-group-container"]',
+    "languages": '[data-testid="facility-group-container"]',
+    "rooms": 'tr[data-room-id], tr.js-rt-block-row',
+    "policies": '#hp_policies_box, [data-testid="property-section--checkin"]',
+    "house_rules": '.b0400e5749',
+    "nearby": '[data-testid="poi-block-list"]',
+    "guest_reviews": '[data-testid="featuredreview"], [data-testid="fr-read-all-reviews"]',
+}
+
+# Scroll d'un écran par pas: MutationObserver pour attendre la fin du rendu,
+# IntersectionObserver sur une sentinelle pour détecter le bas du document.
+ADAPTIVE_SCROLL_JS = """
+async ({selectors, stepDelay, stableSteps, maxSteps}) => {
+    const sleep = (ms) => new Promise(r => setTimeout(r, ms));
+    let lastMutation = performance.now();
+    const mutationObserver = new MutationObserver(() => { lastMutation = performance.now(); });
+    mutationObserver.observe(document.body, {childList: true, subtree: true});
+
+    const sentinel = document.createElement('div');
+    document.body.appendChild(sentinel);
+    let atBottom = false;
+    const bottomObserver = new IntersectionObserver((entries) => { atBottom = entries[0].isIntersecting; });
+    bottomObserver.observe(sentinel);
+
+    const unresolved = () => Object.keys(selectors).filter(k => !document.querySelector(selectors[k]));
+    let steps = 0, stable = 0, height = document.documentElement.scrollHeight;
+    while (steps < maxSteps && unresolved().length) {
+        window.scrollBy(0, Math.round(window.innerHeight * 0.9));
+        steps++;
+        const stepStart = performance.now();
+        await sleep(stepDelay);
+        while (performance.now() - lastMutation < stepDelay && performance.now() - stepStart < stepDelay * 5) {
+            await sleep(50);
+        }
+        document.body.appendChild(sentinel);
+        const newHeight = document.documentElement.scrollHeight;
+        stable = (atBottom && newHeight === height) ? stable + 1 : 0;
+        height = newHeight;
+        if (stable >= stableSteps) break;
+    }
+
+    mutationObserver.disconnect();
+    bottomObserver.disconnect();
+    sentinel.remove();
+    return {steps, unresolved: unresolved(), height};
+}
+"""
 
 
 class DetailsScraper:
     """Scraper FINAL avec extraction précise."""
 
+    scraper_name = "details"
+
+    # Échéances par section (secondes), surchargeables via settings.section_timeouts
+    SECTION_TIMEOUTS = {
+        "rooms": 15.0,
+        "guest_reviews": 15.0,
+        "amenities": 12.0,
+    }
+    SCROLL_TIMEOUT = 20.0
+
+    # Scroll adaptatif: délai de calme DOM par pas, pas stables en bas de page, pas max
+    SCROLL_STEP_DELAY_MS = 300
+    SCROLL_STABLE_STEPS = 2
+    SCROLL_MAX_STEPS = 30
+    # Durée de l'ancien scroll fixe (10 x 400 ms + 2 s + clic avis 2 s), référence du gain
+    FIXED_SCROLL_MS = 8000
+
+    # Valeurs renvoyées pour une section en échec ou non demandée
+    SECTION_DEFAULTS = {
+        "name": "Unknown Hotel",
+        "address": None,
+        "description": None,
+        "property_type": None,
+        "star_rating": None,
+        "review_summary": (None, None, None),
+        "review_scores": None,
+        "images": ([], None),
+        "amenities": ([], []),
+        "rooms": [],
+        "policies": None,
+        "house_rules": [],
+        "nearby": [],
+        "languages": [],
+        "contact": (None, None),
+        "guest_reviews": [],
+    }
+
     def __init__(self):
         self.browser: Browser = None
         self.context = None
+        self.session = None
         self.playwright = None
+        self.tabs = get_tab_pool()
+        self._launch_lock = asyncio.Lock()
 
     async def __aenter__(self):
+        # Chromium n'est lancé qu'à la première page qui l'exige (jamais avec un chemin rapide
+        # suffisant), donc après l'obtention d'un slot de l'ordonnanceur
+        return self
+
+    async def _launch_browser(self):
+        """Lance Chromium à la première page qui en a besoin (une seule fois, même en parallèle)."""
+        async with self._launch_lock:
+            if self.context is None:
+                await self._start_browser()
+
+    async def _start_browser(self):
         self.playwright = await async_playwright().start()
         self.browser = await self.playwright.chromium.launch(
             headless=settings.headless,
@@ -54,18 +159,20 @@ class DetailsScraper:
                 '--no-sandbox'
             ]
         )
-        self.context = await self.browser.new_context(
+        BROWSERS_OPEN.labels(self.scraper_name).inc()
+        self.context, self.session = await open_context(
+            self.browser,
             user_agent=settings.user_agent,
             viewport={'width': 1920, 'height': 1080},
             locale='en-US'
         )
-        return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         if self.context:
             await self.context.close()
         if self.browser:
             await self.browser.close()
+            BROWSERS_OPEN.labels(self.scraper_name).dec()
         if self.playwright:
             await self.playwright.stop()
 
@@ -89,124 +196,322 @@ class DetailsScraper:
 
         return base_url
 
-    async def get_hotel_details(self, request: HotelDetailsRequest) -> Tuple[HotelDetails, List[GuestReview]]:
-        """Extraction complète avec sélecteurs précis."""
-        page = await self.context.new_page()
-
-        try:
-            url = self._build_hotel_url(request)
-            logger.info(f"🔍 Scraping: {url}")
-
-            await page.goto(url, wait_until='domcontentloaded', timeout=60000)
-            await page.wait_for_timeout(5000)
-
-            await self._mega_scroll(page)
+    async def get_hotel_details(self, request: HotelDetailsRequest, priority: Priority = Priority.INTERACTIVE,
+                                deadline: Optional[float] = None) -> Tuple[HotelDetails, List[GuestReview]]:
+        """
+        Extraction complète avec sélecteurs précis.
 
-            html_content = await page.content()
-            json_data = self._extract_all_json_ld(html_content)
-
-            logger.info("📊 Extraction précise...")
-
-            name = await self._extract_name(page, json_data)
-            address = await self._extract_address(page, html_content, json_data)
-            description = await self._extract_description_full(page, html_content, json_data)
-            property_type = await self._extract_property_type(page, html_content, json_data)
-            star_rating = await self._extract_star_rating_complete(page, html_content, json_data)
-
-            review_score, review_count, review_category = await self._extract_reviews(
-                page, html_content, json_data
-            )
-
-            review_scores_detail = await self._extract_detailed_scores_guaranteed(page, html_content)
-
-            images, main_image = await self._extract_images_decoded(page, html_content, json_data)
-
-            # ÉQUIPEMENTS - extraction ciblée sur les vraies facilities
-            amenities, popular_amenities = await self._extract_amenities_targeted(page, html_content, json_data)
-
-            rooms = await self._extract_rooms_complete(page, html_content)
-            cheapest_price = min([r.price for r in rooms if r.price], default=None)
-
-            policies = await self._extract_policies(page, html_content)
-
-            # HOUSE RULES - ciblage précis sur .b0400e5749
-            house_rules = await self._extract_house_rules_targeted(page, html_content)
-
-            # ATTRACTIONS - ciblage précis sur [data-testid="poi-block-list"]
-            nearby_attractions = await self._extract_nearby_targeted(page, html_content)
-
-            # LANGUES - extraction ciblée
-            languages_spoken = await self._extract_languages_targeted(page, html_content)
-
-            phone, email = await self._extract_contact_complete(page, html_content)
-
-            guest_reviews = await self._extract_all_reviews_guaranteed(page, html_content)
-
-            logger.info(f"✅ {name} | {len(guest_reviews)} avis | {len(images)} images | {len(amenities)} équipements")
-
-            result = HotelDetails(
-                hotel_id=request.hotel_id,
-                name=name,
-                url=url,
-                address=address,
-                description=description,
-                property_type=property_type,
-                star_rating=star_rating,
-                review_score=review_score,
-                review_count=review_count,
-                review_category=review_category,
-                review_scores_detail=review_scores_detail,
-                images=images,
-                main_image=main_image,
-                amenities=amenities,
-                popular_amenities=popular_amenities,
-                rooms=rooms,
-                cheapest_price=cheapest_price,
-                policies=policies,
-                house_rules=house_rules,
-                nearby_attractions=nearby_attractions,
-                languages_spoken=languages_spoken,
-                phone=phone,
-                email=email,
-                scrape_timestamp=datetime.utcnow().isoformat(),
-                scrape_parameters={
-                    "checkin": request.checkin,
-                    "checkout": request.checkout,
-                    "adults": request.adults,
-                    "rooms": request.rooms
-                }
-            )
+        Attend d'abord un slot de l'ordonnanceur (`priority`, `deadline`: voir src.scrapers.scheduler).
+        """
+        async with get_scheduler().slot(priority, deadline):
+            trace = Trace("hotel_details", hotel_id=request.hotel_id)
+            try:
+                with trace.activate():
+                    return await self._scrape_hotel(request, trace)
+            finally:
+                if settings.trace_export_path:
+                    trace.export(settings.trace_export_path)
+
+    async def get_many(self, requests: List[HotelDetailsRequest], priority: Priority = Priority.BATCH,
+                       deadline: Optional[float] = None) -> List[Any]:
+        """
+        Plusieurs hôtels en parallèle, un onglet chacun dans le contexte partagé.
+        Résultats dans l'ordre des requêtes: (détails, avis) ou l'exception levée.
+        """
+        async def one(request: HotelDetailsRequest):
+            # Le budget d'un hôtel ne démarre qu'une fois son onglet attribué
+            _IN_TAB_BATCH.set(True)  # contexte propre à la tâche créée par gather
+            async with self.tabs.slot():
+                return await self.get_hotel_details(request, priority, deadline)
+
+        return await asyncio.gather(*(one(r) for r in requests), return_exceptions=True)
+
+    async def iter_reviews(self, hotel_id: str, country_code: str, since: Optional[date] = None,
+                           limit: Optional[int] = None, priority: Priority = Priority.INTERACTIVE):
+        """
+        Tous les avis d'un hôtel (du plus récent au plus ancien) via la liste paginée.
+
+        Un slot d'ordonnanceur est pris pour lancer le navigateur puis pour chaque
+        page, jamais entre deux pages: un consommateur lent ou abandonné n'en
+        immobilise aucun.
+        """
+        async with get_scheduler().slot(priority):
+            await self._launch_browser()
+        fetcher = ReviewsFetcher(self.context, slot=lambda: get_scheduler().slot(priority))
+        async for review in fetcher.iter_reviews(hotel_id, country_code, since, limit):
+            yield review
+
+    async def _scrape_hotel(self, request: HotelDetailsRequest, trace: Trace) -> Tuple[HotelDetails, List[GuestReview]]:
+        deadline = time.monotonic() + settings.details_budget
+        url = self._build_hotel_url(request)
+        logger.info(f"🔍 Scraping: {url}")
+
+        wanted = list(request.sections or DETAIL_SECTIONS)
+        extracted: Dict[str, Any] = {}
+        failed: Dict[str, str] = {}
+        scroll_stats = None
+        fast_path = None
 
-            return result, guest_reviews
+        try:
+            if settings.fast_path and all(s in FAST_PATH_SECTIONS for s in wanted):
+                extracted = await self._fast_extract(url, wanted, trace, deadline)
+                remaining = [s for s in wanted if s not in extracted]
+                outcome = "unavailable" if not extracted else ("escalated" if remaining else "sufficient")
+                record_fast_path(outcome)
+                fast_path = {"outcome": outcome, "sections": sorted(extracted), "escalated": remaining}
+                logger.info(f"⚡ Chemin rapide: {outcome} ({len(extracted)}/{len(wanted)} sections)")
+            else:
+                # Une section exige Chromium: la page y est chargee de toute facon, le GET httpx serait perdu
+                remaining = wanted
+                if settings.fast_path:
+                    record_fast_path("skipped")
+                    fast_path = {"outcome": "skipped", "sections": [], "escalated": remaining}
+
+            if remaining:
+                browser_extracted, failed, scroll_stats = await self._browser_extract(
+                    request, url, remaining, trace, deadline
+                )
+                extracted.update(browser_extracted)
 
         except Exception as e:
             logger.error(f"❌ Erreur: {e}")
             import traceback
             traceback.print_exc()
             raise
-        finally:
-            await page.close()
 
-    async def _mega_scroll(self, page: Page):
-        """Scroll complet pour charger tout le contenu lazy-loaded."""
+        missing_sections = sorted(failed)
+        if missing_sections:
+            logger.warning(f"⚠️  Résultat partiel, sections manquantes: {', '.join(missing_sections)}")
+
+        def section(name: str):
+            return extracted.get(name, self.SECTION_DEFAULTS[name])
+
+        name = section("name")
+        address = section("address")
+        description = section("description")
+        property_type = section("property_type")
+        star_rating = section("star_rating")
+        review_score, review_count, review_category = section("review_summary")
+        review_scores_detail = section("review_scores")
+        images, main_image = section("images")
+        amenities, popular_amenities = section("amenities")
+        rooms = section("rooms")
+        cheapest_price = min([r.price for r in rooms if r.price], default=None)
+        policies = section("policies")
+        house_rules = section("house_rules")
+        nearby_attractions = section("nearby")
+        languages_spoken = section("languages")
+        phone, email = section("contact")
+        guest_reviews = section("guest_reviews")
+
+        logger.info(f"✅ {name} | {len(guest_reviews)} avis | {len(images)} images | {len(amenities)} équipements")
+        slowest = sorted(trace.spans, key=lambda s: s.duration_ms, reverse=True)[:3]
+        logger.info("⏱️  " + " | ".join(f"{s.name} {s.duration_ms:.0f} ms" for s in slowest))
+
+        result = HotelDetails(
+            hotel_id=request.hotel_id,
+            name=name,
+            url=url,
+            address=address,
+            description=description,
+            property_type=property_type,
+            star_rating=star_rating,
+            review_score=review_score,
+            review_count=review_count,
+            review_category=review_category,
+            review_scores_detail=review_scores_detail,
+            images=images,
+            main_image=main_image,
+            amenities=amenities,
+            popular_amenities=popular_amenities,
+            rooms=rooms,
+            room_types=group_rates(rooms),
+            cheapest_price=cheapest_price,
+            policies=policies,
+            house_rules=house_rules,
+            nearby_attractions=nearby_attractions,
+            languages_spoken=languages_spoken,
+            phone=phone,
+            email=email,
+            scrape_timestamp=datetime.utcnow().isoformat(),
+            scrape_parameters={
+                "checkin": request.checkin,
+                "checkout": request.checkout,
+                "adults": request.adults,
+                "rooms": request.rooms,
+                "sections": request.sections,
+                "fast_path": fast_path,
+                "scroll": scroll_stats,
+                "trace": trace.summary()
+            },
+            partial=bool(missing_sections),
+            missing_sections=missing_sections
+        )
+
+        return result, guest_reviews
+
+    async def _fast_extract(self, url: str, sections: List[str], trace: Trace, deadline: float) -> Dict[str, Any]:
+        """
+        Extraction sur le HTML serveur récupéré sans navigateur. Ne renvoie que
+        les sections dont la source est présente dans ce HTML (valeur vide comprise):
+        les autres sont confiées à Chromium.
+        """
+        fast_sections = [s for s in sections if s in FAST_PATH_SECTIONS]
+        if not fast_sections:
+            return {}
+
+        with trace.span("fast_fetch", url=url) as fetch_span:
+            try:
+                status, html = await fetch_html(url, timeout=max(1.0, self._remaining_ms(deadline) / 1000))
+            except httpx.HTTPError as e:
+                logger.warning(f"⚠️  Chemin rapide indisponible: {e}")
+                return {}
+            fetch_span.attributes["status"] = status
+        if status != 200:
+            logger.warning(f"⚠️  Chemin rapide: HTTP {status}")
+            return {}
+
+        extraction = self._build_extraction(StaticPage(), html, deadline, fast_sections)
+        with trace.span("fast_extraction"):
+            results = await extraction.run()
+
+        present = present_sections(html, results.get("json_ld") or [])
+        return {
+            name: value for name, value in results.items()
+            if name in fast_sections and name in present and name not in extraction.failed
+        }
+
+    async def _browser_extract(self, request: HotelDetailsRequest, url: str, sections: List[str],
+                               trace: Trace, deadline: float) -> Tuple[Dict[str, Any], Dict[str, str], Optional[Dict]]:
+        """Navigation Chromium + extraction des sections demandées -> (résultats, échecs, stats scroll)."""
+        await self._launch_browser()
+        page = track_page(await self.context.new_page(), self.scraper_name)
+        capture = ResponseCapture(page).attach()
+
         try:
-            for i in range(10):
-                await page.evaluate(f"window.scrollTo(0, {i * 1200})")
-                await page.wait_for_timeout(400)
+            with trace.span("navigation", url=url):
+                await page.goto(url, wait_until='domcontentloaded',
+                                timeout=min(60000, max(1000, self._remaining_ms(deadline))))
+                # Verification du consentement: au plus 10% du budget restant
+                await check_session(page, self.session, timeout=min(3.0, self._remaining_ms(deadline) / 10000))
+                await page.wait_for_timeout(min(5000, self._remaining_ms(deadline)))
+
+            scroll_stats = None
+            try:
+                scroll_stats = await asyncio.wait_for(self._adaptive_scroll(page, sections),
+                                                      timeout=min(self.SCROLL_TIMEOUT, self._remaining_ms(deadline) / 1000))
+            except asyncio.TimeoutError:
+                logger.warning("⏱️  Scroll interrompu: extraction sur le contenu déjà chargé")
+
+            with trace.span("page_content"):
+                html_content = await page.content()
+                await capture.settle(timeout=min(2.0, self._remaining_ms(deadline) / 1000))
+                captured = {"rooms": map_rooms(capture.payloads), "guest_reviews": map_reviews(capture.payloads)}
+            logger.info("📊 Extraction précise...")
 
-            await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-            await page.wait_for_timeout(2000)
+            extraction = self._build_extraction(page, html_content, deadline, sections, request, captured)
+            with trace.span("extraction"):
+                extracted = await extraction.run()
 
+            return extracted, extraction.failed, scroll_stats
+        finally:
             try:
+                if _IN_TAB_BATCH.get():
+                    await self.tabs.sample(page)
+            finally:
+                await page.close()
+
+    def _remaining_ms(self, deadline: float) -> float:
+        """Temps restant (ms) avant l'échéance globale du scrape."""
+        return max(0.0, (deadline - time.monotonic()) * 1000)
+
+    def _section_timeout(self, section: str) -> float:
+        timeouts = {**self.SECTION_TIMEOUTS, **settings.section_timeouts}
+        return timeouts.get(section, settings.extractor_timeout)
+
+    def _build_extraction(self, page: Page, html: str, deadline: Optional[float] = None,
+                          sections: Optional[List[str]] = None,
+                          request: Optional[HotelDetailsRequest] = None,
+                          captured: Optional[Dict[str, list]] = None) -> ExtractionScheduler:
+        """
+        Graphe d'extraction: les extracteurs HTML purs tournent dans l'executor,
+        les extracteurs DOM en parallele sur la page; tous dependent du JSON-LD.
+        Chaque section est bornée par son échéance et par le budget global.
+        Avec `request`, les avis viennent de la liste paginée plutôt que du DOM;
+        `captured` (payloads JSON interceptés) remplace les sélecteurs des chambres.
+        """
+        captured = captured or {}
+        scheduler = ExtractionScheduler(default_timeout=settings.extractor_timeout, deadline=deadline)
+        results = scheduler.results
+
+        scheduler.add("json_ld", lambda: self._extract_all_json_ld(html), kind=HTML, default=[])
+        after_json = ("json_ld",)
+
+        extractors = {
+            "name": (lambda: self._extract_name(page, results["json_ld"]), DOM),
+            "address": (lambda: self._extract_address(page, html, results["json_ld"]), DOM),
+            "description": (lambda: self._extract_description_full(page, html, results["json_ld"]), DOM),
+            "property_type": (lambda: self._extract_property_type(page, html, results["json_ld"]), DOM),
+            "star_rating": (lambda: self._extract_star_rating_complete(page, html, results["json_ld"]), DOM),
+            "review_summary": (lambda: self._extract_reviews(page, html, results["json_ld"]), DOM),
+            "review_scores": (lambda: self._extract_detailed_scores_guaranteed(page, html), DOM),
+            "images": (lambda: self._extract_images_decoded(html, results["json_ld"]), HTML),
+            "amenities": (lambda: self._extract_amenities_targeted(page, html, results["json_ld"]), DOM),
+            "rooms": (lambda: self._extract_rooms(page, html, captured.get("rooms")), DOM),
+            "policies": (lambda: self._extract_policies(html), HTML),
+            "house_rules": (lambda: self._extract_house_rules_targeted(page, html), DOM),
+            "nearby": (lambda: self._extract_nearby_targeted(page, html), DOM),
+            "languages": (lambda: self._extract_languages_targeted(page, html), DOM),
+            "contact": (lambda: self._extract_contact_complete(html), HTML),
+            "guest_reviews": (lambda: self._extract_guest_reviews(page, html, request, captured.get("guest_reviews")), DOM),
+        }
+        for section, (func, kind) in extractors.items():
+            if sections is not None and section not in sections:
+                continue
+            scheduler.add(section, func, kind=kind, depends_on=after_json,
+                          timeout=self._section_timeout(section), default=self.SECTION_DEFAULTS[section])
+
+        return scheduler
+
+    @traced()
+    async def _adaptive_scroll(self, page: Page, sections: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Scroll piloté par le contenu: avance d'un écran tant que les sections demandées
+        ne sont pas dans le DOM, attend que les mutations se calment à chaque pas, et
+        s'arrête dès que le bas du document est atteint sans croissance.
+        """
+        wanted = [s for s in (sections or DETAIL_SECTIONS) if s in LAZY_SECTION_SELECTORS]
+        start = time.monotonic()
+        stats: Dict[str, Any] = {"steps": 0, "unresolved": wanted}
+
+        try:
+            if wanted:
+                stats = await page.evaluate(ADAPTIVE_SCROLL_JS, {
+                    "selectors": {s: LAZY_SECTION_SELECTORS[s] for s in wanted},
+                    "stepDelay": self.SCROLL_STEP_DELAY_MS,
+                    "stableSteps": self.SCROLL_STABLE_STEPS,
+                    "maxSteps": self.SCROLL_MAX_STEPS,
+                })
+
+            if "guest_reviews" in wanted:
                 read_all_btn = await page.query_selector('[data-testid="fr-read-all-reviews"], button:has-text("Read all reviews")')
                 if read_all_btn:
                     await read_all_btn.click()
-                    await page.wait_for_timeout(2000)
-            except:
-                pass
-        except:
-            pass
+                    try:
+                        await page.wait_for_selector('.review_list_new_item_block, [data-testid="review-card"]', timeout=2000)
+                    except Exception:
+                        pass
+        except Exception as e:
+            logger.warning(f"⚠️  Scroll adaptatif interrompu: {e}")
 
+        elapsed_ms = (time.monotonic() - start) * 1000
+        stats["scroll_ms"] = round(elapsed_ms)
+        stats["saved_ms"] = round(max(0.0, self.FIXED_SCROLL_MS - elapsed_ms))
+        SCROLL_SAVED.inc(stats["saved_ms"] / 1000)
+        logger.info(f"📜 Scroll: {stats['steps']} pas, {stats['scroll_ms']} ms ({stats['saved_ms']} ms économisées)")
+        return stats
+
+    @traced()
     def _extract_all_json_ld(self, html: str) -> List[dict]:
         json_blocks = []
         try:
@@ -221,6 +526,7 @@ class DetailsScraper:
             pass
         return json_blocks
 
+    @traced()
     async def _extract_name(self, page: Page, json_data: List[dict]) -> str:
         for jdata in json_data:
             if jdata.get('name') and len(str(jdata['name'])) > 3:
@@ -239,6 +545,7 @@ class DetailsScraper:
 
         return "Unknown Hotel"
 
+    @traced()
     async def _extract_address(self, page: Page, html: str, json_data: List[dict]) -> Optional[Address]:
         full_address = None
         lat, lon = None, None
@@ -270,6 +577,7 @@ class DetailsScraper:
 
         return Address(full_address=full_address, latitude=lat, longitude=lon) if (full_address or lat) else None
 
+    @traced()
     async def _extract_description_full(self, page: Page, html: str, json_data: List[dict]) -> Optional[str]:
         descriptions = []
 
@@ -309,6 +617,7 @@ class DetailsScraper:
 
         return '\n\n'.join(unique_desc) if unique_desc else None
 
+    @traced()
     async def _extract_property_type(self, page: Page, html: str, json_data: List[dict]) -> Optional[str]:
         for jdata in json_data:
             ptype = jdata.get('@type')
@@ -342,6 +651,7 @@ class DetailsScraper:
 
         return "Hotel"
 
+    @traced()
     async def _extract_star_rating_complete(self, page: Page, html: str, json_data: List[dict]) -> Optional[int]:
         for jdata in json_data:
             if jdata.get('starRating'):
@@ -387,6 +697,7 @@ class DetailsScraper:
 
         return None
 
+    @traced()
     async def _extract_reviews(self, page: Page, html: str, json_data: List[dict]) -> Tuple[Optional[float], Optional[int], Optional[str]]:
         score, count, category = None, None, None
 
@@ -428,6 +739,7 @@ class DetailsScraper:
 
         return score, count, category
 
+    @traced()
     async def _extract_detailed_scores_guaranteed(self, page: Page, html: str) -> Optional[ReviewScores]:
         scores = {}
 
@@ -482,7 +794,8 @@ class DetailsScraper:
 
         return ReviewScores(**scores) if scores else None
 
-    async def _extract_images_decoded(self, page: Page, html: str, json_data: List[dict]) -> Tuple[List[str], Optional[str]]:
+    @traced()
+    def _extract_images_decoded(self, html: str, json_data: List[dict]) -> Tuple[List[str], Optional[str]]:
         images_set = set()
         main_image = None
 
@@ -521,6 +834,7 @@ class DetailsScraper:
 
         return images[:50], main_image
 
+    @traced()
     async def _extract_amenities_targeted(self, page: Page, html: str, json_data: List[dict]) -> Tuple[List[str], List[str]]:
         """ÉQUIPEMENTS - Extraction exhaustive complète."""
         amenities = set()
@@ -610,14 +924,37 @@ class DetailsScraper:
 
         return cleaned, popular[:15]
 
-    async def _extract_rooms_complete(self, page: Page, html: str) -> List[RoomOption]:
-        rooms = []
+    @traced()
+    async def _extract_rooms(self, page: Page, html: str, captured: Optional[List[RoomOption]] = None) -> List[RoomOption]:
+        """Chambres du payload JSON intercepté, sinon table des chambres du DOM."""
+        record_payload_source("rooms", bool(captured))
+        if captured:
+            logger.info(f"🛏️  {len(captured)} tarifs via JSON intercepté")
+            return captured
+        return await self._extract_rooms_complete(page, html)
 
+    @traced()
+    async def _extract_rooms_complete(self, page: Page, html: str) -> List[RoomOption]:
+        """Toutes les lignes chambre x tarif en un seul page.evaluate (repli ligne par ligne)."""
         try:
             await page.wait_for_selector('tr[data-room-id], .hprt-table tr', timeout=5000)
         except:
             pass
 
+        try:
+            rooms = await extract_room_blocks(page)
+        except Exception as e:
+            logger.warning(f"Extraction groupee des chambres en echec, repli ligne par ligne: {e}")
+            return await self._extract_rooms_rowwise(page)
+
+        logger.info(f"🛏️  {len(rooms)} tarifs, {len({r.room_id or r.room_type for r in rooms})} types de chambre")
+        return rooms
+
+    @traced()
+    async def _extract_rooms_rowwise(self, page: Page) -> List[RoomOption]:
+        """Ancienne extraction: un aller-retour navigateur par ligne, 30 lignes max."""
+        rooms = []
+
         room_rows = await page.query_selector_all('tr[data-room-id], tr.js-rt-block-row')
 
         for row in room_rows[:30]:
@@ -731,7 +1068,8 @@ class DetailsScraper:
             pass
         return None
 
-    async def _extract_policies(self, page: Page, html: str) -> Optional[HotelPolicies]:
+    @traced()
+    def _extract_policies(self, html: str) -> Optional[HotelPolicies]:
         policies = {}
 
         checkin_match = re.search(r'Check-in.*?(\d{1,2}:\d{2})', html, re.IGNORECASE)
@@ -744,6 +1082,7 @@ class DetailsScraper:
 
         return HotelPolicies(**policies) if policies else None
 
+    @traced()
     async def _extract_house_rules_targeted(self, page: Page, html: str) -> List[str]:
         """HOUSE RULES - Ciblage précis sur .b0400e5749."""
         rules = []
@@ -778,6 +1117,7 @@ class DetailsScraper:
 
         return rules[:30]
 
+    @traced()
     async def _extract_nearby_targeted(self, page: Page, html: str) -> List[NearbyAttraction]:
         """ATTRACTIONS - Ciblage précis sur [data-testid="poi-block-list"]."""
         attractions = []
@@ -855,6 +1195,7 @@ class DetailsScraper:
 
         return attractions[:100]
 
+    @traced()
     async def _extract_languages_targeted(self, page: Page, html: str) -> List[str]:
         """LANGUES - Extraction ciblée."""
         languages = []
@@ -908,7 +1249,8 @@ class DetailsScraper:
 
         return languages[:15]
 
-    async def _extract_contact_complete(self, page: Page, html: str) -> Tuple[Optional[str], Optional[str]]:
+    @traced()
+    def _extract_contact_complete(self, html: str) -> Tuple[Optional[str], Optional[str]]:
         phone = None
         email = None
 
@@ -932,6 +1274,29 @@ class DetailsScraper:
 
         return phone, email
 
+    @traced()
+    async def _extract_guest_reviews(self, page: Page, html: str, request: Optional[HotelDetailsRequest] = None,
+                                     captured: Optional[List[GuestReview]] = None) -> List[GuestReview]:
+        """
+        Avis via /reviewlist.html (cookies de la page), puis avis du payload JSON
+        intercepté, et en dernier recours le DOM.
+        """
+        if request is not None:
+            try:
+                fetcher = ReviewsFetcher(page.context)
+                reviews = await fetcher.fetch_reviews(request.hotel_id, request.country_code,
+                                                      limit=settings.details_reviews_limit)
+                if reviews:
+                    logger.info(f"💬 {len(reviews)} avis via la liste paginée")
+                    return reviews
+            except Exception as e:
+                logger.warning(f"⚠️  Liste d'avis indisponible, repli sur le DOM: {e}")
+        record_payload_source("guest_reviews", bool(captured))
+        if captured:
+            return captured
+        return await self._extract_all_reviews_guaranteed(page, html)
+
+    @traced()
     async def _extract_all_reviews_guaranteed(self, page: Page, html: str) -> List[GuestReview]:
         reviews = []
 
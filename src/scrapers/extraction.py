@@ -0,0 +1,146 @@
+"""
+Ordonnanceur d'extraction: execute les extracteurs independants en parallele.
+
+- "dom"  : coroutine qui interroge la page Playwright (asyncio.gather)
+- "html" : fonction synchrone sur le HTML capture (executor, hors boucle asyncio)
+
+Chaque tache peut dependre d'autres taches et a son propre timeout, borne par
+l'echeance globale du scrape; une tache en echec ou hors delai prend sa valeur
+par defaut sans bloquer les autres.
+"""
+
+from concurrent.futures import Executor
+from typing import Any, Callable, Dict, Iterable, Optional
+import asyncio
+import contextvars
+import logging
+import time
+
+from src.utils.metrics import record_extractor_failure
+
+logger = logging.getLogger(__name__)
+
+DOM = "dom"
+HTML = "html"
+
+
+class ExtractionTask:
+    def __init__(self, name: str, func: Callable[[], Any], kind: str = DOM,
+                 depends_on: Iterable[str] = (), timeout: Optional[float] = None, default: Any = None):
+        if kind not in (DOM, HTML):
+            raise ValueError(f"Type de tache inconnu: {kind}")
+        self.name = name
+        self.func = func
+        self.kind = kind
+        self.depends_on = tuple(depends_on)
+        self.timeout = timeout
+        self.default = default
+
+
+class ExtractionScheduler:
+    """Graphe de taches d'extraction execute au plus tot selon les dependances."""
+
+    def __init__(self, default_timeout: Optional[float] = None, executor: Optional[Executor] = None,
+                 deadline: Optional[float] = None):
+        """`deadline`: echeance absolue (time.monotonic()) commune a toutes les taches."""
+        self.default_timeout = default_timeout
+        self.executor = executor
+        self.deadline = deadline
+        self.tasks: Dict[str, ExtractionTask] = {}
+        self.results: Dict[str, Any] = {}
+        self.failed: Dict[str, str] = {}
+
+    def add(self, name: str, func: Callable[[], Any], kind: str = DOM,
+            depends_on: Iterable[str] = (), timeout: Optional[float] = None, default: Any = None):
+        """
+        Ajoute une tache. `func` est appelee sans argument une fois les dependances
+        resolues (lire leurs valeurs dans `scheduler.results`).
+        """
+        if name in self.tasks:
+            raise ValueError(f"Tache deja definie: {name}")
+        self.tasks[name] = ExtractionTask(name, func, kind, depends_on, timeout, default)
+        return self
+
+    async def run(self) -> Dict[str, Any]:
+        self._check_graph()
+        done: Dict[str, asyncio.Future] = {}
+        loop = asyncio.get_running_loop()
+        for name in self.tasks:
+            done[name] = loop.create_future()
+
+        async def run_task(task: ExtractionTask):
+            try:
+                for dep in task.depends_on:
+                    await done[dep]
+                self.results[task.name] = await self._execute(task)
+            finally:
+                done[task.name].set_result(True)
+
+        await asyncio.gather(*(run_task(t) for t in self.tasks.values()))
+        return self.results
+
+    async def _execute(self, task: ExtractionTask) -> Any:
+        timeout = task.timeout if task.timeout is not None else self.default_timeout
+        if self.deadline is not None:
+            remaining = self.deadline - time.monotonic()
+            if remaining <= 0:
+                logger.warning(f"⏱️  Extracteur {task.name} ignoré: budget épuisé")
+                self._fail(task, "budget")
+                return task.default
+            timeout = remaining if timeout is None else min(timeout, remaining)
+        try:
+            if task.kind == HTML:
+                # Propager le contexte (trace courante) dans le thread de l'executor
+                ctx = contextvars.copy_context()
+                work = asyncio.get_running_loop().run_in_executor(self.executor, ctx.run, task.func)
+            else:
+                work = task.func()
+            return await self._wait(work, timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"⏱️  Extracteur {task.name} hors délai ({timeout}s)")
+            self._fail(task, "timeout")
+        except Exception as e:
+            logger.warning(f"⚠️  Extracteur {task.name} en erreur: {e}")
+            self._fail(task, "error", f"{type(e).__name__}: {e}")
+        return task.default
+
+    def _fail(self, task: ExtractionTask, reason: str, detail: Optional[str] = None):
+        """Valeur par defaut retenue: `failed` et compteur scraper_extractor_failures_total."""
+        self.failed[task.name] = detail or reason
+        record_extractor_failure(task.name, reason)
+
+    @staticmethod
+    async def _wait(work, timeout: Optional[float]) -> Any:
+        """
+        Comme asyncio.wait_for, sans attendre la fin de la tache annulee: les
+        extracteurs utilisent des `except:` nus qui peuvent absorber l'annulation.
+        """
+        future = asyncio.ensure_future(work)
+        done, _ = await asyncio.wait({future}, timeout=timeout)
+        if not done:
+            future.cancel()
+            future.add_done_callback(lambda f: f.cancelled() or f.exception())
+            raise asyncio.TimeoutError()
+        return future.result()
+
+    def _check_graph(self):
+        for task in self.tasks.values():
+            for dep in task.depends_on:
+                if dep not in self.tasks:
+                    raise ValueError(f"Dependance inconnue pour {task.name}: {dep}")
+
+        visiting, visited = set(), set()
+
+        def visit(name: str):
+            if name in visited:
+                return
+            if name in visiting:
+                raise ValueError(f"Dependance circulaire sur {name}")
+            visiting.add(name)
+            for dep in self.tasks[name].depends_on:
+                visit(dep)
+            visiting.discard(name)
+            visited.add(name)
+
+        for name in self.tasks:
+            visit(name)
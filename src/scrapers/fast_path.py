@@ -0,0 +1,66 @@
+"""
+Chemin rapide sans navigateur pour la page detail.
+
+Le HTML initial servi par Booking contient deja le JSON-LD, la description,
+l'adresse, les images, les politiques et le contact: on le recupere avec le
+client httpx partage (src.utils.http_client) et on execute les extracteurs
+dessus. Seules les sections qui exigent du JavaScript (chambres, avis,
+sections paresseuses) sont confiees a Chromium.
+
+Une section est acquise des que sa source est presente dans le HTML serveur,
+meme si sa valeur est vide (hotel sans etoiles, sans contact publie): seule
+une source absente justifie de la chercher dans le navigateur.
+"""
+
+from typing import List, Optional, Set, Tuple
+import logging
+import re
+
+from src.utils.http_client import get_http_client
+
+logger = logging.getLogger(__name__)
+
+# Sections presentes dans le HTML serveur (JSON-LD + balisage initial)
+FAST_PATH_SECTIONS = (
+    "name", "address", "description", "property_type", "star_rating",
+    "review_summary", "images", "policies", "contact",
+)
+
+# Sections lues dans le bloc JSON-LD de l'hotel (et le HTML serveur complet qui l'accompagne)
+JSON_LD_SECTIONS = (
+    "name", "address", "description", "property_type", "star_rating", "review_summary", "contact",
+)
+
+# Sections dont la source est un bloc de balisage, absent tant que la section n'est pas rendue
+HTML_MARKERS = {
+    "images": re.compile(r"cf\.bstatic\.com/xdata/images/hotel/"),
+    "policies": re.compile(r'id="hp_policies_box"|data-testid="property-section--checkin"'),
+}
+
+
+class StaticPage:
+    """Page sans navigateur: aucun element DOM, les extracteurs utilisent le JSON-LD et le HTML."""
+
+    async def query_selector(self, selector):
+        return None
+
+    async def query_selector_all(self, selector):
+        return []
+
+    async def wait_for_selector(self, selector, timeout=None):
+        raise TimeoutError(f"Pas de DOM sur le chemin rapide: {selector}")
+
+
+def present_sections(html: str, json_ld: List[dict]) -> Set[str]:
+    """Sections dont la source figure dans le HTML serveur (JSON-LD de l'hotel, balisage)."""
+    present = set()
+    if any(isinstance(block, dict) and block.get("@type") and block.get("name") for block in json_ld):
+        present.update(JSON_LD_SECTIONS)
+    present.update(section for section, marker in HTML_MARKERS.items() if marker.search(html))
+    return present
+
+
+async def fetch_html(url: str, timeout: Optional[float] = None) -> Tuple[int, str]:
+    """GET de la page -> (statut HTTP, HTML)."""
+    response = await get_http_client().get(url, timeout=timeout)
+    return response.status_code, response.text
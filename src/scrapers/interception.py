@@ -0,0 +1,180 @@
+"""
+Interception des reponses JSON (GraphQL/XHR) des pages Booking.
+
+Les cartes de resultats, la table des chambres et les avis sont alimentes par
+des appels JSON; les capturer via `page.on("response")` evite de parcourir le
+DOM et ses classes obfusquees. Les mappers renvoient une liste vide quand le
+payload attendu est absent: l'appelant retombe alors sur les selecteurs.
+
+Formes reconnues:
+- recherche : data.searchQueries.search.results[] (basicPropertyData, displayName, priceDisplayInfoIrene)
+- chambres  : b_rooms_available_and_soldout[] (b_name, b_blocks[] -> un RoomOption par tarif)
+- avis      : reviewListFrontend.reviewCard[] (guestDetails, textDetails, reviewedDate epoch)
+"""
+
+from config.settings import settings
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional, Set
+import asyncio
+import logging
+
+from src.models.hotel import GuestReview, RoomOption
+from src.models.search import HotelSummary
+
+logger = logging.getLogger(__name__)
+
+# Fragments d'URL des appels JSON utiles
+CAPTURE_URL_PATTERNS = ("/dml/graphql", "/fragment.json")
+
+IMAGE_HOST = "https://cf.bstatic.com"
+
+
+class ResponseCapture:
+    """Collecte les corps JSON des reponses d'une page pendant la navigation."""
+
+    def __init__(self, page, url_patterns=CAPTURE_URL_PATTERNS):
+        self.page = page
+        self.url_patterns = tuple(url_patterns)
+        self.payloads: List[Any] = []
+        self._pending: Set[asyncio.Task] = set()
+
+    def attach(self) -> "ResponseCapture":
+        """A appeler avant page.goto pour ne rien manquer."""
+        self.page.on("response", self._on_response)
+        return self
+
+    def detach(self):
+        try:
+            self.page.remove_listener("response", self._on_response)
+        except Exception:
+            pass
+
+    def _on_response(self, response):
+        if not any(pattern in response.url for pattern in self.url_patterns):
+            return
+        content_type = (response.headers or {}).get("content-type", "")
+        if "json" not in content_type:
+            return
+        task = asyncio.ensure_future(self._read(response))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    async def _read(self, response):
+        try:
+            self.payloads.append(await response.json())
+        except Exception as e:
+            logger.debug(f"Reponse JSON illisible ({response.url}): {e}")
+
+    async def settle(self, timeout: float = 2.0):
+        """Attend la lecture des corps de reponse deja recus (au plus `timeout` s)."""
+        if self._pending:
+            await asyncio.wait(set(self._pending), timeout=timeout)
+
+
+def _find(payload: Any, key: str) -> Iterator[Any]:
+    """Toutes les valeurs de `key`, a n'importe quelle profondeur."""
+    if isinstance(payload, dict):
+        for k, v in payload.items():
+            if k == key:
+                yield v
+            else:
+                yield from _find(v, key)
+    elif isinstance(payload, list):
+        for item in payload:
+            yield from _find(item, key)
+
+
+def _get(data: Optional[Dict], *path, default=None):
+    for key in path:
+        if not isinstance(data, dict):
+            return default
+        data = data.get(key)
+    return default if data is None else data
+
+
+def map_search_results(payloads: List[Any]) -> List[HotelSummary]:
+    hotels, seen = [], set()
+    for payload in payloads:
+        for results in _find(payload, "results"):
+            if not isinstance(results, list):
+                continue
+            for result in results:
+                basic = _get(result, "basicPropertyData")
+                page_name = _get(basic, "pageName")
+                if not page_name or page_name in seen:
+                    continue
+                seen.add(page_name)
+                country_code = _get(basic, "location", "countryCode", default="fr")
+                photo = _get(basic, "photos", "main", "highResUrl", "relativeUrl")
+                hotels.append(HotelSummary(
+                    hotel_id=page_name,
+                    booking_id=_get(basic, "id"),
+                    country_code=country_code,
+                    name=_get(result, "displayName", "text", default="Unknown"),
+                    price=_get(result, "priceDisplayInfoIrene", "displayPrice", "amountPerStay", "amountUnformatted"),
+                    currency=_get(result, "priceDisplayInfoIrene", "displayPrice", "amountPerStay", "currency", default="EUR"),
+                    rating=_get(basic, "starRating", "value"),
+                    review_score=_get(basic, "reviews", "totalScore"),
+                    review_count=_get(basic, "reviews", "reviewsCount"),
+                    location=_get(result, "location", "displayLocation") or _get(basic, "location", "city"),
+                    latitude=_get(basic, "location", "latitude"),
+                    longitude=_get(basic, "location", "longitude"),
+                    image_url=f"{IMAGE_HOST}{photo}" if photo else None,
+                    url=f"{settings.booking_base_url}/hotel/{country_code}/{page_name}.html"
+                ))
+    return hotels
+
+
+def map_rooms(payloads: List[Any]) -> List[RoomOption]:
+    rooms = []
+    for payload in payloads:
+        for room_list in _find(payload, "b_rooms_available_and_soldout"):
+            for room in room_list or []:
+                size = room.get("b_surface_in_m2")
+                for block in room.get("b_blocks") or []:
+                    free_cancellation = block.get("b_cancellation_type") == "free_cancellation"
+                    meal_plan = (block.get("b_mealplan_included_name") or "").lower()
+                    rooms.append(RoomOption(
+                        room_type=room.get("b_name") or "Unknown Room",
+                        price=block.get("b_raw_price"),
+                        currency=block.get("b_currency") or "EUR",
+                        capacity=block.get("b_max_persons"),
+                        max_occupancy=block.get("b_max_persons"),
+                        bed_type=room.get("b_bed_type"),
+                        room_size=f"{size} m²" if size else None,
+                        amenities=list(room.get("b_facilities") or []),
+                        cancellation_policy="Free cancellation" if free_cancellation else "Non-refundable",
+                        breakfast_included="breakfast" in meal_plan,
+                        refundable=free_cancellation,
+                        room_id=str(room["b_id"]) if room.get("b_id") is not None else None,
+                        block_id=block.get("b_block_id"),
+                        meal_plan=block.get("b_mealplan_included_name"),
+                        cancellation_terms=block.get("b_cancellation_text")
+                    ))
+    return rooms
+
+
+def map_reviews(payloads: List[Any]) -> List[GuestReview]:
+    reviews = []
+    for payload in payloads:
+        for cards in _find(payload, "reviewCard"):
+            for card in cards or []:
+                positive = _get(card, "textDetails", "positiveText", default="")
+                negative = _get(card, "textDetails", "negativeText", default="")
+                if not (positive or negative):
+                    continue
+                review_date = "Unknown"
+                if _get(card, "reviewedDate"):
+                    reviewed = datetime.fromtimestamp(card["reviewedDate"], tz=timezone.utc)
+                    review_date = f"{reviewed.day} {reviewed.strftime('%B %Y')}"
+                customer_type = _get(card, "bookingDetails", "customerType")
+                reviews.append(GuestReview(
+                    reviewer_name=_get(card, "guestDetails", "username", default="Anonymous"),
+                    reviewer_country=_get(card, "guestDetails", "countryName", default="Unknown"),
+                    review_date=review_date,
+                    positive_text=positive,
+                    negative_text=negative,
+                    score=float(_get(card, "reviewScore", default=0.0)),
+                    tags=[customer_type] if customer_type else []
+                ))
+    return reviews
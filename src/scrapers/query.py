@@ -0,0 +1,126 @@
+"""
+Compilation canonique d'une HotelSearchRequest en URL de recherche Booking.
+
+Tous les filtres passent par un seul parametre `nflt` (`cle=valeur` separes
+par `;`), dans un ordre fixe: par filtre puis par valeur. Les valeurs sans
+effet sont retirees (type "all", doublons, prix/distance nuls, plan de repas
+"all"), et la ville est normalisee. Deux requetes equivalentes produisent donc
+la meme URL et la meme cle de hachage, ce qui permet au cache, au regroupement
+des scrapes concurrents et a la deduplication de les reconnaitre.
+"""
+
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+from urllib.parse import urlencode
+import hashlib
+
+from config.settings import settings
+from src.models.search import HotelSearchRequest, MealPlan, PropertyType
+
+# Ordre canonique des filtres dans nflt
+NFLT_ORDER = ("ht_id", "class", "review_score", "price", "distance", "mealplan", "fc", "hotelfacility")
+
+# Filtres que le cache de recherche sait reappliquer localement (hors page de base)
+LOCAL_FILTERS = ("class", "review_score", "price")
+
+FACILITY_FILTERS = {
+    "free_wifi": "107",
+    "free_parking": "2",
+    "pool": "433",
+    "fitness_center": "43",
+    "air_conditioning": "11",
+    "restaurant": "3",
+    "pets_allowed": "4",
+}
+
+FREE_CANCELLATION = "1"
+
+SORT_ORDERS = {
+    "popularity": "popularity",
+    "price": "price",
+    "review_score": "review_score_and_price",
+    "distance": "distance_from_search",
+}
+
+Param = Tuple[str, str]
+
+
+def normalize_city(city: str) -> str:
+    return " ".join(city.split())
+
+
+def _sort_value(value: str):
+    return (0, int(value), "") if value.isdigit() else (1, 0, value)
+
+
+def nflt_filters(request: HotelSearchRequest, local: bool = True) -> List[Param]:
+    """Filtres (cle, valeur) de la requete, dedoublonnes et dans l'ordre canonique."""
+    filters = set()
+    for prop_type in request.property_types or []:
+        if prop_type != PropertyType.ALL:
+            filters.add(("ht_id", prop_type.value))
+    for star in request.star_rating or []:
+        filters.add(("class", str(star)))
+    if request.min_review_score:
+        # Booking: 60=6+, 70=7+, 80=8+, 90=9+
+        filters.add(("review_score", str(int(request.min_review_score * 10))))
+    if request.min_price or request.max_price:
+        filters.add(("price", f"EUR-{request.min_price or 0}-{request.max_price or 'max'}-1"))
+    if request.distance_from_center:
+        filters.add(("distance", str(request.distance_from_center * 1000)))  # metres
+    if request.meal_plan and request.meal_plan != MealPlan.NO_PREFERENCE:
+        filters.add(("mealplan", request.meal_plan.value))
+    if request.free_cancellation:
+        filters.add(("fc", FREE_CANCELLATION))
+    for field, facility in FACILITY_FILTERS.items():
+        if getattr(request, field):
+            filters.add(("hotelfacility", facility))
+
+    if not local:
+        filters = {f for f in filters if f[0] not in LOCAL_FILTERS}
+    return sorted(filters, key=lambda f: (NFLT_ORDER.index(f[0]), _sort_value(f[1])))
+
+
+@dataclass(frozen=True)
+class SearchQuery:
+    """Parametres canoniques de /searchresults.html."""
+    params: Tuple[Param, ...]
+
+    @property
+    def nflt(self) -> Optional[str]:
+        return dict(self.params).get("nflt")
+
+    @property
+    def key(self) -> str:
+        """Hachage stable: la ville est comparee sans casse."""
+        canonical = urlencode([(k, v.casefold() if k == "ss" else v) for k, v in self.params])
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:24]
+
+    def url(self, base_url: Optional[str] = None) -> str:
+        return f"{base_url or settings.booking_base_url}/searchresults.html?{urlencode(self.params)}"
+
+
+def compile_search(request: HotelSearchRequest, local: bool = True) -> SearchQuery:
+    """
+    Requete -> parametres canoniques. `local=False` omet les filtres
+    re-applicables localement et le tri (page de base du cache de recherche).
+    """
+    params = [
+        ("ss", normalize_city(request.city)),
+        ("checkin", request.checkin.isoformat()),
+        ("checkout", request.checkout.isoformat()),
+        ("group_adults", str(request.adults)),
+        ("group_children", str(request.children)),
+        ("no_rooms", str(request.rooms)),
+    ]
+    filters = nflt_filters(request, local)
+    if filters:
+        params.append(("nflt", ";".join(f"{k}={v}" for k, v in filters)))
+    if local:
+        params.append(("order", SORT_ORDERS.get(request.sort_by, "popularity")))
+    return SearchQuery(tuple(params))
+
+
+def request_key(request: HotelSearchRequest) -> str:
+    """Cle d'une requete complete (URL canonique + nombre de resultats): regroupement des scrapes identiques."""
+    return f"{compile_search(request).key}:{request.max_results}"
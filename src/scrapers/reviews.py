@@ -0,0 +1,232 @@
+"""
+Recuperation des avis via l'endpoint de liste paginee (/reviewlist.html).
+
+C'est l'endpoint appele par la modale "Read all reviews": il renvoie un
+fragment HTML de `rows` avis a partir de `offset`, tries du plus recent au plus
+ancien. Les requetes passent par `context.request` pour reutiliser les cookies
+de la session navigateur, avec un nombre borne de pages en vol.
+"""
+
+from config.settings import settings
+from contextlib import nullcontext
+from datetime import date
+from html.parser import HTMLParser
+from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_exponential
+from typing import AsyncContextManager, AsyncIterator, Callable, List, Optional, Tuple
+import asyncio
+import logging
+
+from src.models.hotel import GuestReview
+from src.utils.helpers import parse_review_date
+from src.utils.tracing import span
+
+logger = logging.getLogger(__name__)
+
+REVIEW_LIST_PATH = "/reviewlist.html"
+
+_VOID_TAGS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "source", "track", "wbr"}
+
+
+class ReviewListError(Exception):
+    """Reponse non exploitable de l'endpoint de liste d'avis (429, 5xx...)."""
+
+
+class _ReviewListParser(HTMLParser):
+    """Extrait les blocs `.review_list_new_item_block` et la derniere page de la pagination."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.items: List[dict] = []
+        self.last_page: Optional[int] = None
+        self._stack: List[Tuple[str, List[str]]] = []
+        self._item: Optional[dict] = None
+        self._item_depth = 0
+        self._row = "positive"
+
+    def handle_starttag(self, tag, attrs):
+        classes = (dict(attrs).get("class") or "").split()
+        if "review_list_new_item_block" in classes:
+            self._item = {"name": "", "country": "", "date": "", "score": "", "positive": "",
+                          "negative": "", "tags": []}
+            self._item_depth = len(self._stack) + 1
+        if self._item is not None:
+            if "c-review__row" in classes:
+                # Booking marque la ligne "negatif" avec une classe technique
+                self._row = "negative" if "lalala" in classes else "positive"
+            if tag == "li" and self._inside("review-panel-wide__traveller_type"):
+                self._item["tags"].append("")
+        if tag not in _VOID_TAGS:
+            self._stack.append((tag, classes))
+
+    def handle_endtag(self, tag):
+        if all(open_tag != tag for open_tag, _ in self._stack):
+            return
+        while self._stack:
+            open_tag, _ = self._stack.pop()
+            if self._item is not None and len(self._stack) < self._item_depth:
+                self.items.append(self._item)
+                self._item = None
+            if open_tag == tag:
+                break
+
+    def handle_data(self, data):
+        text = data.strip()
+        if not text:
+            return
+        if self._inside("bui-pagination__link") and text.isdigit():
+            self.last_page = max(self.last_page or 0, int(text))
+            return
+        if self._item is None:
+            return
+
+        item = self._item
+        if self._inside("bui-avatar-block__title"):
+            item["name"] += text
+        elif self._inside("bui-avatar-block__subtitle"):
+            item["country"] += text
+        elif self._inside("c-review-block__date") and not item["date"]:
+            item["date"] = text
+        elif self._inside("bui-review-score__badge"):
+            item["score"] += text
+        elif self._inside("review-panel-wide__traveller_type") and item["tags"]:
+            item["tags"][-1] = (item["tags"][-1] + " " + text).strip()
+        elif self._inside("review_pos"):
+            item["positive"] = (item["positive"] + " " + text).strip()
+        elif self._inside("review_neg"):
+            item["negative"] = (item["negative"] + " " + text).strip()
+        elif self._inside("c-review__body"):
+            item[self._row] = (item[self._row] + " " + text).strip()
+
+    def _inside(self, css_class: str) -> bool:
+        return any(css_class in classes for _, classes in self._stack)
+
+
+def parse_review_list(html: str) -> Tuple[List[GuestReview], Optional[int]]:
+    """Parse un fragment /reviewlist.html -> (avis, numero de la derniere page ou None)."""
+    parser = _ReviewListParser()
+    parser.feed(html)
+    parser.close()
+
+    reviews = []
+    for item in parser.items:
+        if not (item["positive"] or item["negative"]):
+            continue
+        try:
+            score = float(item["score"].replace(",", "."))
+        except ValueError:
+            score = 0.0
+        reviews.append(GuestReview(
+            reviewer_name=item["name"] or "Anonymous",
+            reviewer_country=item["country"] or "Unknown",
+            review_date=item["date"].replace("Reviewed:", "").strip() or "Unknown",
+            positive_text=item["positive"],
+            negative_text=item["negative"],
+            score=score,
+            tags=[t for t in item["tags"] if t]
+        ))
+    return reviews, parser.last_page
+
+
+class ReviewsFetcher:
+    """Pagine la liste d'avis d'un hotel avec les cookies du contexte navigateur."""
+
+    def __init__(self, context, concurrency: Optional[int] = None, page_size: Optional[int] = None,
+                 slot: Optional[Callable[[], AsyncContextManager]] = None):
+        """
+        `context`: BrowserContext Playwright (ou tout objet exposant `.request.get`).
+        `slot`: slot d'ordonnanceur pris pour chaque requete de page (aucun par defaut).
+        """
+        self.context = context
+        self.concurrency = max(1, concurrency or settings.reviews_concurrency)
+        self.page_size = max(1, page_size or settings.reviews_page_size)
+        self.slot = slot or nullcontext
+
+    async def iter_reviews(self, hotel_id: str, country_code: str, since: Optional[date] = None,
+                           limit: Optional[int] = None) -> AsyncIterator[GuestReview]:
+        """
+        Avis du plus recent au plus ancien, au fil des pages.
+
+        `since`: s'arrete au premier avis anterieur a cette date (fetch incremental).
+        `limit`: nombre maximum d'avis renvoyes.
+        """
+        count = 0
+        pages = self._pages(hotel_id, country_code, limit)
+        try:
+            async for page in pages:
+                for review in page:
+                    if since is not None:
+                        reviewed = parse_review_date(review.review_date)
+                        if reviewed is not None and reviewed < since:
+                            return
+                    yield review
+                    count += 1
+                    if limit is not None and count >= limit:
+                        return
+        finally:
+            # Annule les pages encore en vol
+            await pages.aclose()
+
+    async def fetch_reviews(self, hotel_id: str, country_code: str, since: Optional[date] = None,
+                            limit: Optional[int] = None) -> List[GuestReview]:
+        return [r async for r in self.iter_reviews(hotel_id, country_code, since, limit)]
+
+    async def _pages(self, hotel_id: str, country_code: str, limit: Optional[int]) -> AsyncIterator[List[GuestReview]]:
+        """Pages dans l'ordre; au plus `concurrency` requetes en vol."""
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def fetch(offset: int):
+            async with semaphore, self.slot():
+                return await self._fetch_page(hotel_id, country_code, offset)
+
+        first, last_page = await fetch(0)
+        yield first
+        if len(first) < self.page_size and not last_page:
+            return
+
+        max_pages = None if limit is None else -(-limit // self.page_size)
+        if last_page:
+            max_pages = last_page if max_pages is None else min(max_pages, last_page)
+
+        page_number = 1
+        while max_pages is None or page_number < max_pages:
+            # Pagination connue: toutes les pages sont lancees (bornees par le semaphore);
+            # sinon on avance par fenetres de `concurrency` pages jusqu'a une page incomplete.
+            window = (max_pages - page_number) if max_pages is not None else self.concurrency
+            tasks = [
+                asyncio.create_task(fetch((page_number + i) * self.page_size))
+                for i in range(window)
+            ]
+            try:
+                for task in tasks:
+                    reviews, _ = await task
+                    page_number += 1
+                    yield reviews
+                    if len(reviews) < self.page_size and max_pages is None:
+                        return
+            finally:
+                for task in tasks:
+                    task.cancel()
+
+    @retry(stop=stop_after_attempt(3), wait=wait_exponential(min=1, max=10),
+           retry=retry_if_exception_type(ReviewListError), reraise=True)
+    async def _fetch_page(self, hotel_id: str, country_code: str, offset: int) -> Tuple[List[GuestReview], Optional[int]]:
+        params = {
+            "cc1": country_code,
+            "pagename": hotel_id,
+            "type": "total",
+            "sort": "f_recent_desc",
+            "offset": offset,
+            "rows": self.page_size,
+            "lang": "en-us",
+        }
+        with span("review_page", offset=offset):
+            response = await self.context.request.get(
+                f"{settings.booking_base_url}{REVIEW_LIST_PATH}", params=params, timeout=settings.timeout
+            )
+            if not response.ok:
+                raise ReviewListError(f"{REVIEW_LIST_PATH} offset={offset}: HTTP {response.status}")
+            html = await response.text()
+
+        reviews, last_page = parse_review_list(html)
+        logger.info(f"💬 Avis {offset}-{offset + len(reviews)} ({hotel_id})")
+        return reviews, last_page
@@ -0,0 +1,135 @@
+"""
+Extraction de la table des chambres en un seul appel navigateur.
+
+Un unique `page.evaluate` parcourt toutes les lignes `tr[data-block-id]`
+(une ligne = un plan tarifaire) et renvoie des chaines brutes: la cellule du
+type de chambre n'apparait que sur la premiere ligne de chaque type (rowspan),
+elle est reportee sur les lignes suivantes. Le parsing (prix, occupation,
+repas, annulation) se fait ensuite en Python sur ces chaines courtes, sans
+aller-retour vers le navigateur par ligne ni limite de lignes.
+"""
+
+from typing import Any, Dict, Iterable, List, Optional
+import re
+
+from src.models.hotel import RatePlan, RoomOption, RoomType
+
+ROOM_ROWS_SELECTOR = 'tr[data-block-id], tr[data-room-id], tr.js-rt-block-row'
+
+ROOM_BLOCKS_JS = """
+(selector) => {
+    const text = (root, sel) => {
+        const el = sel ? root.querySelector(sel) : root;
+        return el ? (el.innerText || el.textContent || '').trim() || null : null;
+    };
+    const blocks = [];
+    let current = null;
+    for (const row of document.querySelectorAll(selector)) {
+        const blockId = row.getAttribute('data-block-id');
+        const roomId = row.getAttribute('data-room-id') || (blockId ? blockId.split('_')[0] : null);
+        const nameEl = row.querySelector('.hprt-roomtype-link, [data-testid="room-name"]');
+        if (nameEl || !current || (roomId && roomId !== current.room_id)) {
+            current = {
+                room_id: roomId,
+                name: nameEl ? text(nameEl) : null,
+                bed: text(row, '.hprt-roomtype-bed, [data-testid="bed-type"]'),
+                facilities: Array.from(row.querySelectorAll('.hprt-facilities-facility, [data-testid="room-facility"]'))
+                    .map(el => el.getAttribute('data-name-en') || text(el)).filter(Boolean),
+            };
+        }
+        blocks.push({
+            ...current,
+            block_id: blockId,
+            occupancy: text(row, '.hprt-table-cell-occupancy .bui-u-sr-only, .hprt-occupancy-occupancy-info .bui-u-sr-only'),
+            occupancy_icons: row.querySelectorAll('.hprt-table-cell-occupancy .bicon-occupancy, .hprt-occupancy-occupancy-info .bicon-occupancy').length,
+            price: text(row, '.bui-price-display__value, [data-testid="price"]'),
+            meal: text(row, '.hprt-conditions-meal'),
+            cancellation: text(row, '.hprt-conditions-cancellation'),
+            conditions: Array.from(row.querySelectorAll('.hprt-conditions li, [data-testid="policy-subtitle"]'))
+                .map(el => text(el)).filter(Boolean),
+        });
+    }
+    return blocks;
+}
+"""
+
+_SIZE = re.compile(r'(\d+)\s*m[²2]')
+_NUMBER = re.compile(r'(\d+)')
+_MEAL = re.compile(r'breakfast|half board|full board|all[- ]inclusive|meals?', re.IGNORECASE)
+_CANCELLATION = re.compile(r'cancel|refundable|prepayment', re.IGNORECASE)
+
+
+def parse_price(price_text: Optional[str]) -> Optional[float]:
+    if not price_text:
+        return None
+    cleaned = re.sub(r'[^\d.,]', '', price_text).replace(',', '')
+    match = re.search(r'(\d+(?:\.\d+)?)', cleaned)
+    return float(match.group(1)) if match else None
+
+
+def cancellation_policy(terms: Optional[str]) -> Optional[str]:
+    """Politique normalisee (comme le payload JSON): Free cancellation / Non-refundable."""
+    if not terms:
+        return None
+    lowered = terms.lower()
+    if "free cancellation" in lowered:
+        return "Free cancellation"
+    if "non-refundable" in lowered or "non refundable" in lowered:
+        return "Non-refundable"
+    return terms
+
+
+def parse_room_block(block: Dict[str, Any]) -> RoomOption:
+    """Ligne brute renvoyee par ROOM_BLOCKS_JS -> un tarif."""
+    facilities = block.get("facilities") or []
+    size = next((m.group(1) for f in facilities if (m := _SIZE.search(f))), None)
+    conditions = block.get("conditions") or []
+    meal = block.get("meal") or next((c for c in conditions if _MEAL.search(c)), None)
+    terms = block.get("cancellation") or next((c for c in conditions if _CANCELLATION.search(c)), None)
+    occupancy_match = _NUMBER.search(block.get("occupancy") or "")
+    occupancy = int(occupancy_match.group(1)) if occupancy_match else (block.get("occupancy_icons") or None)
+    policy = cancellation_policy(terms)
+    return RoomOption(
+        room_type=block.get("name") or "Unknown Room",
+        price=parse_price(block.get("price")),
+        capacity=occupancy,
+        max_occupancy=occupancy,
+        bed_type=block.get("bed"),
+        room_size=f"{size} m²" if size else None,
+        amenities=[f for f in facilities if not _SIZE.search(f)],
+        cancellation_policy=policy,
+        breakfast_included=bool(meal and "breakfast" in meal.lower()),
+        refundable=policy == "Free cancellation",
+        room_id=block.get("room_id"),
+        block_id=block.get("block_id"),
+        meal_plan=meal,
+        cancellation_terms=terms,
+    )
+
+
+async def extract_room_blocks(page) -> List[RoomOption]:
+    """Tous les tarifs de la table des chambres (un seul aller-retour navigateur)."""
+    blocks = await page.evaluate(ROOM_BLOCKS_JS, ROOM_ROWS_SELECTOR)
+    return [parse_room_block(block) for block in blocks or []]
+
+
+def group_rates(rooms: Iterable[RoomOption]) -> List[RoomType]:
+    """Tarifs groupes par type de chambre (id Booking, sinon nom), dans l'ordre de la page."""
+    grouped: Dict[str, RoomType] = {}
+    for room in rooms:
+        key = room.room_id or room.room_type
+        room_type = grouped.get(key)
+        if room_type is None:
+            room_type = grouped[key] = RoomType(
+                room_id=room.room_id, room_type=room.room_type, bed_type=room.bed_type,
+                room_size=room.room_size, amenities=room.amenities,
+            )
+        room_type.rates.append(RatePlan(
+            block_id=room.block_id, price=room.price, currency=room.currency,
+            max_occupancy=room.max_occupancy, meal_plan=room.meal_plan,
+            breakfast_included=room.breakfast_included, cancellation_policy=room.cancellation_policy,
+            cancellation_terms=room.cancellation_terms, refundable=room.refundable,
+        ))
+    for room_type in grouped.values():
+        room_type.cheapest_price = min((r.price for r in room_type.rates if r.price), default=None)
+    return list(grouped.values())
@@ -0,0 +1,248 @@
+"""
+Ordonnanceur des scrapes devant les ressources navigateur.
+
+Chaque point d'entree des scrapers (recherche, page detail, avis) prend un
+slot avant de travailler; au plus `slots` scrapes tournent en meme temps.
+Les scrapes en attente sont servis par classe de priorite (interactif avant
+lots avant fond), puis par ordre d'arrivee.
+
+- Echeance: un scrape encore en file a son echeance est abandonne
+  (DeadlineExceeded) au lieu de partir trop tard pour servir qui l'attendait.
+- Vieillissement: chaque `aging` secondes d'attente fait gagner une classe;
+  un scrape de fond finit donc par passer meme sous trafic interactif continu.
+- Admission: au-dela de `max_queue` scrapes en file, ou quand la memoire
+  disponible passe sous `min_free_mb` alors que des scrapes tournent deja,
+  un nouveau scrape est refuse tout de suite (Overloaded) avec un delai de
+  nouvelle tentative estime d'apres le debit recent.
+"""
+
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from enum import IntEnum
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional
+import asyncio
+import itertools
+import logging
+import math
+import time
+
+from config.settings import settings
+from src.utils.metrics import (
+    record_admission_reject, record_memory_headroom, record_scheduler_drop, record_scheduler_queue,
+    record_scheduler_wait
+)
+
+logger = logging.getLogger(__name__)
+
+# Retry-After (secondes) sans historique de debit, et plafond de l'estimation
+DEFAULT_RETRY_AFTER = 5
+MAX_RETRY_AFTER = 600
+
+
+class Priority(IntEnum):
+    INTERACTIVE = 0  # appels live de l'UI (recherche, page detail, avis)
+    BATCH = 1        # lots et exports demandes explicitement
+    BACKGROUND = 2   # prechauffage, rafraichissements de fond
+
+    @property
+    def label(self) -> str:
+        return self.name.lower()
+
+
+class Overloaded(Exception):
+    """Scrape refuse faute de capacite; `retry_after` (secondes) estime d'apres le debit recent."""
+
+    def __init__(self, message: str, retry_after: int = DEFAULT_RETRY_AFTER):
+        self.retry_after = retry_after
+        super().__init__(message)
+
+
+class DeadlineExceeded(Overloaded):
+    """Scrape abandonne: son echeance est passee avant qu'un slot ne se libere."""
+
+    def __init__(self, priority: Priority, waited: float, retry_after: int = DEFAULT_RETRY_AFTER):
+        self.priority = priority
+        self.waited = waited
+        super().__init__(f"Echeance depassee apres {waited:.1f}s en file ({priority.label})", retry_after)
+
+
+def available_memory_mb() -> Optional[float]:
+    """Memoire disponible (Mo): MemAvailable, bornee par la limite cgroup v2; None si illisible."""
+    available = None
+    try:
+        for line in Path("/proc/meminfo").read_text().splitlines():
+            if line.startswith("MemAvailable:"):
+                available = int(line.split()[1]) / 1024
+                break
+    except (OSError, ValueError):
+        return None
+    try:
+        limit = Path("/sys/fs/cgroup/memory.max").read_text().strip()
+        if limit != "max":
+            used = int(Path("/sys/fs/cgroup/memory.current").read_text())
+            headroom = (int(limit) - used) / 2 ** 20
+            available = headroom if available is None else min(available, headroom)
+    except (OSError, ValueError):
+        pass
+    return available
+
+
+@dataclass(eq=False)
+class _Waiter:
+    priority: Priority
+    deadline: float
+    enqueued: float
+    seq: int
+    granted: asyncio.Future
+
+
+class ScrapeScheduler:
+    """File a priorites avec echeances et vieillissement devant `slots` scrapes simultanes."""
+
+    def __init__(self, slots: int = 6, deadlines: Optional[Dict[str, float]] = None, aging: float = 20.0,
+                 max_queue: Optional[int] = None, min_free_mb: float = 0, window: float = 60.0,
+                 memory=available_memory_mb):
+        self.slots = max(1, slots)
+        self.deadlines = {p: (deadlines or {}).get(p.label, 300.0) for p in Priority}
+        self.aging = aging
+        self.max_queue = max_queue
+        self.min_free_mb = min_free_mb
+        self.window = window
+        self.memory = memory
+        self.running = 0
+        self._queue: List[_Waiter] = []
+        self._seq = itertools.count()
+        self._completed = deque()
+        self.dropped = {p.label: 0 for p in Priority}
+        self.rejected = {p.label: 0 for p in Priority}
+
+    def queued(self) -> Dict[str, int]:
+        counts = {p.label: 0 for p in Priority}
+        for waiter in self._queue:
+            counts[waiter.priority.label] += 1
+        return counts
+
+    def throughput(self, now: Optional[float] = None) -> Optional[float]:
+        """Scrapes termines par seconde sur la fenetre recente (None sans historique suffisant)."""
+        now = now or time.monotonic()
+        while self._completed and now - self._completed[0] > self.window:
+            self._completed.popleft()
+        if len(self._completed) < 2:
+            return None
+        # Intervalles entre completions depuis la plus ancienne de la fenetre
+        return (len(self._completed) - 1) / max(now - self._completed[0], 1e-3)
+
+    def retry_after(self) -> int:
+        """Secondes avant qu'un nouveau scrape ait une place: file a ecouler au debit recent."""
+        rate = self.throughput()
+        if rate is None:
+            return DEFAULT_RETRY_AFTER
+        return max(1, min(MAX_RETRY_AFTER, math.ceil((len(self._queue) + 1) / rate)))
+
+    def admit(self, priority: Priority = Priority.INTERACTIVE):
+        """Refuse (Overloaded) un scrape qui depasserait la file ou la marge memoire."""
+        reason = None
+        if self.max_queue is not None and self.running >= self.slots and len(self._queue) >= self.max_queue:
+            reason = "queue"
+            message = f"File de scrapes pleine ({len(self._queue)} en attente)"
+        elif self.min_free_mb and self.running > 0:
+            free = self.memory()
+            if free is not None:
+                record_memory_headroom(free)
+                if free < self.min_free_mb:
+                    reason = "memory"
+                    message = f"Memoire disponible insuffisante ({free:.0f} Mo)"
+        if reason is None:
+            return
+        self.rejected[priority.label] += 1
+        record_admission_reject(priority.label, reason)
+        raise Overloaded(message, self.retry_after())
+
+    def stats(self) -> dict:
+        rate = self.throughput()
+        return {
+            "slots": self.slots,
+            "running": self.running,
+            "queued": self.queued(),
+            "throughput_per_min": round(rate * 60, 2) if rate else None,
+            "retry_after": self.retry_after(),
+            "dropped": dict(self.dropped),
+            "rejected": dict(self.rejected),
+        }
+
+    def _rank(self, waiter: _Waiter, now: float):
+        """Classe effective (diminuee d'une par periode de vieillissement), puis ordre d'arrivee."""
+        aged = int((now - waiter.enqueued) // self.aging) if self.aging > 0 else 0
+        return waiter.priority - aged, waiter.seq
+
+    def _publish(self):
+        for label, count in self.queued().items():
+            record_scheduler_queue(label, count)
+
+    def _dispatch(self):
+        now = time.monotonic()
+        while self.running < self.slots and self._queue:
+            waiter = min(self._queue, key=lambda w: self._rank(w, now))
+            self._queue.remove(waiter)
+            self.running += 1
+            waiter.granted.set_result(None)
+        self._publish()
+
+    def _release(self, completed: bool = False):
+        self.running -= 1
+        if completed:
+            self._completed.append(time.monotonic())
+        self._dispatch()
+
+    @asynccontextmanager
+    async def slot(self, priority: Priority = Priority.INTERACTIVE, deadline: Optional[float] = None):
+        """
+        Slot de scrape. `deadline` (time.monotonic()) borne l'attente en file;
+        par defaut l'echeance de la classe de priorite. Overloaded si le scrape
+        n'est pas admis (file pleine, memoire insuffisante).
+        """
+        self.admit(priority)
+        now = time.monotonic()
+        waiter = _Waiter(priority, deadline if deadline is not None else now + self.deadlines[priority],
+                         now, next(self._seq), asyncio.get_running_loop().create_future())
+        self._queue.append(waiter)
+        self._dispatch()
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter.granted), max(0.0, waiter.deadline - now))
+        except BaseException as e:
+            if waiter.granted.done():
+                # Slot attribue pendant l'annulation: le rendre
+                self._release()
+            else:
+                waiter.granted.cancel()
+                self._queue.remove(waiter)
+                self._publish()
+            if isinstance(e, asyncio.TimeoutError):
+                waited = time.monotonic() - waiter.enqueued
+                self.dropped[priority.label] += 1
+                record_scheduler_drop(priority.label)
+                logger.warning(f"⏱️  Scrape {priority.label} abandonne apres {waited:.1f}s en file")
+                raise DeadlineExceeded(priority, waited, self.retry_after()) from None
+            raise
+
+        record_scheduler_wait(priority.label, time.monotonic() - waiter.enqueued)
+        try:
+            yield
+        finally:
+            self._release(completed=True)
+
+
+@lru_cache
+def get_scheduler() -> ScrapeScheduler:
+    """Ordonnanceur partage par tous les scrapers du processus."""
+    return ScrapeScheduler(
+        settings.scheduler_slots,
+        settings.scheduler_deadlines,
+        settings.scheduler_aging,
+        max_queue=settings.admission_max_queue,
+        min_free_mb=settings.admission_min_free_mb,
+        window=settings.admission_window,
+    )
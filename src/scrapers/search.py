@@ -1,9 +1,16 @@
 from .base import BaseScraper
-from src.models.search import HotelSearchRequest, HotelSearchResult, HotelSummary, PropertyType
+from src.models.search import HotelSearchRequest, HotelSearchResult, HotelSummary
 from config.settings import settings
+from src.utils.tracing import Trace
+from src.utils.metrics import record_page_outcome, record_payload_source
+from src.scrapers.classifier import PageOutcome, PageOutcomeError, classify_page, upstream_retry_after
+from src.scrapers.interception import ResponseCapture, map_search_results
+from src.scrapers.query import compile_search
+from src.scrapers.scheduler import Priority, get_scheduler
 from datetime import datetime
+from typing import Optional
 import logging
-from urllib.parse import urlencode
+import re
 
 logger = logging.getLogger(__name__)
 
@@ -11,29 +18,55 @@ logger = logging.getLogger(__name__)
 class SearchScraper(BaseScraper):
     """Scraper pour la liste d'hotels avec filtres avances."""
 
-    async def search_hotels(self, request: HotelSearchRequest) -> HotelSearchResult:
+    scraper_name = "search"
+
+    async def search_hotels(self, request: HotelSearchRequest, priority: Priority = Priority.INTERACTIVE,
+                            deadline: Optional[float] = None) -> HotelSearchResult:
         """
         Recherche les hotels disponibles selon les criteres.
+
+        Le scrape attend un slot de l'ordonnanceur selon `priority`; DeadlineExceeded
+        si `deadline` (time.monotonic(), defaut: echeance de la classe) passe avant.
         """
+        async with get_scheduler().slot(priority, deadline):
+            trace = Trace("search_hotels", city=request.city)
+            try:
+                with trace.activate():
+                    return await self._search(request, trace)
+            finally:
+                if settings.trace_export_path:
+                    trace.export(settings.trace_export_path)
+
+    async def _search(self, request: HotelSearchRequest, trace: Trace) -> HotelSearchResult:
         page = await self.new_page()
+        capture = ResponseCapture(page).attach()
 
         try:
             # Construction de l'URL de recherche Booking avec tous les filtres
             url = self._build_search_url(request)
-            await self.safe_goto(page, url)
-
-            # Attendre que les resultats se chargent
-            await page.wait_for_selector('[data-testid="property-card"]', timeout=90000)
-
-            # Extraction des hotels
-            hotels = await self._extract_hotels(page, request.max_results)
-
-            return HotelSearchResult(
-                request=request,
-                hotels=hotels,
-                total_found=len(hotels),
-                scrape_timestamp=datetime.utcnow().isoformat()
-            )
+            with trace.span("navigation", url=url):
+                response = await self.safe_goto(page, url)
+
+            # Attendre les resultats, ou conclure vite sur "aucun resultat" / challenge / erreur
+            with trace.span("wait_results") as wait_span:
+                outcome = await classify_page(page, '[data-testid="property-card"]', timeout=90, response=response)
+                wait_span.attributes["outcome"] = outcome.value
+            record_page_outcome(self.scraper_name, outcome.value)
+            if outcome is PageOutcome.EMPTY:
+                return self._result(request, [])
+            if outcome is not PageOutcome.RESULTS:
+                raise PageOutcomeError(outcome, url, upstream_retry_after(response))
+
+            # Extraction des hotels: payload JSON intercepte, sinon cartes du DOM
+            with trace.span("extract_hotels") as extract_span:
+                await capture.settle()
+                hotels = map_search_results(capture.payloads)[:request.max_results]
+                record_payload_source("search_results", bool(hotels))
+                extract_span.attributes["source"] = "json" if hotels else "dom"
+                if not hotels:
+                    hotels = await self._extract_hotels(page, request.max_results)
+
+            return self._result(request, hotels)
 
         except Exception as e:
             logger.error(f"Erreur lors du scraping: {e}")
@@ -41,88 +74,17 @@ class SearchScraper(BaseScraper):
         finally:
             await page.close()
 
+    def _result(self, request: HotelSearchRequest, hotels) -> HotelSearchResult:
+        return HotelSearchResult(
+            request=request,
+            hotels=hotels,
+            total_found=len(hotels),
+            scrape_timestamp=datetime.utcnow().isoformat()
+        )
+
     def _build_search_url(self, request: HotelSearchRequest) -> str:
-        """Construit l'URL de recherche Booking avec tous les parametres de filtrage."""
-        checkin = request.checkin.strftime("%Y-%m-%d")
-        checkout = request.checkout.strftime("%Y-%m-%d")
-
-        # Parametres de base
-        params = {
-            "ss": request.city,
-            "checkin": checkin,
-            "checkout": checkout,
-            "group_adults": request.adults,
-            "group_children": request.children,
-            "no_rooms": request.rooms,
-        }
-
-        # Filtres de prix
-        if request.min_price:
-            params["min_price"] = request.min_price
-        if request.max_price:
-            params["max_price"] = request.max_price
-
-        # Note minimum (Booking utilise review_score_filter)
-        if request.min_review_score:
-            # Booking: 60=6+, 70=7+, 80=8+, 90=9+
-            score_value = int(request.min_review_score * 10)
-            params["review_score"] = score_value
-
-        # Types d'hebergement
-        if request.property_types:
-            for prop_type in request.property_types:
-                if prop_type != PropertyType.ALL:
-                    params[f"nflt=ht_id%3D{prop_type.value}"] = ""
-
-        # Etoiles
-        if request.star_rating:
-            for star in request.star_rating:
-                params[f"nflt=class%3D{star}"] = ""
-
-        # Equipements (facility filters)
-        facilities = []
-        if request.free_wifi:
-            facilities.append("107")  # Free WiFi
-        if request.free_parking:
-            facilities.append("2")  # Free parking
-        if request.pool:
-            facilities.append("433")  # Pool
-        if request.fitness_center:
-            facilities.append("43")  # Fitness center
-        if request.air_conditioning:
-            facilities.append("11")  # Air conditioning
-        if request.restaurant:
-            facilities.append("3")  # Restaurant
-        if request.pets_allowed:
-            facilities.append("4")  # Pets allowed
-
-        for facility in facilities:
-            params[f"nflt=fc%3D{facility}"] = ""
-
-        # Plan de repas
-        if request.meal_plan and request.meal_plan != "all":
-            params["mealplan"] = request.meal_plan.value
-
-        # Annulation gratuite
-        if request.free_cancellation:
-            params["nflt"] = "fc=1"  # Free cancellation
-
-        # Distance du centre
-        if request.distance_from_center:
-            params["distance"] = request.distance_from_center * 1000  # metres
-
-        # Tri
-        sort_mapping = {
-            "popularity": "popularity",
-            "price": "price",
-            "review_score": "review_score_and_price",
-            "distance": "distance_from_search"
-        }
-        params["order"] = sort_mapping.get(request.sort_by, "popularity")
-
-        # Construction URL finale
-        base_url = f"{settings.booking_base_url}/searchresults.html"
-        return f"{base_url}?{urlencode(params, doseq=True)}"
+        """URL de recherche Booking canonique (filtres regroupes dans nflt, voir src.scrapers.query)."""
+        return compile_search(request).url()
 
     async def _extract_hotels(self, page, max_results: int = 25) -> list[HotelSummary]:
         """Extrait la liste des hotels depuis la page de resultats."""
@@ -148,6 +110,7 @@ class SearchScraper(BaseScraper):
                 link_elem = await card.query_selector('a[data-testid="title-link"]')
                 url = await link_elem.get_attribute('href') if link_elem else ""
                 hotel_id = self._extract_hotel_id(url)
+                booking_id = await card.get_attribute('data-hotelid')
 
                 # Extraction note (si disponible)
                 review_score = None
@@ -158,6 +121,8 @@ class SearchScraper(BaseScraper):
 
                 hotels.append(HotelSummary(
                     hotel_id=hotel_id,
+                    booking_id=int(booking_id) if booking_id and booking_id.isdigit() else None,
+                    country_code=self._extract_country_code(url),
                     name=name.strip(),
                     price=price,
                     currency="EUR",
@@ -195,6 +160,11 @@ class SearchScraper(BaseScraper):
         except:
             return None
 
+    def _extract_country_code(self, url: str) -> Optional[str]:
+        """Code pays depuis l'URL (/hotel/fr/name.html)."""
+        match = re.search(r'/hotel/([a-z]{2})/', url or "")
+        return match.group(1) if match else None
+
     def _extract_hotel_id(self, url: str) -> str:
         """Extrait l'ID hotel depuis l'URL."""
         try:
@@ -0,0 +1,246 @@
+"""
+Sessions navigateur pre-chauffees (Playwright storage_state).
+
+Un contexte neuf arrive sans cookies: bandeau de consentement, redirections
+de premiere visite et scripts supplementaires a chaque scrape. Le manager
+capture l'etat (cookies + localStorage) apres une visite d'echauffement ou le
+consentement est accepte, le persiste sur disque et fait tourner un pool de
+ces etats pour amorcer les nouveaux contextes.
+
+Un etat est ecarte quand il est trop vieux, trop utilise, que ses cookies ont
+expire, ou quand le bandeau de consentement reapparait sur une page (il ne
+fonctionne plus): le pool est alors recomplete au prochain contexte.
+
+L'echauffement tourne en tache de fond, sur un Chromium dedie: un scrape ne
+l'attend jamais (il recoit un etat existant, ou aucun tant que le pool est
+vide). Ce Chromium ne demarre qu'avec un slot BACKGROUND de l'ordonnanceur: il
+compte dans la concurrence et l'admission memoire comme n'importe quel scrape.
+Apres un echec (ou un refus d'admission), l'echauffement suivant est differe
+(backoff exponentiel).
+"""
+
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import asyncio
+import json
+import logging
+import time
+import uuid
+
+from playwright.async_api import async_playwright
+
+from config.settings import settings
+from src.scrapers.scheduler import Priority, ScrapeScheduler, get_scheduler
+from src.utils.metrics import record_session
+
+logger = logging.getLogger(__name__)
+
+CONSENT_BANNER = "#onetrust-banner-sdk"
+CONSENT_ACCEPT = "#onetrust-accept-btn-handler"
+# La verification apres navigation ne doit jamais retarder un scrape
+CONSENT_CHECK_TIMEOUT = 3.0
+# Delai avant un nouvel echauffement apres un echec (secondes), double a chaque echec
+WARMUP_BACKOFF = 30.0
+WARMUP_BACKOFF_MAX = 1800.0
+
+
+@asynccontextmanager
+async def warmup_browser():
+    """Chromium propre a l'echauffement: le navigateur d'un scrape peut se fermer avant la capture."""
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=settings.headless,
+                                          args=['--disable-blink-features=AutomationControlled'])
+        try:
+            yield browser
+        finally:
+            await browser.close()
+
+
+@dataclass
+class SessionState:
+    state_id: str
+    created_at: float
+    storage_state: Dict[str, Any]
+    uses: int = 0
+    path: Optional[Path] = field(default=None, repr=False)
+
+    def cookies_expired(self, now: float) -> bool:
+        # expires == -1: cookie de session (valide tant que l'etat est reutilise)
+        return any(0 < cookie.get("expires", -1) < now for cookie in self.storage_state.get("cookies", []))
+
+
+class SessionManager:
+    """Pool d'etats storage_state persistes dans `state_dir` (un fichier JSON par etat)."""
+
+    def __init__(self, state_dir: str, pool_size: int = 3, max_age: float = 12 * 3600, max_uses: int = 200,
+                 launcher: Callable = warmup_browser, scheduler: Optional[ScrapeScheduler] = None):
+        self.state_dir = Path(state_dir)
+        self.state_dir.mkdir(parents=True, exist_ok=True)
+        self.pool_size = pool_size
+        self.max_age = max_age
+        self.max_uses = max_uses
+        self.launcher = launcher
+        self.scheduler = scheduler
+        self.states: List[SessionState] = self._load()
+        self._warmup: Optional[asyncio.Task] = None
+        self._failures = 0
+        self._retry_at = 0.0
+
+    def _load(self) -> List[SessionState]:
+        states = []
+        for path in sorted(self.state_dir.glob("state-*.json")):
+            try:
+                data = json.loads(path.read_text(encoding="utf-8"))
+                states.append(SessionState(data["state_id"], data["created_at"], data["storage_state"],
+                                           data.get("uses", 0), path))
+            except Exception as e:
+                logger.warning(f"Etat de session illisible ({path.name}), ignore: {e}")
+        return states
+
+    def _save(self, state: SessionState):
+        state.path = state.path or self.state_dir / f"state-{state.state_id}.json"
+        tmp = state.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps({
+            "state_id": state.state_id, "created_at": state.created_at,
+            "uses": state.uses, "storage_state": state.storage_state,
+        }), encoding="utf-8")
+        tmp.replace(state.path)
+
+    def is_valid(self, state: SessionState, now: Optional[float] = None) -> bool:
+        now = now or time.time()
+        return (now - state.created_at < self.max_age and state.uses < self.max_uses
+                and not state.cookies_expired(now))
+
+    def invalidate(self, state: SessionState, reason: str):
+        if state in self.states:
+            self.states.remove(state)
+            record_session("expired")
+            logger.info(f"🍪 Session {state.state_id} ecartee: {reason}")
+        if state.path is not None:
+            state.path.unlink(missing_ok=True)
+
+    async def acquire(self, **context_options) -> Optional[SessionState]:
+        """
+        Etat le moins utilise du pool (None si vide). Un pool incomplet est recomplete
+        en tache de fond: l'appelant n'attend jamais une visite d'echauffement.
+        """
+        now = time.time()
+        for state in [s for s in self.states if not self.is_valid(s, now)]:
+            self.invalidate(state, "expire")
+
+        if len(self.states) < self.pool_size:
+            self._start_warmup(context_options)
+
+        if not self.states:
+            return None
+        state = min(self.states, key=lambda s: s.uses)
+        state.uses += 1
+        self._save(state)
+        record_session("reused")
+        return state
+
+    def _start_warmup(self, context_options: Dict[str, Any]):
+        """Lance l'echauffement sauf s'il est deja en cours ou differe apres un echec."""
+        if self._warmup is not None and not self._warmup.done():
+            return
+        if time.monotonic() < self._retry_at:
+            return
+        self._warmup = asyncio.create_task(self._warm({k: v for k, v in context_options.items()
+                                                       if k != "storage_state"}))
+
+    async def _warm(self, context_options: Dict[str, Any]):
+        try:
+            async with (self.scheduler or get_scheduler()).slot(Priority.BACKGROUND):
+                async with self.launcher() as browser:
+                    while len(self.states) < self.pool_size:
+                        self.states.append(await self.capture(browser, **context_options))
+            self._failures = 0
+        except Exception as e:
+            self._failures += 1
+            backoff = min(WARMUP_BACKOFF_MAX, WARMUP_BACKOFF * 2 ** (self._failures - 1))
+            self._retry_at = time.monotonic() + backoff
+            logger.warning(f"Echauffement de session en echec, nouvel essai dans {backoff:.0f}s: {e}")
+
+    async def warmed(self):
+        """Attend la fin de l'echauffement en cours (s'il y en a un)."""
+        if self._warmup is not None:
+            await asyncio.shield(self._warmup)
+
+    async def capture(self, browser, **context_options) -> SessionState:
+        """Visite d'echauffement: page d'accueil, consentement accepte, etat capture."""
+        context = await browser.new_context(**context_options)
+        try:
+            page = await context.new_page()
+            await page.goto(settings.booking_base_url, wait_until="domcontentloaded", timeout=settings.timeout)
+            await accept_consent(page)
+            await page.wait_for_timeout(1000)  # cookies poses par les scripts de premiere visite
+            state = SessionState(uuid.uuid4().hex[:12], time.time(), await context.storage_state())
+        finally:
+            await context.close()
+        self._save(state)
+        record_session("captured")
+        logger.info(f"🍪 Session {state.state_id} capturee ({len(state.storage_state.get('cookies', []))} cookies)")
+        return state
+
+    async def new_context(self, browser, **context_options) -> Tuple[Any, Optional[SessionState]]:
+        """Contexte amorce par un etat du pool -> (contexte, etat ou None)."""
+        state = await self.acquire(**context_options)
+        if state is not None:
+            context_options["storage_state"] = state.storage_state
+        return await browser.new_context(**context_options), state
+
+    async def check(self, page, state: Optional[SessionState], timeout: float = CONSENT_CHECK_TIMEOUT) -> bool:
+        """
+        Apres navigation: un bandeau de consentement visible signifie que l'etat
+        ne fonctionne plus. L'etat est ecarte et le bandeau accepte sur la page.
+        """
+        try:
+            banner_shown = await asyncio.wait_for(accept_consent(page), timeout=timeout)
+        except asyncio.TimeoutError:
+            return True
+        if not banner_shown:
+            return True
+        if state is not None:
+            self.invalidate(state, "bandeau de consentement reapparu")
+        return False
+
+
+async def accept_consent(page) -> bool:
+    """Accepte le bandeau de consentement s'il est affiche; True si un bandeau a ete trouve."""
+    try:
+        banner = await page.query_selector(CONSENT_BANNER)
+        if banner is None or not await banner.is_visible():
+            return False
+        button = await page.query_selector(CONSENT_ACCEPT)
+        if button is not None:
+            await button.click(timeout=2000)
+        return True
+    except Exception as e:
+        logger.debug(f"Bandeau de consentement non traite: {e}")
+        return False
+
+
+@lru_cache
+def get_session_manager() -> SessionManager:
+    """Pool de sessions partage entre scrapers (persiste sous data_dir/sessions)."""
+    return SessionManager(
+        str(Path(settings.data_dir) / "sessions"),
+        pool_size=settings.session_pool_size,
+        max_age=settings.session_max_age,
+        max_uses=settings.session_max_uses,
+    )
+
+
+async def open_context(browser, **context_options) -> Tuple[Any, Optional[SessionState]]:
+    """Nouveau contexte navigateur, amorce depuis le pool si `session_reuse` est actif."""
+    if not settings.session_reuse:
+        return await browser.new_context(**context_options), None
+    return await get_session_manager().new_context(browser, **context_options)
+
+
+async def check_session(page, state: Optional[SessionState], timeout: float = CONSENT_CHECK_TIMEOUT):
+    if settings.session_reuse:
+        await get_session_manager().check(page, state, timeout)
@@ -0,0 +1,127 @@
+"""
+Onglets paralleles dans un meme contexte navigateur.
+
+Plusieurs hotels sont scrapes en meme temps, chacun dans son onglet du contexte
+partage (un seul Chromium, une seule session). Le nombre d'onglets ouverts est
+borne par `max_tabs` et par un budget memoire: apres chaque page, le tas JS
+de l'onglet est mesure (moyenne glissante) et la limite devient
+budget / memoire par onglet.
+
+La mesure vient de CDP (Performance.getMetrics, JSHeapTotalSize: tas alloue,
+non arrondi), a defaut de performance.memory (usedJSHeapSize, arrondi par
+Chromium sans --enable-precise-memory-info). Elle ne couvre que le tas JS,
+pas le DOM ni le rendu, et les onglets d'un meme site partagent un processus
+renderer: le budget est donc un budget de tas JS, a calibrer contre la RSS
+reelle de Chromium (non mesuree en conditions reelles a ce jour).
+
+Le pool est partage par tout le processus (get_tab_pool): l'estimation apprise
+sert a tous les scrapers et le plafond vaut pour l'ensemble de leurs onglets.
+Seuls les onglets d'un lot (get_many) sont mesures: une page detail isolee ne
+paie jamais la mesure.
+"""
+
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from typing import List, Optional
+import asyncio
+import logging
+
+from config.settings import settings
+from src.utils.metrics import record_tabs
+
+logger = logging.getLogger(__name__)
+
+# Poids de la derniere mesure dans la moyenne glissante
+HEAP_SMOOTHING = 0.3
+# Duree max d'une mesure (toutes sources confondues) avant la fermeture de l'onglet
+HEAP_SAMPLE_TIMEOUT = 0.5
+
+_HEAP_JS = "() => (performance.memory ? performance.memory.usedJSHeapSize : null)"
+
+
+async def _cdp_heap(page):
+    session = await page.context.new_cdp_session(page)
+    try:
+        await session.send("Performance.enable")
+        metrics = await session.send("Performance.getMetrics")
+    finally:
+        await session.detach()
+    return {m["name"]: m["value"] for m in metrics.get("metrics", [])}.get("JSHeapTotalSize")
+
+
+async def _js_heap(page):
+    return await page.evaluate(_HEAP_JS)
+
+
+async def tab_heap_mb(page, timeout: float = 1.0) -> Optional[float]:
+    """Tas JS de l'onglet (Mo): CDP, sinon performance.memory; None si la mesure est indisponible."""
+    for measure in (_cdp_heap, _js_heap):
+        try:
+            used = await asyncio.wait_for(measure(page), timeout)
+        except Exception as e:
+            logger.debug(f"Mesure memoire de l'onglet indisponible ({measure.__name__}): {e}")
+            continue
+        if isinstance(used, (int, float)) and used > 0:
+            return used / 2 ** 20
+    return None
+
+
+class TabPool:
+    """Limite d'onglets simultanes ajustee par la memoire mesuree des onglets."""
+
+    def __init__(self, max_tabs: int = 4, heap_budget_mb: float = 512, scraper: str = "details"):
+        self.max_tabs = max(1, max_tabs)
+        self.heap_budget_mb = heap_budget_mb
+        self.scraper = scraper
+        self.limit = self.max_tabs
+        self.in_use = 0
+        self.tab_heap_mb: Optional[float] = None
+        # Futures plutot qu'une Condition: le pool partage ne doit pas etre lie a une boucle
+        self._waiters: List[asyncio.Future] = []
+
+    def observe(self, heap_mb: Optional[float]):
+        """Mesure d'un onglet -> nouvelle limite (entre 1 et max_tabs)."""
+        if not heap_mb:
+            return
+        if self.tab_heap_mb is None:
+            self.tab_heap_mb = heap_mb
+        else:
+            self.tab_heap_mb += HEAP_SMOOTHING * (heap_mb - self.tab_heap_mb)
+        limit = max(1, min(self.max_tabs, int(self.heap_budget_mb // self.tab_heap_mb)))
+        if limit != self.limit:
+            logger.info(f"🗂️  Limite d'onglets {self.limit} -> {limit} ({self.tab_heap_mb:.0f} Mo par onglet)")
+            self.limit = limit
+            self._wake()
+        record_tabs(self.scraper, self.limit, self.tab_heap_mb)
+
+    def _wake(self):
+        waiters, self._waiters = self._waiters, []
+        for waiter in waiters:
+            if not waiter.done():
+                waiter.set_result(None)
+
+    async def sample(self, page):
+        """Mesure l'onglet avant sa fermeture, bornee a HEAP_SAMPLE_TIMEOUT; une erreur est ignoree."""
+        try:
+            self.observe(await asyncio.wait_for(tab_heap_mb(page, HEAP_SAMPLE_TIMEOUT), HEAP_SAMPLE_TIMEOUT))
+        except Exception as e:
+            logger.debug(f"Mesure memoire de l'onglet abandonnee: {e}")
+
+    @asynccontextmanager
+    async def slot(self):
+        while self.in_use >= self.limit:
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            await waiter
+        self.in_use += 1
+        try:
+            yield
+        finally:
+            self.in_use -= 1
+            self._wake()
+
+
+@lru_cache
+def get_tab_pool() -> TabPool:
+    """Pool d'onglets partage par les scrapers de pages detail du processus."""
+    return TabPool(settings.details_max_tabs, settings.details_tab_heap_budget_mb, "details")
@@ -0,0 +1,41 @@
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable
+import asyncio
+import logging
+
+from config.settings import settings
+from .hotels import HotelRegistry
+from .reviews import ReviewsStore
+from .search_cache import SearchCache
+
+logger = logging.getLogger(__name__)
+
+
+async def record_quietly(label: str, write: Callable, *args):
+    """
+    Ecriture de suivi (registre, avis) hors de la boucle asyncio; un echec est
+    journalise sans faire echouer le scrape qui l'a produite.
+    """
+    try:
+        await asyncio.to_thread(write, *args)
+    except Exception as e:
+        logger.warning(f"Enregistrement en echec ({label}): {e}")
+
+
+@lru_cache
+def get_reviews_store() -> ReviewsStore:
+    """Store d'avis partage (dependance FastAPI, surchargeable dans les tests)."""
+    return ReviewsStore(str(Path(settings.data_dir) / "reviews.sqlite"))
+
+
+@lru_cache
+def get_hotel_registry() -> HotelRegistry:
+    """Registre d'hotels partage (alimente par chaque recherche et page detail)."""
+    return HotelRegistry(str(Path(settings.data_dir) / "hotels.sqlite"))
+
+
+@lru_cache
+def get_search_cache() -> SearchCache:
+    """Cache memoire des recherches recentes (re-filtrage local des sur-ensembles)."""
+    return SearchCache(ttl=settings.search_cache_ttl, max_entries=settings.search_cache_size)
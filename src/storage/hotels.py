@@ -0,0 +1,153 @@
+"""
+Registre d'hotels (SQLite + index memoire).
+
+Chaque recherche et chaque page detail y enregistrent le slug, l'id numerique
+Booking, le pays, le nom, la ville et les coordonnees d'un hotel. Les lectures
+passent par deux dictionnaires (slug, id numerique) charges a l'ouverture:
+`/hotel_details` resout un id seul sans analyser d'URL ni scraper. Un index
+en grille sur les coordonnees sert les requetes geographiques (rayon, k plus
+proches, rectangle) sans recherche live.
+"""
+
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+import sqlite3
+import threading
+
+from src.models.hotel import HotelDetails, HotelRecord
+from src.models.search import HotelSearchResult
+from .spatial import GridIndex
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS hotels (
+    hotel_id TEXT PRIMARY KEY,
+    booking_id INTEGER,
+    country_code TEXT,
+    name TEXT,
+    city TEXT,
+    latitude REAL,
+    longitude REAL,
+    last_seen TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS hotels_by_booking_id ON hotels (booking_id);
+"""
+
+_FIELDS = ("hotel_id", "booking_id", "country_code", "name", "city", "latitude", "longitude", "last_seen")
+
+# Une valeur absente d'une nouvelle observation ne remplace pas une valeur connue
+_UPSERT = f"""
+INSERT INTO hotels ({", ".join(_FIELDS)}) VALUES ({", ".join("?" for _ in _FIELDS)})
+ON CONFLICT (hotel_id) DO UPDATE SET
+    {", ".join(f"{f} = COALESCE(excluded.{f}, {f})" for f in _FIELDS[1:])}
+"""
+
+
+class HotelRegistry:
+    """Registre persistant des hotels vus, avec recherche O(1) par slug ou id numerique."""
+
+    def __init__(self, path: str):
+        self.path = path
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+            rows = conn.execute(f"SELECT {', '.join(_FIELDS)} FROM hotels").fetchall()
+        self._by_slug: Dict[str, HotelRecord] = {}
+        self._by_booking_id: Dict[int, HotelRecord] = {}
+        self.spatial = GridIndex()
+        for row in rows:
+            self._index(HotelRecord(**dict(zip(_FIELDS, row))))
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.path, timeout=10)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _index(self, record: HotelRecord):
+        self._by_slug[record.hotel_id] = record
+        if record.booking_id is not None:
+            self._by_booking_id[record.booking_id] = record
+        if record.latitude is not None and record.longitude is not None:
+            self.spatial.insert(record.hotel_id, record.latitude, record.longitude)
+
+    def get(self, hotel_id: str) -> Optional[HotelRecord]:
+        """Entree par slug ou par id numerique Booking."""
+        record = self._by_slug.get(hotel_id)
+        if record is None and hotel_id.isdigit():
+            record = self._by_booking_id.get(int(hotel_id))
+        return record
+
+    def resolve(self, hotel_id: str, country_code: Optional[str] = None,
+                default_country: str = "fr") -> Tuple[str, str]:
+        """
+        (slug, code pays) pour /hotel_details. Un id numerique doit etre connu du
+        registre (KeyError sinon); un code pays explicite l'emporte.
+        """
+        record = self.get(hotel_id)
+        if record is None:
+            if hotel_id.isdigit():
+                raise KeyError(hotel_id)
+            return hotel_id, country_code or default_country
+        return record.hotel_id, country_code or record.country_code or default_country
+
+    def __len__(self) -> int:
+        return len(self._by_slug)
+
+    def records(self) -> List[HotelRecord]:
+        return list(self._by_slug.values())
+
+    def nearby(self, lat: float, lon: float, radius_km: float,
+               limit: Optional[int] = None) -> List[Tuple[HotelRecord, float]]:
+        """Hotels connus dans le rayon -> [(entree, distance km)] du plus proche au plus lointain."""
+        return [(self._by_slug[key], d) for key, d in self.spatial.nearby(lat, lon, radius_km, limit)]
+
+    def nearest(self, lat: float, lon: float, k: int) -> List[Tuple[HotelRecord, float]]:
+        return [(self._by_slug[key], d) for key, d in self.spatial.nearest(lat, lon, k)]
+
+    def within_bbox(self, min_lat: float, min_lon: float, max_lat: float, max_lon: float) -> List[HotelRecord]:
+        return [self._by_slug[key] for key in self.spatial.within_bbox(min_lat, min_lon, max_lat, max_lon)]
+
+    def upsert(self, records: Iterable[HotelRecord]) -> int:
+        """Enregistre des observations (fusionnees avec l'existant); renvoie le nombre d'entrees."""
+        records = list(records)
+        if not records:
+            return 0
+        with self._lock:
+            with self._connect() as conn:
+                conn.executemany(_UPSERT, [tuple(getattr(r, f) for f in _FIELDS) for r in records])
+            for record in records:
+                known = self._by_slug.get(record.hotel_id)
+                if known is not None:
+                    update = {k: v for k, v in record.model_dump().items() if v is not None}
+                    record = known.model_copy(update=update)
+                self._index(record)
+        return len(records)
+
+    def record_search(self, result: HotelSearchResult) -> int:
+        seen = datetime.utcnow().isoformat()
+        return self.upsert(
+            HotelRecord(
+                hotel_id=hotel.hotel_id, booking_id=hotel.booking_id, country_code=hotel.country_code,
+                name=hotel.name, city=result.request.city, latitude=hotel.latitude,
+                longitude=hotel.longitude, last_seen=seen,
+            )
+            for hotel in result.hotels if hotel.hotel_id and hotel.hotel_id != "unknown"
+        )
+
+    def record_details(self, details: HotelDetails, country_code: str) -> int:
+        address = details.address
+        return self.upsert([HotelRecord(
+            hotel_id=details.hotel_id,
+            country_code=country_code,
+            name=details.name if details.name != "Unknown Hotel" else None,
+            city=address.city if address else None,
+            latitude=address.latitude if address else None,
+            longitude=address.longitude if address else None,
+            last_seen=datetime.utcnow().isoformat(),
+        )])
@@ -0,0 +1,26 @@
+"""
+Rafraichissement du store d'avis depuis Booking.
+
+Partage par la route /hotel_reviews (a la demande) et par le warmer (en tache
+de fond): fetch incremental de la liste paginee a partir de l'avis le plus
+recent deja stocke.
+"""
+
+from src.scrapers.details import DetailsScraper
+from src.scrapers.scheduler import Priority
+from src.utils.helpers import parse_booking_date
+from .reviews import ReviewsStore
+
+
+async def refresh_reviews(store: ReviewsStore, hotel_id: str, country_code: str,
+                          priority: Priority = Priority.INTERACTIVE) -> int:
+    """
+    Fetch incremental depuis l'avis le plus recent deja stocke. Tant que la liste
+    complete n'a jamais ete parcourue (avis venus seulement des pages detail,
+    marques non fetches), le fetch repart du debut pour recuperer les plus anciens.
+    """
+    latest = store.latest_date(hotel_id) if store.fetched_at(hotel_id) else None
+    since = parse_booking_date(latest) if latest else None
+    async with DetailsScraper() as scraper:
+        reviews = [r async for r in scraper.iter_reviews(hotel_id, country_code, since=since, priority=priority)]
+    return store.add(hotel_id, reviews)
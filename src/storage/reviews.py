@@ -0,0 +1,150 @@
+"""
+Store d'avis clients (SQLite).
+
+Un avis est identifie par une empreinte stable (hotel, auteur, date, textes),
+ce qui rend les ecritures idempotentes d'un scrape a l'autre. La lecture est
+paginee par curseur sur (date d'avis decroissante, review_id).
+"""
+
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Tuple
+import base64
+import hashlib
+import json
+import sqlite3
+
+from src.models.hotel import GuestReview
+from src.utils.helpers import parse_review_date
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS reviews (
+    hotel_id TEXT NOT NULL,
+    review_id TEXT NOT NULL,
+    sort_date TEXT NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (hotel_id, review_id)
+);
+CREATE INDEX IF NOT EXISTS reviews_by_date ON reviews (hotel_id, sort_date DESC, review_id);
+CREATE TABLE IF NOT EXISTS review_fetches (
+    hotel_id TEXT PRIMARY KEY,
+    fetched_at TEXT NOT NULL
+);
+"""
+
+
+def review_key(hotel_id: str, review: GuestReview) -> str:
+    """Empreinte stable d'un avis (les avis Booking n'exposent pas d'identifiant)."""
+    raw = "\x1f".join([
+        hotel_id, review.reviewer_name, review.reviewer_country, review.review_date,
+        review.positive_text, review.negative_text,
+    ])
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:16]
+
+
+def encode_cursor(sort_date: str, review_id: str) -> str:
+    return base64.urlsafe_b64encode(json.dumps([sort_date, review_id]).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[str, str]:
+    """Curseur opaque -> (sort_date, review_id); ValueError si illisible."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        sort_date, review_id = json.loads(base64.urlsafe_b64decode(padded))
+        return str(sort_date), str(review_id)
+    except Exception:
+        raise ValueError(f"Curseur invalide: {cursor}")
+
+
+class ReviewsStore:
+    """Avis par hotel dans une base SQLite (une connexion par operation)."""
+
+    def __init__(self, path: str):
+        self.path = path
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.path, timeout=10)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def add(self, hotel_id: str, reviews: Iterable[GuestReview], mark_fetched: bool = True) -> int:
+        """Ajoute les avis absents; renvoie le nombre d'avis nouveaux."""
+        rows = []
+        for review in reviews:
+            review_id = review.review_id or review_key(hotel_id, review)
+            parsed = parse_review_date(review.review_date)
+            rows.append((
+                hotel_id, review_id, parsed.isoformat() if parsed else "",
+                review.model_copy(update={"review_id": review_id}).model_dump_json(),
+            ))
+
+        with self._connect() as conn:
+            before = conn.total_changes
+            conn.executemany(
+                "INSERT OR IGNORE INTO reviews (hotel_id, review_id, sort_date, data) VALUES (?, ?, ?, ?)", rows
+            )
+            added = conn.total_changes - before
+            if mark_fetched:
+                conn.execute(
+                    "INSERT OR REPLACE INTO review_fetches (hotel_id, fetched_at) VALUES (?, ?)",
+                    (hotel_id, datetime.utcnow().isoformat())
+                )
+        return added
+
+    def page(self, hotel_id: str, cursor: Optional[str] = None, limit: int = 50) -> Tuple[List[GuestReview], Optional[str]]:
+        """Avis du plus recent au plus ancien a partir de `cursor` -> (avis, curseur suivant)."""
+        rows = list(self._rows(hotel_id, cursor, limit + 1))
+        next_cursor = encode_cursor(rows[limit - 1][0], rows[limit - 1][1]) if len(rows) > limit else None
+        return [GuestReview.model_validate_json(data) for _, _, data in rows[:limit]], next_cursor
+
+    def iter_reviews(self, hotel_id: str, cursor: Optional[str] = None, batch_size: int = 500) -> Iterator[GuestReview]:
+        """Tous les avis a partir de `cursor`, lus par lots (pour le streaming)."""
+        while True:
+            reviews, cursor = self.page(hotel_id, cursor, batch_size)
+            yield from reviews
+            if cursor is None:
+                return
+
+    def count(self, hotel_id: str) -> int:
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM reviews WHERE hotel_id = ?", (hotel_id,)).fetchone()[0]
+
+    def latest_date(self, hotel_id: str) -> Optional[str]:
+        """Date (ISO) de l'avis le plus recent connu, pour un fetch incremental."""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT MAX(sort_date) FROM reviews WHERE hotel_id = ? AND sort_date != ''", (hotel_id,)
+            ).fetchone()
+        return row[0] if row and row[0] else None
+
+    def fetched_at(self, hotel_id: str) -> Optional[str]:
+        with self._connect() as conn:
+            row = conn.execute("SELECT fetched_at FROM review_fetches WHERE hotel_id = ?", (hotel_id,)).fetchone()
+        return row[0] if row else None
+
+    def is_fresh(self, hotel_id: str, ttl: float) -> bool:
+        """Liste complete parcourue il y a moins de `ttl` secondes."""
+        fetched_at = self.fetched_at(hotel_id)
+        if fetched_at is None:
+            return False
+        return (datetime.utcnow() - datetime.fromisoformat(fetched_at)).total_seconds() < ttl
+
+    def _rows(self, hotel_id: str, cursor: Optional[str], limit: int):
+        query = "SELECT sort_date, review_id, data FROM reviews WHERE hotel_id = ?"
+        params: list = [hotel_id]
+        if cursor:
+            sort_date, review_id = decode_cursor(cursor)
+            query += " AND (sort_date < ? OR (sort_date = ? AND review_id > ?))"
+            params += [sort_date, sort_date, review_id]
+        query += " ORDER BY sort_date DESC, review_id ASC LIMIT ?"
+        params.append(limit)
+        with self._connect() as conn:
+            return conn.execute(query, params).fetchall()
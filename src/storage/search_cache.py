@@ -0,0 +1,196 @@
+"""
+Cache des recherches avec re-filtrage local.
+
+Deux recherches qui ne different que par le prix, la note minimum, les
+etoiles, le tri ou le nombre de resultats partagent la meme page Booking de
+base (ville, dates, occupation, filtres d'equipements). Quand un resultat en
+cache a ete obtenu avec des filtres au moins aussi larges, la requete est
+servie en filtrant et triant ce sur-ensemble localement (predicats vectorises
+pyarrow.compute) au lieu de relancer un scrape.
+
+Un sur-ensemble ne suffit que s'il est complet (moins de resultats que la
+limite: rien n'a ete tronque) ou, s'il est tronque, si le tri est le meme et
+qu'il reste assez d'hotels apres filtrage.
+
+Les cles viennent du compilateur de requetes (src.scrapers.query): des
+requetes equivalentes (etoiles dans un autre ordre, ville en minuscules...)
+partagent la meme entree, et leurs scrapes concurrents sont regroupes (sauf
+pour une requete plus prioritaire que le scrape en cours, qui lance le sien).
+"""
+
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+import asyncio
+import time
+
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from src.models.search import HotelSearchRequest, HotelSearchResult
+from src.scrapers.query import compile_search, request_key
+from src.scrapers.scheduler import Priority
+
+# Champs de la requete appliques localement (hors URL de base)
+LOCAL_FIELDS = ("min_price", "max_price", "min_review_score", "star_rating", "sort_by", "max_results")
+
+# Cartes par page de resultats Booking: au-dela, le resultat est forcement tronque
+SEARCH_PAGE_SIZE = 25
+
+# Tris reproductibles localement -> (colonne, ordre)
+LOCAL_SORTS = {"price": ("price_per_night", "ascending"), "review_score": ("review_score", "descending")}
+
+
+def base_key(request: HotelSearchRequest) -> str:
+    """Cle de la page de base: URL canonique sans les filtres re-filtrables localement ni le tri."""
+    return compile_search(request, local=False).key
+
+
+def covers(cached: HotelSearchRequest, request: HotelSearchRequest) -> bool:
+    """Les filtres de `cached` sont-ils au moins aussi larges que ceux de `request`?"""
+    if cached.min_price is not None and (request.min_price is None or request.min_price < cached.min_price):
+        return False
+    if cached.max_price is not None and (request.max_price is None or request.max_price > cached.max_price):
+        return False
+    if cached.min_review_score is not None and (
+            request.min_review_score is None or request.min_review_score < cached.min_review_score):
+        return False
+    if cached.star_rating and not (request.star_rating and set(request.star_rating) <= set(cached.star_rating)):
+        return False
+    return True
+
+
+def refine(result: HotelSearchResult, request: HotelSearchRequest) -> Optional[HotelSearchResult]:
+    """Resultat de `request` calcule sur le sur-ensemble `result`, ou None s'il ne suffit pas."""
+    cached = result.request
+    if not covers(cached, request):
+        return None
+    truncated = len(result.hotels) >= min(cached.max_results, SEARCH_PAGE_SIZE)
+    same_sort = request.sort_by == cached.sort_by
+    if truncated and not same_sort:
+        return None
+    if not same_sort and request.sort_by not in LOCAL_SORTS:
+        return None
+    if request.star_rating and set(request.star_rating) != set(cached.star_rating or []) \
+            and all(h.rating is None for h in result.hotels):
+        return None  # etoiles inconnues (extraction DOM): filtre non applicable
+
+    nights = max(1, (request.checkout - request.checkin).days)
+    table = pa.table({
+        "position": pa.array(range(len(result.hotels)), pa.int32()),
+        "price_per_night": pa.array([h.price / nights if h.price is not None else None for h in result.hotels], pa.float64()),
+        "review_score": pa.array([h.review_score for h in result.hotels], pa.float64()),
+        "stars": pa.array([int(h.rating) if h.rating is not None else None for h in result.hotels], pa.int32()),
+    })
+
+    # Seuls les filtres plus stricts que ceux deja appliques par Booking sont rejoues
+    mask = pa.array([True] * len(table), pa.bool_())
+    price = table["price_per_night"]
+    if request.min_price is not None and request.min_price != cached.min_price:
+        mask = pc.and_(mask, pc.greater_equal(price, request.min_price))
+    if request.max_price is not None and request.max_price != cached.max_price:
+        mask = pc.and_(mask, pc.less_equal(price, request.max_price))
+    if request.min_review_score is not None and request.min_review_score != cached.min_review_score:
+        mask = pc.and_(mask, pc.greater_equal(table["review_score"], request.min_review_score))
+    if request.star_rating and set(request.star_rating) != set(cached.star_rating or []):
+        mask = pc.and_(mask, pc.is_in(table["stars"], value_set=pa.array(request.star_rating, pa.int32())))
+    filtered = table.filter(pc.fill_null(mask, False))
+
+    if not same_sort:
+        column, order = LOCAL_SORTS[request.sort_by]
+        # Valeurs manquantes en fin de liste quel que soit l'ordre, via une cle explicite: null_placement
+        # global est deprecie (pyarrow >= 25) et les cles (nom, ordre, null_placement) absentes de pyarrow 15
+        keyed = filtered.append_column("missing", pc.is_null(filtered[column]))
+        filtered = filtered.take(pc.sort_indices(keyed, sort_keys=[
+            ("missing", "ascending"), (column, order), ("position", "ascending")]))
+
+    positions = filtered["position"].to_pylist()
+    if truncated and len(positions) < min(request.max_results, SEARCH_PAGE_SIZE):
+        return None  # des hotels au-dela de la troncature pourraient manquer
+
+    hotels = [result.hotels[i] for i in positions[:request.max_results]]
+    return HotelSearchResult(request=request, hotels=hotels, total_found=len(hotels),
+                             scrape_timestamp=result.scrape_timestamp)
+
+
+@dataclass
+class _Entry:
+    result: HotelSearchResult
+    stored_at: float
+
+
+class SearchCache:
+    """Resultats de recherche recents, groupes par page de base (TTL + taille bornee)."""
+
+    def __init__(self, ttl: float = 900, max_entries: int = 256):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: Dict[str, List[_Entry]] = {}
+        self._size = 0
+        self._inflight: Dict[str, Tuple[asyncio.Future, Priority]] = {}
+
+    def __len__(self) -> int:
+        return self._size
+
+    def put(self, result: HotelSearchResult):
+        entries = self._entries.setdefault(base_key(result.request), [])
+        entries.append(_Entry(result, time.monotonic()))
+        self._size += 1
+        while self._size > self.max_entries:
+            self._evict_oldest()
+
+    def lookup(self, request: HotelSearchRequest) -> Optional[HotelSearchResult]:
+        key = base_key(request)
+        now = time.monotonic()
+        entries = [e for e in self._entries.get(key, []) if now - e.stored_at < self.ttl]
+        self._size -= len(self._entries.get(key, [])) - len(entries)
+        if entries:
+            self._entries[key] = entries
+        else:
+            self._entries.pop(key, None)
+
+        # Le plus recent d'abord
+        for entry in reversed(entries):
+            refined = refine(entry.result, request)
+            if refined is not None:
+                return refined
+        return None
+
+    async def fetch(self, request: HotelSearchRequest, scrape: Callable[[], Awaitable[HotelSearchResult]],
+                    priority: Priority = Priority.INTERACTIVE) -> HotelSearchResult:
+        """
+        Scrape d'un defaut de cache, partage entre requetes equivalentes
+        concurrentes (meme cle canonique): un seul scrape, resultat mis en cache.
+        `priority` est celle du scrape que `scrape` lance: une requete plus urgente
+        n'attend pas un scrape moins prioritaire (peut-etre encore en file), elle
+        lance le sien, que rejoignent les requetes suivantes.
+        """
+        key = request_key(request)
+        inflight = self._inflight.get(key)
+        if inflight is None or priority < inflight[1]:
+            async def run() -> HotelSearchResult:
+                result = await scrape()
+                self.put(result)
+                return result
+
+            future = asyncio.ensure_future(run())
+            self._inflight[key] = (future, priority)
+
+            def done(f):
+                if self._inflight.get(key, (None,))[0] is f:
+                    del self._inflight[key]
+
+            future.add_done_callback(done)
+        else:
+            future = inflight[0]
+        result = await asyncio.shield(future)
+        return result if result.request == request else result.model_copy(update={"request": request})
+
+    def _evict_oldest(self):
+        key, index = min(
+            ((k, i) for k, entries in self._entries.items() for i in range(len(entries))),
+            key=lambda item: self._entries[item[0]][item[1]].stored_at
+        )
+        del self._entries[key][index]
+        if not self._entries[key]:
+            del self._entries[key]
+        self._size -= 1
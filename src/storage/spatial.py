@@ -0,0 +1,91 @@
+"""
+Index spatial en grille sur les coordonnees des hotels du registre.
+
+Les points sont ranges dans des cellules de `cell_deg` degres. Une requete
+(rayon, k plus proches, rectangle) ne parcourt que les cellules qui
+recouvrent la zone: quelques dizaines de points au lieu du registre entier.
+"""
+
+from math import asin, cos, floor, radians, sin, sqrt
+from typing import Dict, Iterator, List, Optional, Tuple
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEG_LAT = 111.32
+
+Cell = Tuple[int, int]
+Point = Tuple[float, float]
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    dlat, dlon = radians(lat2 - lat1), radians(lon2 - lon1)
+    a = sin(dlat / 2) ** 2 + cos(radians(lat1)) * cos(radians(lat2)) * sin(dlon / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * asin(min(1.0, sqrt(a)))
+
+
+class GridIndex:
+    """Grille reguliere lat/lon -> {id: (lat, lon)}."""
+
+    def __init__(self, cell_deg: float = 0.05):
+        self.cell_deg = cell_deg
+        self._cells: Dict[Cell, Dict[str, Point]] = {}
+        self._points: Dict[str, Point] = {}
+
+    def __len__(self) -> int:
+        return len(self._points)
+
+    def _cell(self, lat: float, lon: float) -> Cell:
+        return floor(lat / self.cell_deg), floor(lon / self.cell_deg)
+
+    def insert(self, key: str, lat: float, lon: float):
+        self.remove(key)
+        self._points[key] = (lat, lon)
+        self._cells.setdefault(self._cell(lat, lon), {})[key] = (lat, lon)
+
+    def remove(self, key: str):
+        point = self._points.pop(key, None)
+        if point is None:
+            return
+        cell = self._cell(*point)
+        self._cells[cell].pop(key, None)
+        if not self._cells[cell]:
+            del self._cells[cell]
+
+    def _scan(self, min_cell: Cell, max_cell: Cell) -> Iterator[Tuple[str, Point]]:
+        """Points des cellules du rectangle [min_cell, max_cell] (parcours direct si la zone est tres large)."""
+        span = (max_cell[0] - min_cell[0] + 1) * (max_cell[1] - min_cell[1] + 1)
+        if span > len(self._cells):
+            for (i, j), points in self._cells.items():
+                if min_cell[0] <= i <= max_cell[0] and min_cell[1] <= j <= max_cell[1]:
+                    yield from points.items()
+            return
+        for i in range(min_cell[0], max_cell[0] + 1):
+            for j in range(min_cell[1], max_cell[1] + 1):
+                yield from self._cells.get((i, j), {}).items()
+
+    def within_bbox(self, min_lat: float, min_lon: float, max_lat: float, max_lon: float) -> List[str]:
+        return [
+            key for key, (lat, lon) in self._scan(self._cell(min_lat, min_lon), self._cell(max_lat, max_lon))
+            if min_lat <= lat <= max_lat and min_lon <= lon <= max_lon
+        ]
+
+    def nearby(self, lat: float, lon: float, radius_km: float,
+               limit: Optional[int] = None) -> List[Tuple[str, float]]:
+        """(id, distance km) dans le rayon, du plus proche au plus lointain."""
+        dlat = radius_km / KM_PER_DEG_LAT
+        dlon = radius_km / (KM_PER_DEG_LAT * max(cos(radians(min(89.0, abs(lat) + dlat))), 1e-6))
+        found = [
+            (key, distance)
+            for key, (plat, plon) in self._scan(self._cell(lat - dlat, lon - dlon), self._cell(lat + dlat, lon + dlon))
+            if (distance := haversine_km(lat, lon, plat, plon)) <= radius_km
+        ]
+        found.sort(key=lambda item: item[1])
+        return found[:limit] if limit else found
+
+    def nearest(self, lat: float, lon: float, k: int, max_radius_km: float = 50.0) -> List[Tuple[str, float]]:
+        """k plus proches voisins: rayon double jusqu'a trouver k points (ou atteindre max_radius_km)."""
+        radius = self.cell_deg * KM_PER_DEG_LAT / 2
+        while True:
+            found = self.nearby(lat, lon, min(radius, max_radius_km), limit=k)
+            if len(found) >= k or radius >= max_radius_km or len(found) == len(self):
+                return found
+            radius *= 2
@@ -1,4 +1,5 @@
 from datetime import datetime, date
+from typing import Optional
 
 def format_date_booking(d: date) -> str:
     """Formate une date pour l'URL Booking."""
@@ -7,3 +8,13 @@ def format_date_booking(d: date) -> str:
 def parse_booking_date(date_str: str) -> date:
     """Parse une date depuis le format Booking."""
     return datetime.strptime(date_str, "%Y-%m-%d").date()
+
+def parse_review_date(date_str: str) -> Optional[date]:
+    """Parse une date d'avis Booking ("Reviewed: 12 October 2025"); None si illisible."""
+    text = date_str.replace("Reviewed:", "").strip()
+    for fmt in ("%d %B %Y", "%B %d, %Y", "%Y-%m-%d"):
+        try:
+            return datetime.strptime(text, fmt).date()
+        except ValueError:
+            continue
+    return None
@@ -0,0 +1,44 @@
+"""
+Client httpx partage (pool de connexions, HTTP/2 si `h2` est installe).
+
+Utilise par le chemin rapide de la page detail et le pipeline d'images;
+ferme a l'arret de l'API (lifespan).
+"""
+
+from config.settings import settings
+from typing import Optional
+import importlib.util
+
+import httpx
+
+_client: Optional[httpx.AsyncClient] = None
+
+
+def http2_available() -> bool:
+    return importlib.util.find_spec("h2") is not None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Client httpx partage (connexions reutilisees entre scrapes et telechargements)."""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            http2=settings.http2 and http2_available(),
+            follow_redirects=True,
+            timeout=settings.timeout / 1000,
+            limits=httpx.Limits(max_connections=settings.http_max_connections,
+                                max_keepalive_connections=settings.http_max_connections),
+            headers={
+                "User-Agent": settings.user_agent,
+                "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+                "Accept-Language": "en-US,en;q=0.9",
+            },
+        )
+    return _client
+
+
+async def close_http_client():
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
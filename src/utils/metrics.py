@@ -0,0 +1,230 @@
+"""
+Metriques Prometheus du scraper (exposees sur /metrics).
+
+Les durees par etape sont alimentees par les spans de src.utils.tracing.
+"""
+
+from prometheus_client import Counter, Gauge, Histogram
+from src.utils.tracing import Span, Trace, add_span_listener
+from typing import Callable, List, Optional
+import asyncio
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+_LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120)
+
+SCRAPE_DURATION = Histogram(
+    "scraper_request_duration_seconds",
+    "Duree totale d'un scrape (search ou details)",
+    ["scraper", "outcome"],
+    buckets=_LATENCY_BUCKETS,
+)
+SCRAPE_STAGE_DURATION = Histogram(
+    "scraper_stage_duration_seconds",
+    "Duree par etape de scrape (navigation, scroll, extracteurs...)",
+    ["scraper", "stage"],
+    buckets=_LATENCY_BUCKETS,
+)
+NAVIGATION_RETRIES = Counter(
+    "scraper_navigation_retries_total",
+    "Nouvelles tentatives de navigation dans safe_goto",
+)
+EXTRACTOR_FAILURES = Counter(
+    "scraper_extractor_failures_total",
+    "Extracteurs remplaces par leur valeur par defaut (error / timeout / budget)",
+    ["extractor", "reason"],
+)
+CACHE_REQUESTS = Counter(
+    "scraper_cache_requests_total",
+    "Consultations de cache par resultat (hit / miss)",
+    ["cache", "result"],
+)
+PAYLOAD_SOURCE = Counter(
+    "scraper_payload_source_total",
+    "Source des donnees par section: JSON intercepte ou DOM (repli)",
+    ["section", "source"],
+)
+FAST_PATH_RESULTS = Counter(
+    "scraper_fast_path_total",
+    "Pages detail par issue du chemin rapide httpx (sufficient / escalated / unavailable / skipped)",
+    ["outcome"],
+)
+PAGE_OUTCOMES = Counter(
+    "scraper_page_outcomes_total",
+    "Pages classees apres navigation (results / empty / blocked / error)",
+    ["scraper", "outcome"],
+)
+WARM_HITS = Counter(
+    "scraper_cache_warm_hits_total",
+    "Hits de cache servis par une entree prechauffee depuis le journal des requetes",
+    ["cache"],
+)
+SESSION_STATES = Counter(
+    "scraper_session_states_total",
+    "Sessions navigateur (storage_state) par evenement (captured / reused / expired)",
+    ["event"],
+)
+BROWSERS_OPEN = Gauge(
+    "scraper_browsers_open",
+    "Navigateurs Chromium actuellement ouverts",
+    ["scraper"],
+)
+PAGES_OPEN = Gauge(
+    "scraper_pages_open",
+    "Onglets actuellement ouverts",
+    ["scraper"],
+)
+TAB_LIMIT = Gauge(
+    "scraper_tab_limit",
+    "Onglets simultanes autorises par contexte (ajustes par la memoire mesuree)",
+    ["scraper"],
+)
+TAB_HEAP = Gauge(
+    "scraper_tab_js_heap_megabytes",
+    "Tas JS moyen mesure par onglet (moyenne glissante)",
+    ["scraper"],
+)
+SCHEDULER_QUEUE = Gauge(
+    "scraper_scheduler_queued",
+    "Scrapes en attente d'un slot par classe de priorite",
+    ["priority"],
+)
+SCHEDULER_WAIT = Histogram(
+    "scraper_scheduler_wait_seconds",
+    "Attente en file avant l'obtention d'un slot de scrape",
+    ["priority"],
+    buckets=_LATENCY_BUCKETS,
+)
+SCHEDULER_DROPPED = Counter(
+    "scraper_scheduler_dropped_total",
+    "Scrapes abandonnes en file (echeance depassee)",
+    ["priority"],
+)
+ADMISSION_REJECTED = Counter(
+    "scraper_admission_rejected_total",
+    "Scrapes refuses a l'admission (503 + Retry-After) par motif (queue / memory)",
+    ["priority", "reason"],
+)
+MEMORY_HEADROOM = Gauge(
+    "scraper_memory_available_megabytes",
+    "Memoire disponible mesuree au controle d'admission",
+)
+SCROLL_SAVED = Counter(
+    "scraper_scroll_saved_seconds_total",
+    "Temps de scroll economise par le scroll adaptatif (vs scroll fixe)",
+)
+EVENT_LOOP_LAG = Gauge(
+    "scraper_event_loop_lag_seconds",
+    "Retard mesure de la boucle asyncio",
+)
+
+_SCRAPER_BY_TRACE = {
+    "search_hotels": "search",
+    "hotel_details": "details",
+}
+
+
+def observe_span(trace: Trace, span: Span):
+    """Listener de span: histogrammes de latence (les echecs d'extracteurs viennent de l'ordonnanceur)."""
+    scraper = _SCRAPER_BY_TRACE.get(trace.name, trace.name)
+    seconds = span.duration_ms / 1000
+
+    if span is trace.root:
+        SCRAPE_DURATION.labels(scraper, "error" if span.error else "ok").observe(seconds)
+        return
+
+    SCRAPE_STAGE_DURATION.labels(scraper, span.name).observe(seconds)
+
+
+add_span_listener(observe_span)
+
+
+# Callbacks appeles a chaque consultation de cache (ex: prechauffage)
+_cache_listeners: List[Callable[[str, Optional[str], bool], None]] = []
+
+
+def add_cache_listener(listener: Callable[[str, Optional[str], bool], None]):
+    """Enregistre un callback (cache, cle, hit) appele par record_cache."""
+    if listener not in _cache_listeners:
+        _cache_listeners.append(listener)
+
+
+def record_cache(cache: str, hit: bool, key: Optional[str] = None):
+    CACHE_REQUESTS.labels(cache, "hit" if hit else "miss").inc()
+    for listener in _cache_listeners:
+        try:
+            listener(cache, key, hit)
+        except Exception as e:
+            logger.warning(f"Listener de cache en erreur: {e}")
+
+
+def record_extractor_failure(extractor: str, reason: str):
+    EXTRACTOR_FAILURES.labels(extractor, reason).inc()
+
+
+def record_warm_hit(cache: str):
+    WARM_HITS.labels(cache).inc()
+
+
+def record_payload_source(section: str, captured: bool):
+    PAYLOAD_SOURCE.labels(section, "json" if captured else "dom").inc()
+
+
+def record_fast_path(outcome: str):
+    FAST_PATH_RESULTS.labels(outcome).inc()
+
+
+def record_page_outcome(scraper: str, outcome: str):
+    PAGE_OUTCOMES.labels(scraper, outcome).inc()
+
+
+def record_session(event: str):
+    SESSION_STATES.labels(event).inc()
+
+
+def record_tabs(scraper: str, limit: int, heap_mb: float):
+    TAB_LIMIT.labels(scraper).set(limit)
+    TAB_HEAP.labels(scraper).set(heap_mb)
+
+
+def record_scheduler_queue(priority: str, queued: int):
+    SCHEDULER_QUEUE.labels(priority).set(queued)
+
+
+def record_scheduler_wait(priority: str, seconds: float):
+    SCHEDULER_WAIT.labels(priority).observe(seconds)
+
+
+def record_scheduler_drop(priority: str):
+    SCHEDULER_DROPPED.labels(priority).inc()
+
+
+def record_admission_reject(priority: str, reason: str):
+    ADMISSION_REJECTED.labels(priority, reason).inc()
+
+
+def record_memory_headroom(megabytes: float):
+    MEMORY_HEADROOM.set(megabytes)
+
+
+def count_retry(retry_state):
+    """Callback tenacity (before_sleep) pour safe_goto."""
+    NAVIGATION_RETRIES.inc()
+    logger.warning(f"Nouvelle tentative de navigation ({retry_state.attempt_number})")
+
+
+def track_page(page, scraper: str):
+    """Suit l'ouverture/fermeture d'un onglet dans la jauge PAGES_OPEN."""
+    PAGES_OPEN.labels(scraper).inc()
+    page.on("close", lambda _: PAGES_OPEN.labels(scraper).dec())
+    return page
+
+
+async def monitor_event_loop_lag(interval: float = 1.0):
+    """Mesure en continu le retard de la boucle asyncio (tache de fond)."""
+    while True:
+        start = time.monotonic()
+        await asyncio.sleep(interval)
+        EVENT_LOOP_LAG.set(max(0.0, time.monotonic() - start - interval))
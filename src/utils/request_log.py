@@ -0,0 +1,102 @@
+"""
+Journal des requetes API (JSON lines).
+
+Chaque appel sous /api/v1 ajoute une ligne: horodatage, methode, chemin, query
+string brute, statut et duree. Le journal sert au prechauffage des caches
+(src.warmer); le compteur de requetes en cours permet aux taches de fond de
+laisser passer le trafic live.
+
+Au-dela de `max_bytes`, le fichier devient `<path>.1` (remplace l'ancien) et un
+nouveau fichier est commence: chaque relecture du warmer reste bornee a deux
+fichiers, les plus anciennes entrees sortant d'elles-memes.
+"""
+
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional
+import json
+import logging
+import time
+
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+API_PREFIX = "/api/v1/"
+
+
+def rotated_path(path: Path) -> Path:
+    return path.with_name(path.name + ".1")
+
+
+class RequestLog:
+    """Journal append-only des requetes API; `path=None` desactive l'ecriture."""
+
+    def __init__(self, path: Optional[str], max_bytes: Optional[int] = None):
+        self.path = Path(path) if path else None
+        self.max_bytes = max_bytes
+        self.in_flight = 0
+        self._file = None
+
+    def append(self, entry: Dict[str, Any]):
+        if self.path is None:
+            return
+        try:
+            if self._file is None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self._file = self.path.open("a", encoding="utf-8")
+            self._file.write(json.dumps(entry, separators=(",", ":")) + "\n")
+            self._file.flush()
+            if self.max_bytes and self._file.tell() >= self.max_bytes:
+                self.close()
+                self.path.replace(rotated_path(self.path))
+        except OSError as e:
+            logger.warning(f"Journal des requetes non ecrit ({self.path}): {e}")
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    async def track(self, request, call_next):
+        """Middleware HTTP: compte la requete en cours puis la journalise."""
+        self.in_flight += 1
+        start = time.perf_counter()
+        status = 500
+        try:
+            response = await call_next(request)
+            status = response.status_code
+            return response
+        finally:
+            self.in_flight -= 1
+            if request.url.path.startswith(API_PREFIX):
+                self.append({
+                    "ts": round(time.time(), 3),
+                    "method": request.method,
+                    "path": request.url.path,
+                    "query": request.url.query,
+                    "status": status,
+                    "duration_ms": round((time.perf_counter() - start) * 1000, 1),
+                })
+
+
+def read_request_log(path: str) -> Iterator[Dict[str, Any]]:
+    """Entrees du journal, fichier tourne d'abord (lignes illisibles ignorees, fichier absent -> rien)."""
+    for part in (rotated_path(Path(path)), Path(path)):
+        try:
+            f = part.open(encoding="utf-8")
+        except FileNotFoundError:
+            continue
+        with f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                if isinstance(entry, dict) and "path" in entry:
+                    yield entry
+
+
+@lru_cache
+def get_request_log() -> RequestLog:
+    return RequestLog(settings.request_log_path, int(settings.request_log_max_mb * 2 ** 20))
@@ -0,0 +1,201 @@
+"""
+Traces de scraping legeres: spans (context manager / decorateur) et export
+au format OTLP/JSON compatible OpenTelemetry.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, List, Optional
+import functools
+import inspect
+import json
+import logging
+import os
+import time
+
+logger = logging.getLogger(__name__)
+
+SERVICE_NAME = "travliaq-booking-scraper"
+
+_current_trace: ContextVar[Optional["Trace"]] = ContextVar("current_trace", default=None)
+_current_span: ContextVar[Optional["Span"]] = ContextVar("current_span", default=None)
+
+# Callbacks appeles a la fin de chaque span (ex: metriques Prometheus)
+_span_listeners: List[Callable[["Trace", "Span"], None]] = []
+
+
+def add_span_listener(listener: Callable[["Trace", "Span"], None]):
+    """Enregistre un callback appele a la fermeture de chaque span."""
+    if listener not in _span_listeners:
+        _span_listeners.append(listener)
+
+
+class Span:
+    """Intervalle de temps nomme dans une trace."""
+
+    def __init__(self, name: str, trace_id: str, parent_id: Optional[str] = None, attributes: Dict[str, Any] = None):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent_id
+        self.attributes = dict(attributes or {})
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.error: Optional[str] = None
+
+    @property
+    def duration_ms(self) -> float:
+        end = self.end_ns if self.end_ns is not None else time.time_ns()
+        return (end - self.start_ns) / 1_000_000
+
+    def set_attribute(self, key: str, value: Any):
+        self.attributes[key] = value
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = {"name": self.name, "duration_ms": round(self.duration_ms, 1)}
+        if self.attributes:
+            data["attributes"] = self.attributes
+        if self.error:
+            data["error"] = self.error
+        return data
+
+    def to_otel(self) -> Dict[str, Any]:
+        span = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": 1,  # SPAN_KIND_INTERNAL
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns or time.time_ns()),
+            "attributes": [_otel_attribute(k, v) for k, v in self.attributes.items()],
+            "status": {"code": 2, "message": self.error} if self.error else {"code": 1},
+        }
+        if self.parent_id:
+            span["parentSpanId"] = self.parent_id
+        return span
+
+
+class Trace:
+    """Ensemble des spans d'un scrape (une requete search ou details)."""
+
+    def __init__(self, name: str, **attributes):
+        self.name = name
+        self.trace_id = os.urandom(16).hex()
+        self.spans: List[Span] = []
+        self.root = Span(name, self.trace_id, attributes=attributes)
+
+    @contextmanager
+    def activate(self):
+        """Rend la trace courante (et son span racine) pour le code appele."""
+        trace_token = _current_trace.set(self)
+        span_token = _current_span.set(self.root)
+        try:
+            yield self
+        except Exception as e:
+            self.root.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            self.root.end_ns = time.time_ns()
+            _current_span.reset(span_token)
+            _current_trace.reset(trace_token)
+            _notify(self, self.root)
+
+    @contextmanager
+    def span(self, name: str, **attributes):
+        parent = _current_span.get() or self.root
+        span = Span(name, self.trace_id, parent_id=parent.span_id, attributes=attributes)
+        self.spans.append(span)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            span.end_ns = time.time_ns()
+            _current_span.reset(token)
+            _notify(self, span)
+
+    def summary(self) -> Dict[str, Any]:
+        """Resume compact (durees par etape) pour scrape_parameters."""
+        return {
+            "trace_id": self.trace_id,
+            "total_ms": round(self.root.duration_ms, 1),
+            "spans": [s.to_dict() for s in self.spans],
+        }
+
+    def to_otel(self) -> Dict[str, Any]:
+        """Export OTLP/JSON (ExportTraceServiceRequest)."""
+        return {
+            "resourceSpans": [{
+                "resource": {"attributes": [_otel_attribute("service.name", SERVICE_NAME)]},
+                "scopeSpans": [{
+                    "scope": {"name": __name__},
+                    "spans": [self.root.to_otel()] + [s.to_otel() for s in self.spans],
+                }],
+            }]
+        }
+
+    def export(self, path: str):
+        """Ajoute la trace OTLP/JSON a un fichier (une trace par ligne)."""
+        try:
+            with open(path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(self.to_otel()) + "\n")
+        except OSError as e:
+            logger.warning(f"Export trace impossible ({path}): {e}")
+
+
+def current_trace() -> Optional[Trace]:
+    return _current_trace.get()
+
+
+@contextmanager
+def span(name: str, **attributes):
+    """Span dans la trace courante; no-op si aucune trace n'est active."""
+    trace = _current_trace.get()
+    if trace is None:
+        yield None
+        return
+    with trace.span(name, **attributes) as s:
+        yield s
+
+
+def traced(name: Optional[str] = None):
+    """Decorateur: execute la fonction (sync ou async) dans un span."""
+    def decorator(func):
+        span_name = name or func.__name__.lstrip("_")
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with span(span_name):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(span_name):
+                return func(*args, **kwargs)
+        return wrapper
+
+    return decorator
+
+
+def _notify(trace: Trace, span: Span):
+    for listener in _span_listeners:
+        try:
+            listener(trace, span)
+        except Exception as e:
+            logger.warning(f"Listener de span en erreur: {e}")
+
+
+def _otel_attribute(key: str, value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        typed = {"boolValue": value}
+    elif isinstance(value, int):
+        typed = {"intValue": str(value)}
+    elif isinstance(value, float):
+        typed = {"doubleValue": value}
+    else:
+        typed = {"stringValue": str(value)}
+    return {"key": key, "value": typed}
@@ -0,0 +1,21 @@
+from functools import lru_cache
+
+from config.settings import settings
+from src.storage import get_hotel_registry, get_reviews_store, get_search_cache
+from src.utils.request_log import get_request_log
+from .plan import WarmTarget, plan_warmup
+from .warmer import CacheWarmer
+
+
+@lru_cache
+def get_cache_warmer() -> CacheWarmer:
+    """Warmer partage: relit le journal des requetes, cede la place aux requetes live."""
+    return CacheWarmer(
+        settings.request_log_path,
+        get_search_cache(),
+        get_reviews_store(),
+        get_hotel_registry(),
+        top=settings.warmer_top,
+        window_days=settings.warmer_window_days,
+        busy=lambda: get_request_log().in_flight > 0,
+    )
@@ -0,0 +1,29 @@
+"""
+Combinaisons que le warmer prechaufferait, d'apres le journal des requetes.
+
+    python -m src.warmer --log data/requests.jsonl --top 20 --window-days 7
+"""
+
+import argparse
+
+from config.settings import settings
+from src.utils.request_log import read_request_log
+from .plan import plan_warmup
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Plan de prechauffage des caches")
+    parser.add_argument("--log", default=settings.request_log_path, help="Journal des requetes (JSON lines)")
+    parser.add_argument("--top", type=int, default=settings.warmer_top)
+    parser.add_argument("--window-days", type=float, default=settings.warmer_window_days)
+    args = parser.parse_args()
+
+    targets = plan_warmup(read_request_log(args.log), top=args.top, window_days=args.window_days)
+    if not targets:
+        print(f"Aucune combinaison a prechauffer dans {args.log}")
+    for target in targets:
+        print(f"{target.count:6d}  {target.cache:8s}  {target.label}")
+
+
+if __name__ == "__main__":
+    main()
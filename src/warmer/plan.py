@@ -0,0 +1,103 @@
+"""
+Analyse du journal des requetes: combinaisons a prechauffer.
+
+Les recherches sont regroupees par page de base (ville, dates, occupation):
+une seule recherche large par groupe, sans filtre de prix/note/etoiles et avec
+le tri le plus demande, couvre toutes les variantes re-filtrables localement.
+Les hotels demandes (/hotel_details, /hotel_reviews) sont regroupes par id.
+Seules les requetes recentes, reussies et portant sur des dates a venir comptent.
+"""
+
+from collections import Counter
+from dataclasses import dataclass
+from datetime import date
+from typing import Dict, Iterable, List, Optional
+from urllib.parse import parse_qs
+import time
+
+from pydantic import ValidationError
+
+from src.models.search import HotelSearchRequest
+from src.storage.search_cache import SEARCH_PAGE_SIZE, base_key
+
+# Parametres de /search_hotels qui definissent la page de base
+_SEARCH_PARAMS = ("city", "checkin", "checkout", "adults", "children", "rooms")
+_HOTEL_PATHS = ("/hotel_details", "/hotel_reviews")
+
+
+@dataclass
+class WarmTarget:
+    cache: str                      # "search" ou "reviews"
+    key: str                        # cle de regroupement (page de base, id d'hotel)
+    count: int                      # requetes observees dans la fenetre
+    search: Optional[HotelSearchRequest] = None
+    country_code: Optional[str] = None
+
+    @property
+    def label(self) -> str:
+        if self.search is not None:
+            s = self.search
+            return f"{s.city} {s.checkin}->{s.checkout} ({s.adults}a/{s.children}e/{s.rooms}ch, {s.sort_by})"
+        return self.key
+
+
+def _last(params: Dict[str, List[str]], name: str) -> Optional[str]:
+    values = params.get(name)
+    return values[-1] if values else None
+
+
+def search_request(params: Dict[str, List[str]]) -> Optional[HotelSearchRequest]:
+    """Recherche large (page complete, sans filtres locaux) d'une requete journalisee."""
+    data = {name: _last(params, name) for name in _SEARCH_PARAMS if _last(params, name) is not None}
+    try:
+        return HotelSearchRequest(**data, sort_by=_last(params, "sort_by") or "popularity",
+                                  max_results=SEARCH_PAGE_SIZE)
+    except ValidationError:
+        return None
+
+
+def plan_warmup(entries: Iterable[dict], top: int = 20, window_days: float = 7,
+                today: Optional[date] = None, now: Optional[float] = None) -> List[WarmTarget]:
+    """Les `top` combinaisons les plus demandees, de la plus frequente a la moins frequente."""
+    today = today or date.today()
+    now = now or time.time()
+    searches: Dict[str, HotelSearchRequest] = {}
+    search_counts: Counter = Counter()
+    sorts: Dict[str, Counter] = {}
+    hotel_counts: Counter = Counter()
+    countries: Dict[str, str] = {}
+
+    for entry in entries:
+        if entry.get("status", 200) >= 400 or now - entry.get("ts", now) > window_days * 86400:
+            continue
+        path = entry["path"]
+        params = parse_qs(entry.get("query") or "")
+
+        if path.endswith("/search_hotels"):
+            request = search_request(params)
+            if request is None or request.checkin < today:
+                continue
+            key = base_key(request)
+            searches.setdefault(key, request)
+            search_counts[key] += 1
+            sorts.setdefault(key, Counter())[request.sort_by] += 1
+
+        elif path.endswith(_HOTEL_PATHS):
+            hotel_id = _last(params, "hotel_id")
+            if not hotel_id:
+                continue
+            hotel_counts[hotel_id] += 1
+            country_code = _last(params, "country_code")
+            if country_code:
+                countries[hotel_id] = country_code
+
+    targets = [
+        WarmTarget("search", key, count, searches[key].model_copy(update={"sort_by": sorts[key].most_common(1)[0][0]}))
+        for key, count in search_counts.items()
+    ] + [
+        WarmTarget("reviews", hotel_id, count, country_code=countries.get(hotel_id))
+        for hotel_id, count in hotel_counts.items()
+    ]
+    # Tri stable: a frequence egale, les recherches passent avant les avis
+    targets.sort(key=lambda t: t.count, reverse=True)
+    return targets[:top]
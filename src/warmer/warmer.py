@@ -0,0 +1,151 @@
+"""
+Prechauffage des caches a partir du journal des requetes.
+
+Au demarrage (apres un delai) puis a intervalle regulier, le warmer relit le
+journal, retient les combinaisons les plus demandees et les scrape en tache de
+fond avant qu'elles ne soient redemandees: recherches -> cache de recherche et
+registre d'hotels, hotels -> store d'avis. Priorite basse: un seul scrape a la
+fois, lance uniquement quand aucune requete live n'est en cours, en classe
+BACKGROUND de l'ordonnanceur des scrapes.
+
+Chaque consultation de cache est observee (listener de record_cache): le
+rapport donne la part des consultations servies par une entree prechauffee.
+"""
+
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+import asyncio
+import logging
+import time
+
+from config.settings import settings
+from src.scrapers.scheduler import Priority
+from src.scrapers.search import SearchScraper
+from src.storage import HotelRegistry, ReviewsStore, SearchCache, record_quietly
+from src.storage.refresh import refresh_reviews
+from src.utils.metrics import add_cache_listener, record_warm_hit
+from src.utils.request_log import read_request_log
+from .plan import WarmTarget, plan_warmup
+
+logger = logging.getLogger(__name__)
+
+CACHES = ("search", "reviews")
+
+
+class CacheWarmer:
+    """Scrapes de fond des combinaisons frequentes du journal + ratio de hits prechauffes."""
+
+    def __init__(self, log_path: str, search_cache: SearchCache, reviews_store: ReviewsStore,
+                 registry: HotelRegistry, top: int = 20, window_days: float = 7,
+                 busy: Callable[[], bool] = lambda: False, idle_poll: float = 0.5, pause: float = 1.0):
+        self.log_path = log_path
+        self.search_cache = search_cache
+        self.reviews_store = reviews_store
+        self.registry = registry
+        self.top = top
+        self.window_days = window_days
+        self.busy = busy
+        self.idle_poll = idle_poll
+        self.pause = pause
+        self.ttl = {"search": search_cache.ttl, "reviews": settings.reviews_ttl}
+        # cache -> {cle: instant du prechauffage}
+        self.warmed: Dict[str, Dict[str, float]] = {cache: {} for cache in CACHES}
+        self.stats = {cache: {"lookups": 0, "hits": 0, "warm_hits": 0} for cache in CACHES}
+        self.runs = 0
+        self.errors = 0
+        self.last_run: Optional[str] = None
+        add_cache_listener(self.observe)
+
+    def observe(self, cache: str, key: Optional[str], hit: bool):
+        """Listener de record_cache: un hit sur une cle prechauffee compte comme hit chaud."""
+        if cache not in self.stats or key is None:
+            return
+        stats = self.stats[cache]
+        stats["lookups"] += 1
+        warmed = self.warmed[cache]
+        if not hit:
+            # L'entree est (re)remplie par le trafic live: ses prochains hits ne sont plus dus au warmer
+            warmed.pop(key, None)
+            return
+        stats["hits"] += 1
+        if key in warmed and time.monotonic() - warmed[key] < self.ttl[cache]:
+            stats["warm_hits"] += 1
+            record_warm_hit(cache)
+
+    def report(self) -> dict:
+        caches = {
+            cache: {**stats, "warmed": len(self.warmed[cache]),
+                    "warm_hit_ratio": round(stats["warm_hits"] / stats["lookups"], 4) if stats["lookups"] else None}
+            for cache, stats in self.stats.items()
+        }
+        lookups = sum(s["lookups"] for s in self.stats.values())
+        warm_hits = sum(s["warm_hits"] for s in self.stats.values())
+        return {
+            "runs": self.runs,
+            "errors": self.errors,
+            "last_run": self.last_run,
+            "warm_hit_ratio": round(warm_hits / lookups, 4) if lookups else None,
+            "caches": caches,
+        }
+
+    def plan(self) -> List[WarmTarget]:
+        return plan_warmup(read_request_log(self.log_path), top=self.top, window_days=self.window_days)
+
+    async def _wait_idle(self):
+        while self.busy():
+            await asyncio.sleep(self.idle_poll)
+
+    async def _warm_search(self, target: WarmTarget) -> bool:
+        if self.search_cache.lookup(target.search) is not None:
+            return False
+        async def scrape():
+            async with SearchScraper() as scraper:
+                return await scraper.search_hotels(target.search, Priority.BACKGROUND)
+
+        # Rejoint un scrape live equivalent en cours; une requete live n'attend jamais celui-ci
+        result = await self.search_cache.fetch(target.search, scrape, Priority.BACKGROUND)
+        await record_quietly(f"recherche {target.key}", self.registry.record_search, result)
+        self.warmed["search"][target.key] = time.monotonic()
+        return True
+
+    async def _warm_reviews(self, target: WarmTarget) -> bool:
+        try:
+            hotel_id, country_code = self.registry.resolve(target.key, target.country_code)
+        except KeyError:
+            return False
+        if self.reviews_store.is_fresh(hotel_id, self.ttl["reviews"]):
+            return False
+        await refresh_reviews(self.reviews_store, hotel_id, country_code, Priority.BACKGROUND)
+        self.warmed["reviews"][hotel_id] = time.monotonic()
+        return True
+
+    async def warm_once(self) -> int:
+        """Une passe sur les combinaisons les plus demandees; renvoie le nombre de scrapes lances."""
+        # Relecture et analyse du journal (jusqu'a deux fichiers) hors de la boucle qui sert l'API
+        targets = await asyncio.to_thread(self.plan)
+        scraped = 0
+        for target in targets:
+            await self._wait_idle()
+            try:
+                warm = self._warm_search if target.cache == "search" else self._warm_reviews
+                if await warm(target):
+                    scraped += 1
+                    logger.info(f"🔥 Prechauffe {target.cache}: {target.label} ({target.count} requetes)")
+                    await asyncio.sleep(self.pause)
+            except Exception as e:
+                self.errors += 1
+                logger.warning(f"Prechauffage en echec ({target.cache} {target.label}): {e}")
+        self.runs += 1
+        self.last_run = datetime.utcnow().isoformat()
+        logger.info(f"Prechauffage: {scraped} scrapes sur {len(targets)} combinaisons; rapport {self.report()}")
+        return scraped
+
+    async def run(self, delay: float = 30.0, interval: float = 600.0):
+        """Tache de fond: premiere passe apres `delay`, puis toutes les `interval` secondes."""
+        await asyncio.sleep(delay)
+        while True:
+            try:
+                await self.warm_once()
+            except Exception as e:
+                logger.warning(f"Passe de prechauffage interrompue: {e}")
+            await asyncio.sleep(interval)
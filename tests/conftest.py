@@ -0,0 +1,44 @@
+"""Fixtures communes: donnees persistantes des tests isolees du repertoire data/ reel."""
+import sys
+from pathlib import Path
+
+import pytest
+
+# Ajouter le repertoire racine du projet au path Python
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from config.settings import settings
+from src.assets import get_asset_pipeline
+from src.scrapers.session import get_session_manager
+from src.storage import get_hotel_registry, get_reviews_store, get_search_cache
+from src.utils.request_log import get_request_log
+from src.warmer import get_cache_warmer
+
+SINGLETONS = (get_request_log, get_reviews_store, get_hotel_registry, get_search_cache, get_session_manager,
+              get_asset_pipeline, get_cache_warmer)
+
+
+@pytest.fixture(autouse=True, scope="session")
+def isolated_data_dir(tmp_path_factory):
+    """
+    Journal des requetes, stores SQLite, sessions et images sous un repertoire
+    temporaire: le trafic des TestClient ne doit pas nourrir le warmer reel.
+    """
+    data = tmp_path_factory.mktemp("data")
+    overrides = {
+        "data_dir": str(data),
+        "request_log_path": str(data / "requests.jsonl"),
+        "assets_dir": str(data / "assets"),
+    }
+    originals = {name: getattr(settings, name) for name in overrides}
+    for name, value in overrides.items():
+        setattr(settings, name, value)
+    for factory in SINGLETONS:
+        factory.cache_clear()
+    yield data
+    get_request_log().close()
+    for name, value in originals.items():
+        setattr(settings, name, value)
+    for factory in SINGLETONS:
+        factory.cache_clear()
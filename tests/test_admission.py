@@ -0,0 +1,105 @@
+"""Test du controle d'admission (file bornee, marge memoire, 503 + Retry-After)."""
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# Ajouter le repertoire racine du projet au path Python
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from fastapi.testclient import TestClient
+
+from src.api.main import app
+from src.api.routes import search as search_route
+from src.scrapers import search as search_module
+from src.scrapers.scheduler import DEFAULT_RETRY_AFTER, Overloaded, Priority, ScrapeScheduler, available_memory_mb
+from src.storage import SearchCache
+
+
+def test_full_queue_is_rejected_with_throughput_estimate():
+    scheduler = ScrapeScheduler(slots=1, max_queue=2, window=60)
+
+    async def run():
+        release = asyncio.Event()
+
+        async def job():
+            async with scheduler.slot(Priority.BATCH):
+                await release.wait()
+
+        jobs = [asyncio.create_task(job()) for _ in range(3)]
+        await asyncio.sleep(0.01)
+        assert scheduler.running == 1 and sum(scheduler.queued().values()) == 2
+
+        try:
+            async with scheduler.slot(Priority.INTERACTIVE):
+                raise AssertionError("admis malgre la file pleine")
+        except Overloaded as e:
+            assert e.retry_after == DEFAULT_RETRY_AFTER  # aucun debit mesure
+
+        # 6 scrapes termines sur les 60 dernieres secondes: 0.1/s, 3 places a ecouler -> 30 s
+        now = time.monotonic()
+        scheduler._completed.extend(now - 60 + 10 * i for i in range(1, 7))
+        try:
+            scheduler.admit(Priority.INTERACTIVE)
+            raise AssertionError("admis malgre la file pleine")
+        except Overloaded as e:
+            assert 29 <= e.retry_after <= 31
+
+        release.set()
+        await asyncio.gather(*jobs)
+        async with scheduler.slot(Priority.INTERACTIVE):
+            pass
+
+    asyncio.run(run())
+    assert scheduler.rejected == {"interactive": 2, "batch": 0, "background": 0}
+    assert scheduler.running == 0 and scheduler.stats()["throughput_per_min"] is not None
+    print("File bornee et Retry-After OK")
+
+
+def test_low_memory_rejects_additional_scrapes():
+    free = [4096.0]
+    scheduler = ScrapeScheduler(slots=4, min_free_mb=512, memory=lambda: free[0])
+
+    async def run():
+        async with scheduler.slot():
+            async with scheduler.slot():
+                free[0] = 300.0
+                try:
+                    async with scheduler.slot(Priority.BACKGROUND):
+                        raise AssertionError("admis sans marge memoire")
+                except Overloaded as e:
+                    assert "Memoire" in str(e)
+        # Rien ne tourne: un scrape reste admis pour ne jamais bloquer le service
+        async with scheduler.slot():
+            return scheduler.running
+
+    assert asyncio.run(run()) == 1
+    assert scheduler.rejected["background"] == 1
+    assert available_memory_mb() is None or available_memory_mb() > 0
+    print("Marge memoire OK")
+
+
+def test_overloaded_search_fails_fast_without_launching_a_browser():
+    saturated = ScrapeScheduler(slots=1, max_queue=0)
+    saturated.running = 1  # slot occupe par un autre scrape
+    scheduler_factory, search_module.get_scheduler = search_module.get_scheduler, lambda: saturated
+    cache_factory, search_route.get_search_cache = search_route.get_search_cache, SearchCache
+    try:
+        start = time.monotonic()
+        response = TestClient(app).get("/api/v1/search_hotels", params={
+            "city": "Paris", "checkin": "2025-12-01", "checkout": "2025-12-03"})
+        assert response.status_code == 503 and time.monotonic() - start < 1
+        assert response.headers["Retry-After"] == str(DEFAULT_RETRY_AFTER)
+        assert "File de scrapes pleine" in response.json()["detail"]
+    finally:
+        search_module.get_scheduler = scheduler_factory
+        search_route.get_search_cache = cache_factory
+    print("Refus rapide 503 + Retry-After OK")
+
+
+if __name__ == "__main__":
+    test_full_queue_is_rejected_with_throughput_estimate()
+    test_low_memory_rejects_additional_scrapes()
+    test_overloaded_search_fails_fast_without_launching_a_browser()
+    print("\nTous les tests passent!")
@@ -0,0 +1,112 @@
+"""Test du pipeline d'images (cache par id, quasi-doublons, stockage par contenu)."""
+import asyncio
+import sys
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import BytesIO
+from pathlib import Path
+
+# Ajouter le repertoire racine du projet au path Python
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import httpx
+from PIL import Image, ImageDraw
+
+from src.assets import AssetPipeline
+
+
+def make_jpeg(size, shapes, tint=0) -> bytes:
+    image = Image.new("RGB", size, (200 + tint, 200, 200))
+    draw = ImageDraw.Draw(image)
+    for box, color in shapes:
+        draw.rectangle([int(c * size[0] / 100) for c in box], fill=color)
+    buffer = BytesIO()
+    image.save(buffer, "JPEG", quality=90)
+    return buffer.getvalue()
+
+
+STRIPES = [((0, 0, 30, 100), (20, 20, 120)), ((60, 0, 80, 100), (150, 30, 30))]
+IMAGES = {
+    "/images/hotel/max500/101.jpg": make_jpeg((400, 300), STRIPES),
+    # Meme photo recadree/recompressee sous un autre id -> quasi-doublon
+    "/images/hotel/max500/102.jpg": make_jpeg((380, 285), STRIPES, tint=6),
+    "/images/hotel/max500/103.jpg": make_jpeg((300, 300), [((0, 0, 100, 40), (10, 120, 10))]),
+}
+
+
+def serve_images():
+    """Serveur de fichiers local qui compte les telechargements par chemin."""
+    hits = {}
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            path = self.path.split("?")[0]
+            hits[path] = hits.get(path, 0) + 1
+            body = IMAGES.get(path)
+            self.send_response(200 if body else 404)
+            self.send_header("Content-Type", "image/jpeg")
+            self.send_header("Content-Length", str(len(body or b"")))
+            self.end_headers()
+            self.wfile.write(body or b"")
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, hits
+
+
+def run_pipeline(storage_dir, urls):
+    async def run():
+        async with httpx.AsyncClient() as client:
+            return await AssetPipeline(storage_dir, client).process(urls)
+    return asyncio.run(run())
+
+
+def test_gallery_is_deduplicated_and_stored_by_content():
+    server, hits = serve_images()
+    base = f"http://127.0.0.1:{server.server_address[1]}/images/hotel"
+    urls = [
+        f"{base}/max500/101.jpg?k=a",
+        f"{base}/max500/101.jpg?k=b",  # meme id, autre signature
+        f"{base}/max500/102.jpg",
+        f"{base}/max500/103.jpg",
+        f"{base}/max500/404.jpg",
+    ]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        assets = run_pipeline(tmp, urls)
+
+        assert [a.image_id for a in assets] == ["101", "103"]
+        assert hits["/images/hotel/max500/101.jpg"] == 1, "image telechargee deux fois"
+        first = assets[0]
+        assert (first.width, first.height) == (400, 300)
+        stored = Path(tmp) / first.path
+        assert first.path.startswith(first.sha256[:2] + "/") and stored.read_bytes() == IMAGES["/images/hotel/max500/101.jpg"]
+        assert first.size_bytes == stored.stat().st_size
+    server.shutdown()
+    print("Deduplication et stockage par contenu OK")
+
+
+def test_index_cache_skips_known_images():
+    server, hits = serve_images()
+    base = f"http://127.0.0.1:{server.server_address[1]}/images/hotel"
+
+    with tempfile.TemporaryDirectory() as tmp:
+        first = run_pipeline(tmp, [f"{base}/max500/103.jpg"])
+        # Nouveau pipeline (redemarrage), autre taille de la meme image -> cache par id
+        second = run_pipeline(tmp, [f"{base}/max1024x768/103.jpg"])
+
+        assert second == first
+        assert sum(hits.values()) == 1
+    server.shutdown()
+    print("Cache par id d'image OK")
+
+
+if __name__ == "__main__":
+    test_gallery_is_deduplicated_and_stored_by_content()
+    test_index_cache_skips_known_images()
+    print("\nTous les tests passent!")
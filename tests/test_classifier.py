@@ -0,0 +1,156 @@
+"""Test du classifieur de page (resultats / aucun resultat / challenge / erreur)."""
+import asyncio
+import sys
+import time
+from datetime import date
+from pathlib import Path
+
+# Ajouter le repertoire racine du projet au path Python
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from fastapi.testclient import TestClient
+
+from src.api.main import app
+from src.api.routes import search as search_route
+from src.models.search import HotelSearchRequest
+from src.scrapers.classifier import BLOCKED_RETRY_AFTER, PageOutcome, PageOutcomeError, classify_page
+from src.scrapers.search import SearchScraper
+from src.storage import SearchCache
+from tests.test_search_cache import CountingScraper
+
+CARD = '[data-testid="property-card"]'
+
+
+class SignaturePage:
+    """Page dont certains selecteurs apparaissent apres un delai; les autres expirent."""
+
+    def __init__(self, present, url="https://www.booking.com/searchresults.html"):
+        self.present = present
+        self.url = url
+
+    async def wait_for_selector(self, selector, state=None, timeout=None):
+        if selector in self.present:
+            await asyncio.sleep(self.present[selector])
+            return object()
+        await asyncio.sleep(timeout / 1000)
+        raise TimeoutError(selector)
+
+    async def wait_for_timeout(self, ms):
+        return None
+
+    async def set_extra_http_headers(self, headers):
+        pass
+
+    def on(self, event, handler):
+        pass
+
+    async def close(self):
+        pass
+
+
+class FakeResponse:
+    def __init__(self, status, headers=None):
+        self.status = status
+        self.headers = headers or {}
+
+
+def classify(page, response=None, timeout=90):
+    start = time.monotonic()
+    outcome = asyncio.run(classify_page(page, CARD, timeout=timeout, response=response))
+    return outcome, time.monotonic() - start
+
+
+def test_first_signature_wins_without_waiting_for_timeout():
+    cases = [
+        ({CARD: 0.05}, PageOutcome.RESULTS),
+        ({'[data-testid="no-results-message"]': 0.05}, PageOutcome.EMPTY),
+        ({'#px-captcha': 0.05}, PageOutcome.BLOCKED),
+        ({'text=/something went wrong/i': 0.05}, PageOutcome.ERROR),
+        # Les cartes gagnent meme si un bandeau "aucun resultat" apparait plus tard
+        ({CARD: 0.05, '[data-testid="no-results-message"]': 0.3}, PageOutcome.RESULTS),
+    ]
+    for present, expected in cases:
+        outcome, elapsed = classify(SignaturePage(present))
+        assert outcome is expected, (present, outcome)
+        assert elapsed < 1
+    print("Course des signatures OK")
+
+
+def test_status_and_url_classify_before_any_wait():
+    assert classify(SignaturePage({}), FakeResponse(429))[0] is PageOutcome.BLOCKED
+    assert classify(SignaturePage({}), FakeResponse(503))[0] is PageOutcome.ERROR
+    assert classify(SignaturePage({}, url="https://www.booking.com/captcha/verify"))[0] is PageOutcome.BLOCKED
+
+    outcome, elapsed = classify(SignaturePage({}), FakeResponse(200), timeout=0.2)
+    assert outcome is PageOutcome.ERROR and elapsed < 1
+    print("Statut HTTP et URL OK")
+
+
+class SearchContext:
+    def __init__(self, page):
+        self.page = page
+
+    async def new_page(self):
+        return self.page
+
+
+def run_search(page, response=None):
+    scraper = SearchScraper()
+    scraper.context = SearchContext(page)
+
+    async def goto(page, url):
+        return response or FakeResponse(200)
+
+    scraper.safe_goto = goto
+    request = HotelSearchRequest(city="Nowhere", checkin=date(2025, 12, 1), checkout=date(2025, 12, 3))
+    return asyncio.run(scraper.search_hotels(request))
+
+
+def test_search_returns_fast_on_empty_and_blocked_pages():
+    start = time.monotonic()
+    result = run_search(SignaturePage({'[data-testid="no-results-message"]': 0.05}))
+    assert result.hotels == [] and result.total_found == 0
+
+    try:
+        run_search(SignaturePage({'#challenge-container': 0.05}))
+        raise AssertionError("challenge non detecte")
+    except PageOutcomeError as e:
+        assert e.outcome is PageOutcome.BLOCKED and e.retry_after == BLOCKED_RETRY_AFTER
+    assert time.monotonic() - start < 2
+    print("Recherche vide / bloquee rapide OK")
+
+
+class BlockedScraper(CountingScraper):
+    async def search_hotels(self, request, priority=None, deadline=None):
+        raise PageOutcomeError(PageOutcome.BLOCKED, "429", retry_after=120)
+
+
+def test_blocked_search_returns_retry_after():
+    # Delai annonce par Booking avec le 429, a defaut BLOCKED_RETRY_AFTER
+    try:
+        run_search(SignaturePage({}), FakeResponse(429, {"retry-after": "120"}))
+        raise AssertionError("429 non detecte")
+    except PageOutcomeError as e:
+        assert e.outcome is PageOutcome.BLOCKED and e.retry_after == 120
+    assert PageOutcomeError(PageOutcome.ERROR).retry_after is None
+
+    original, search_route.SearchScraper = search_route.SearchScraper, BlockedScraper
+    cache_factory, search_route.get_search_cache = search_route.get_search_cache, SearchCache
+    try:
+        response = TestClient(app).get("/api/v1/search_hotels", params={
+            "city": "Paris", "checkin": "2025-12-01", "checkout": "2025-12-03"})
+        assert response.status_code == 503 and response.headers["Retry-After"] == "120"
+        assert "blocked" in response.json()["detail"]
+    finally:
+        search_route.SearchScraper = original
+        search_route.get_search_cache = cache_factory
+    print("Blocage -> 503 + Retry-After OK")
+
+
+if __name__ == "__main__":
+    test_first_signature_wins_without_waiting_for_timeout()
+    test_status_and_url_classify_before_any_wait()
+    test_search_returns_fast_on_empty_and_blocked_pages()
+    test_blocked_search_returns_retry_after()
+    print("\nTous les tests passent!")
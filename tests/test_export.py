@@ -0,0 +1,76 @@
+"""Test de l'export colonnaire Parquet / Arrow (tables typees, ecriture par lots)."""
+import json
+import sys
+import tempfile
+from datetime import date, timedelta
+from pathlib import Path
+
+# Ajouter le repertoire racine du projet au path Python
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from src.export import export_table, hotel_rows, price_rows, room_rows
+from src.models.hotel import HotelDetails
+from src.models.search import HotelSearchRequest, HotelSearchResult, HotelSummary
+
+
+def sweep_results(days: int, hotels: int):
+    """Balayage simule: une recherche par date d'arrivee."""
+    for offset in range(days):
+        checkin = date(2025, 12, 1) + timedelta(days=offset)
+        yield HotelSearchResult(
+            request=HotelSearchRequest(city="Paris", checkin=checkin, checkout=checkin + timedelta(days=2)),
+            hotels=[
+                HotelSummary(hotel_id=f"hotel-{i}", name=f"Hotel {i}", price=None if i == 0 else 100.0 + offset + i,
+                             review_count=i * 10, url=f"https://www.booking.com/hotel/fr/hotel-{i}.html")
+                for i in range(hotels)
+            ],
+            total_found=hotels,
+            scrape_timestamp="2025-11-20T10:00:00"
+        )
+
+
+def test_search_and_prices_are_written_in_row_groups():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "hotels.parquet"
+        written = export_table("hotels", hotel_rows(sweep_results(30, 50)), path, batch_size=400)
+
+        parquet = pq.ParquetFile(path)
+        assert written == parquet.metadata.num_rows == 1500
+        assert parquet.metadata.num_row_groups == 4
+        table = parquet.read()
+        assert table.schema.field("checkin").type == pa.date32()
+        assert table.schema.field("review_count").type == pa.int32()
+        assert table.column("scraped_at").type == pa.timestamp("us")
+
+        path = Path(tmp) / "prices.arrow"
+        written = export_table("prices", price_rows(sweep_results(30, 50)), path, fmt="arrow", batch_size=400)
+        prices = pa.ipc.open_file(str(path)).read_all()
+        assert written == prices.num_rows == 30 * 49
+        first = prices.slice(0, 1).to_pylist()[0]
+        assert first["nights"] == 2 and first["price_per_night"] == first["price"] / 2
+    print("Export hotels/prix par lots OK")
+
+
+def test_rooms_keep_list_columns_and_stay_dates():
+    data = json.loads((project_root / "hotel_details_full.json").read_text(encoding="utf-8"))
+    data["scrape_parameters"] = {"checkin": "2025-12-12", "checkout": "2025-12-15"}
+    details = HotelDetails(**data)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "rooms.parquet"
+        assert export_table("rooms", room_rows([details]), path) == len(details.rooms)
+        rows = pq.read_table(path).to_pylist()
+
+    assert rows[0]["hotel_id"] == details.hotel_id and rows[0]["checkin"] == date(2025, 12, 12)
+    assert rows[0]["amenities"] == details.rooms[0].amenities
+    print("Export des chambres OK")
+
+
+if __name__ == "__main__":
+    test_search_and_prices_are_written_in_row_groups()
+    test_rooms_keep_list_columns_and_stay_dates()
+    print("\nTous les tests passent!")
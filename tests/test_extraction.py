@@ -0,0 +1,200 @@
+"""Test de l'ordonnanceur d'extraction (parallelisme, dependances, timeouts)."""
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# Ajouter le repertoire racine du projet au path Python
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.scrapers.details import DetailsScraper
+from src.scrapers.extraction import ExtractionScheduler, DOM, HTML
+from src.loadtest import MockBooking, MockSettings
+from src.loadtest.pages import render_hotel_page
+from src.utils.tracing import Trace
+from src.models.hotel import HotelDetailsRequest
+from config.settings import settings
+
+
+class FakePage:
+    """Page Playwright minimale: aucun element DOM trouve."""
+
+    async def query_selector(self, selector):
+        return None
+
+    async def query_selector_all(self, selector):
+        return []
+
+    async def wait_for_selector(self, selector, timeout=None):
+        raise TimeoutError(selector)
+
+
+class HangingPage(FakePage):
+    """Page dont chaque requete DOM reste bloquee (selecteur qui ne repond pas)."""
+
+    def __init__(self, html: str):
+        self.html = html
+        self.closed = None
+
+    async def goto(self, url, wait_until=None, timeout=None):
+        self.closed = asyncio.Event()
+
+    async def wait_for_timeout(self, ms):
+        return None
+
+    async def evaluate(self, script, arg=None):
+        return {"steps": 0, "unresolved": [], "height": 0}
+
+    async def content(self):
+        return self.html
+
+    async def query_selector(self, selector):
+        # Comme Playwright: la requete ne se termine qu'a la fermeture de la page
+        await self.closed.wait()
+        raise RuntimeError("Target page has been closed")
+
+    async def query_selector_all(self, selector):
+        return await self.query_selector(selector)
+
+    def on(self, event, handler):
+        pass
+
+    async def close(self):
+        self.closed.set()
+
+
+class FakeContext:
+    def __init__(self, page):
+        self.page = page
+
+    async def new_page(self):
+        return self.page
+
+
+def test_independent_tasks_run_concurrently():
+    scheduler = ExtractionScheduler(default_timeout=1.0)
+    scheduler.add("a", lambda: asyncio.sleep(0.2, result="A"))
+    scheduler.add("b", lambda: asyncio.sleep(0.2, result="B"))
+    scheduler.add("c", lambda: time.sleep(0.2) or "C", kind=HTML)
+    scheduler.add("ab", lambda: asyncio.sleep(0, result=scheduler.results["a"] + scheduler.results["b"]),
+                  depends_on=("a", "b"))
+
+    start = time.monotonic()
+    results = asyncio.run(scheduler.run())
+    elapsed = time.monotonic() - start
+
+    assert results == {"a": "A", "b": "B", "c": "C", "ab": "AB"}
+    assert elapsed < 0.35, f"Taches executees en serie ({elapsed:.2f}s)"
+    print(f"Parallelisme OK ({elapsed:.2f}s)")
+
+
+def test_timeouts_and_errors_fall_back_to_defaults():
+    def broken():
+        raise ValueError("bad html")
+
+    scheduler = ExtractionScheduler(default_timeout=5.0)
+    scheduler.add("slow", lambda: asyncio.sleep(10), timeout=0.05, default=[])
+    scheduler.add("broken", broken, kind=HTML, default=(None, None))
+    scheduler.add("fast", lambda: asyncio.sleep(0, result=1), kind=DOM)
+
+    results = asyncio.run(scheduler.run())
+    assert results == {"slow": [], "broken": (None, None), "fast": 1}
+    assert scheduler.failed == {"slow": "timeout", "broken": "ValueError: bad html"}
+    print("Timeouts OK")
+
+
+def test_invalid_graphs_are_rejected():
+    scheduler = ExtractionScheduler()
+    scheduler.add("a", lambda: None, depends_on=("b",))
+    scheduler.add("b", lambda: None, depends_on=("a",))
+    try:
+        asyncio.run(scheduler.run())
+    except ValueError as e:
+        assert "circulaire" in str(e)
+    else:
+        raise AssertionError("Cycle non detecte")
+    print("Graphe invalide OK")
+
+
+def test_details_extraction_graph_on_mock_page():
+    hotel = MockBooking(MockSettings()).hotel("le-grand-hotel-lyon")
+    html = render_hotel_page(hotel, lazy_sections=False)
+    scraper = DetailsScraper()
+    trace = Trace("hotel_details")
+
+    async def extract():
+        with trace.activate():
+            return await scraper._build_extraction(FakePage(), html).run()
+
+    sections = asyncio.run(extract())
+    assert sections["name"] == "Le Grand Hotel Lyon"
+    assert sections["address"].latitude == 45.7622
+    assert len(sections["images"][0]) == 4
+    assert sections["contact"][0].startswith("+33 4 72")
+    assert sections["rooms"] == []
+
+    span_names = {s.name for s in trace.spans}
+    assert {"extract_all_json_ld", "extract_images_decoded", "extract_rooms_complete"} <= span_names
+    print("Extraction details OK")
+
+
+def test_requested_sections_limit_extraction():
+    request = HotelDetailsRequest(hotel_id="x", country_code="fr", sections="images, contact")
+    assert request.sections == ["images", "contact"]
+    try:
+        HotelDetailsRequest(hotel_id="x", country_code="fr", sections=["pool"])
+    except ValueError as e:
+        assert "Sections inconnues" in str(e)
+    else:
+        raise AssertionError("Section inconnue acceptee")
+
+    scheduler = DetailsScraper()._build_extraction(FakePage(), "<html></html>", sections=request.sections)
+    assert list(scheduler.tasks) == ["json_ld", "images", "contact"]
+    print("Sections demandees OK")
+
+
+def test_budget_exhausted_skips_tasks():
+    scheduler = ExtractionScheduler(default_timeout=5.0, deadline=time.monotonic() - 1)
+    scheduler.add("rooms", lambda: asyncio.sleep(0, result=["room"]), default=[])
+    assert asyncio.run(scheduler.run()) == {"rooms": []}
+    assert scheduler.failed == {"rooms": "budget"}
+    print("Budget epuise OK")
+
+
+def test_hung_selectors_return_partial_details():
+    hotel = MockBooking(MockSettings()).hotel("le-grand-hotel-lyon")
+    html = render_hotel_page(hotel, lazy_sections=False)
+    scraper = DetailsScraper()
+    scraper.context = FakeContext(HangingPage(html))
+    scraper.SCROLL_TIMEOUT = 0.1
+
+    budget, fast_path = settings.details_budget, settings.fast_path
+    settings.details_budget, settings.fast_path = 0.5, False
+    try:
+        start = time.monotonic()
+        details, reviews = asyncio.run(scraper.get_hotel_details(
+            HotelDetailsRequest(hotel_id="le-grand-hotel-lyon", country_code="fr")
+        ))
+        elapsed = time.monotonic() - start
+    finally:
+        settings.details_budget, settings.fast_path = budget, fast_path
+
+    assert elapsed < 2, f"Budget global non respecte ({elapsed:.2f}s)"
+    assert details.partial
+    assert {"rooms", "nearby", "guest_reviews"} <= set(details.missing_sections)
+    assert not {"name", "address", "images", "policies"} & set(details.missing_sections)
+    assert len(details.images) == 4 and details.phone.startswith("+33 4 72")
+    assert details.name == "Le Grand Hotel Lyon" and reviews == []
+    print(f"Resultat partiel OK ({elapsed:.2f}s, manquants: {details.missing_sections})")
+
+
+if __name__ == "__main__":
+    test_independent_tasks_run_concurrently()
+    test_timeouts_and_errors_fall_back_to_defaults()
+    test_invalid_graphs_are_rejected()
+    test_details_extraction_graph_on_mock_page()
+    test_requested_sections_limit_extraction()
+    test_budget_exhausted_skips_tasks()
+    test_hung_selectors_return_partial_details()
+    print("\nTous les tests passent!")
@@ -0,0 +1,147 @@
+"""Test du chemin rapide httpx (page detail sans Chromium, escalade des sections JS)."""
+import asyncio
+import sys
+from pathlib import Path
+
+# Ajouter le repertoire racine du projet au path Python
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import httpx
+
+from config.settings import settings
+from src.loadtest import MockBooking, MockSettings, create_app
+from src.loadtest.pages import render_hotel_page
+from src.models.hotel import HotelDetailsRequest, HotelPolicies, RoomOption
+from src.utils import http_client
+from src.scrapers import details as details_module
+from src.scrapers.details import DetailsScraper
+
+MOCK_URL = "http://mock-booking.test"
+
+
+def run_with_mock(coro_factory, **mock_config):
+    """Execute un scrape avec le client httpx partage branche sur le mock (ASGI)."""
+    async def run():
+        app = create_app(MockBooking(MockSettings(seed=5, **mock_config)))
+        http_client._client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app))
+        try:
+            return await coro_factory()
+        finally:
+            await http_client.close_http_client()
+
+    base_url = settings.booking_base_url
+    settings.booking_base_url = MOCK_URL
+    try:
+        return asyncio.run(run())
+    finally:
+        settings.booking_base_url = base_url
+
+
+def test_server_html_sections_skip_the_browser():
+    scraper = DetailsScraper()
+    request = HotelDetailsRequest(hotel_id="le-grand-hotel-lyon", country_code="fr",
+                                  sections="name,address,images,policies,contact,review_summary")
+
+    # Page entierement rendue cote serveur (pas de sections paresseuses)
+    details, _ = run_with_mock(lambda: scraper.get_hotel_details(request), lazy_sections=False)
+
+    assert scraper.browser is None, "Chromium lance alors que le HTML serveur suffisait"
+    assert details.name == "Le Grand Hotel Lyon"
+    assert len(details.images) == 4 and details.policies.checkin_from == "14:00"
+    assert details.scrape_parameters["fast_path"]["outcome"] == "sufficient"
+    print("Chemin rapide suffisant OK")
+
+
+def test_lazy_sections_escalate_to_browser():
+    scraper = DetailsScraper()
+    calls = []
+
+    async def browser_extract(request, url, sections, trace, deadline):
+        calls.append(sections)
+        return {"policies": HotelPolicies(checkin_from="14:00")}, {}, None
+
+    scraper._browser_extract = browser_extract
+    # Politiques chargees paresseusement: absentes du HTML serveur
+    request = HotelDetailsRequest(hotel_id="le-grand-hotel-lyon", country_code="fr", sections="name,images,policies")
+
+    details, _ = run_with_mock(lambda: scraper.get_hotel_details(request))
+
+    assert calls == [["policies"]]
+    assert details.name == "Le Grand Hotel Lyon" and details.policies.checkin_from == "14:00"
+    assert details.scrape_parameters["fast_path"] == {
+        "outcome": "escalated", "sections": ["images", "name"], "escalated": ["policies"]
+    }
+    print("Escalade vers le navigateur OK")
+
+
+def test_browser_sections_skip_the_http_fetch():
+    scraper = DetailsScraper()
+    calls = []
+
+    async def browser_extract(request, url, sections, trace, deadline):
+        calls.append(sections)
+        return {"rooms": [RoomOption(room_type="Deluxe", price=120.0)]}, {}, None
+
+    async def fetch_html(url, timeout=None):
+        raise AssertionError("GET httpx alors que Chromium charge la page")
+
+    scraper._browser_extract = browser_extract
+    original, details_module.fetch_html = details_module.fetch_html, fetch_html
+    try:
+        request = HotelDetailsRequest(hotel_id="le-grand-hotel-lyon", country_code="fr", sections="name,images,rooms")
+        details, _ = asyncio.run(scraper.get_hotel_details(request))
+    finally:
+        details_module.fetch_html = original
+
+    assert calls == [["name", "images", "rooms"]] and details.cheapest_price == 120.0
+    assert details.scrape_parameters["fast_path"]["outcome"] == "skipped"
+    print("Pas de GET httpx quand Chromium est requis OK")
+
+
+def test_empty_sections_with_their_source_present_are_sufficient():
+    hotel = {**MockBooking(MockSettings()).hotel("le-grand-hotel-lyon"), "star_rating": None, "phone": None}
+    html = render_hotel_page(hotel, lazy_sections=False).replace("Phone: ", "")
+
+    async def fetch_html(url, timeout=None):
+        return 200, html
+
+    scraper = DetailsScraper()
+    original, details_module.fetch_html = details_module.fetch_html, fetch_html
+    try:
+        request = HotelDetailsRequest(hotel_id="le-grand-hotel-lyon", country_code="fr",
+                                      sections="name,star_rating,contact,policies")
+        details, _ = asyncio.run(scraper.get_hotel_details(request))
+    finally:
+        details_module.fetch_html = original
+
+    assert scraper.browser is None and details.scrape_parameters["fast_path"]["outcome"] == "sufficient"
+    assert details.star_rating is None and (details.phone, details.email) == (None, None)
+    print("Sections vides mais presentes sans navigateur OK")
+
+
+def test_blocked_fast_path_falls_back_to_browser():
+    scraper = DetailsScraper()
+    calls = []
+
+    async def browser_extract(request, url, sections, trace, deadline):
+        calls.append(sections)
+        return {"name": "Le Grand Hotel Lyon"}, {}, None
+
+    scraper._browser_extract = browser_extract
+    request = HotelDetailsRequest(hotel_id="le-grand-hotel-lyon", country_code="fr", sections="name")
+
+    details, _ = run_with_mock(lambda: scraper.get_hotel_details(request), throttle_rate=1.0)
+
+    assert calls == [["name"]]
+    assert details.scrape_parameters["fast_path"]["outcome"] == "unavailable"
+    print("Repli navigateur sur 429 OK")
+
+
+if __name__ == "__main__":
+    test_server_html_sections_skip_the_browser()
+    test_lazy_sections_escalate_to_browser()
+    test_browser_sections_skip_the_http_fetch()
+    test_empty_sections_with_their_source_present_are_sufficient()
+    test_blocked_fast_path_falls_back_to_browser()
+    print("\nTous les tests passent!")
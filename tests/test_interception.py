@@ -0,0 +1,103 @@
+"""Test de l'interception des payloads JSON (recherche, chambres, avis)."""
+import asyncio
+import sys
+from pathlib import Path
+
+# Ajouter le repertoire racine du projet au path Python
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from fastapi.testclient import TestClient
+
+from src.loadtest import MockBooking, MockSettings, create_app
+from src.scrapers.details import DetailsScraper
+from src.scrapers.interception import ResponseCapture, map_reviews, map_rooms, map_search_results
+from tests.test_extraction import FakePage
+
+
+class FakeResponse:
+    def __init__(self, url, payload, content_type="application/json"):
+        self.url = url
+        self.headers = {"content-type": content_type}
+        self._payload = payload
+
+    async def json(self):
+        await asyncio.sleep(0.01)
+        return self._payload
+
+
+class EventPage:
+    """Page minimale qui emet des evenements "response"."""
+
+    def __init__(self):
+        self.handlers = []
+
+    def on(self, event, handler):
+        self.handlers.append(handler)
+
+    def emit(self, response):
+        for handler in self.handlers:
+            handler(response)
+
+
+def graphql(client: TestClient, operation: str, **variables):
+    return client.post("/dml/graphql", json={"operationName": operation, "variables": variables}).json()
+
+
+def make_client() -> TestClient:
+    return TestClient(create_app(MockBooking(MockSettings(seed=3))))
+
+
+def test_payloads_map_to_models():
+    client = make_client()
+
+    hotels = map_search_results([graphql(client, "FullSearch", city="Paris")])
+    assert [h.hotel_id for h in hotels] == ["moder-flat-heart-of-iveme", "hotel-du-louvre-paris"]
+    assert hotels[0].price and hotels[0].review_count and hotels[0].url.endswith("/hotel/fr/moder-flat-heart-of-iveme.html")
+
+    rooms = map_rooms([graphql(client, "RoomsAvailability", pagename="le-grand-hotel-lyon")])
+    assert rooms and all(r.price and r.max_occupancy for r in rooms)
+    assert any(r.refundable for r in rooms) and any(r.breakfast_included for r in rooms)
+
+    reviews = map_reviews([graphql(client, "ReviewList", pagename="le-grand-hotel-lyon", offset=0, rows=10)])
+    assert len(reviews) == 10
+    assert reviews[0].review_date == "2 October 2025"
+    print("Mapping des payloads OK")
+
+
+def test_capture_collects_only_json_api_responses():
+    client = make_client()
+    page = EventPage()
+
+    async def run():
+        capture = ResponseCapture(page).attach()
+        page.emit(FakeResponse("https://www.booking.com/dml/graphql?lang=en-us", graphql(client, "FullSearch", city="Lyon")))
+        page.emit(FakeResponse("https://www.booking.com/dml/graphql", {"x": 1}, content_type="text/html"))
+        page.emit(FakeResponse("https://www.booking.com/static/app.json", {"y": 2}))
+        await capture.settle()
+        return capture
+
+    capture = asyncio.run(run())
+    assert len(capture.payloads) == 1
+    assert [h.hotel_id for h in map_search_results(capture.payloads)] == ["le-grand-hotel-lyon"]
+    print("Capture des reponses OK")
+
+
+def test_captured_rooms_bypass_dom_selectors():
+    client = make_client()
+    captured = {"rooms": map_rooms([graphql(client, "RoomsAvailability", pagename="le-grand-hotel-lyon")])}
+
+    scheduler = DetailsScraper()._build_extraction(FakePage(), "<html></html>", sections=["rooms"], captured=captured)
+    results = asyncio.run(scheduler.run())
+    assert results["rooms"] == captured["rooms"]
+
+    scheduler = DetailsScraper()._build_extraction(FakePage(), "<html></html>", sections=["rooms"])
+    assert asyncio.run(scheduler.run())["rooms"] == []
+    print("Repli DOM des chambres OK")
+
+
+if __name__ == "__main__":
+    test_payloads_map_to_models()
+    test_capture_collects_only_json_api_responses()
+    test_captured_rooms_bypass_dom_selectors()
+    print("\nTous les tests passent!")
@@ -0,0 +1,74 @@
+"""Test de l'endpoint /metrics et de l'alimentation des metriques par les spans."""
+import asyncio
+import sys
+from pathlib import Path
+
+# Ajouter le repertoire racine du projet au path Python
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+
+from src.api.main import app
+from src.scrapers.extraction import ExtractionScheduler
+from src.utils.tracing import Trace
+
+
+def failures(extractor, reason):
+    labels = {"extractor": extractor, "reason": reason}
+    return REGISTRY.get_sample_value("scraper_extractor_failures_total", labels) or 0
+
+
+def test_metrics_endpoint_exposes_scraper_metrics():
+    before = failures("rooms", "error")
+
+    async def broken():
+        raise RuntimeError("selector timeout")
+
+    trace = Trace("hotel_details")
+    with trace.activate():
+        with trace.span("navigation"):
+            pass
+        scheduler = ExtractionScheduler(default_timeout=1.0).add("rooms", broken, default=[])
+        assert asyncio.run(scheduler.run()) == {"rooms": []}
+
+    with TestClient(app) as client:
+        response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    body = response.text
+    assert 'scraper_stage_duration_seconds_count{scraper="details",stage="navigation"}' in body
+    assert 'scraper_extractor_failures_total{extractor="rooms",reason="error"}' in body
+    assert failures("rooms", "error") == before + 1
+    assert 'scraper_request_duration_seconds_count{outcome="ok",scraper="details"}' in body
+    assert "scraper_event_loop_lag_seconds" in body
+    print("Endpoint /metrics OK")
+
+
+def test_extractor_timeouts_are_counted():
+    # Un extracteur qui avale ses erreurs mais depasse son delai ne leve rien dans son span
+    before = {reason: failures("nearby", reason) for reason in ("timeout", "budget")}
+
+    async def hung():
+        try:
+            await asyncio.sleep(10)
+        except BaseException:
+            return []
+
+    scheduler = ExtractionScheduler(default_timeout=5.0).add("nearby", hung, timeout=0.05, default=[])
+    asyncio.run(scheduler.run())
+    assert scheduler.failed == {"nearby": "timeout"}
+    assert failures("nearby", "timeout") == before["timeout"] + 1
+
+    exhausted = ExtractionScheduler(deadline=0).add("nearby", hung, default=[])
+    asyncio.run(exhausted.run())
+    assert failures("nearby", "budget") == before["budget"] + 1
+    print("Extracteurs hors delai comptes OK")
+
+
+if __name__ == "__main__":
+    test_metrics_endpoint_exposes_scraper_metrics()
+    test_extractor_timeouts_are_counted()
+    print("\nTous les tests passent!")
@@ -0,0 +1,146 @@
+"""Test du serveur Booking simule (fixtures, injection de fautes, sections paresseuses)."""
+import asyncio
+import sys
+from datetime import date
+from pathlib import Path
+from urllib.parse import urlsplit
+
+# Ajouter le repertoire racine du projet au path Python
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from fastapi.testclient import TestClient
+
+from src.loadtest import MockBooking, MockSettings, create_app
+from src.models.search import HotelSearchRequest
+from src.scrapers.details import DetailsScraper
+from src.scrapers.search import SearchScraper
+from tests.test_classifier import FakeResponse, SearchContext
+
+
+def make_client(**config) -> TestClient:
+    return TestClient(create_app(MockBooking(MockSettings(seed=42, lazy_delay_ms=0, **config))))
+
+
+def test_search_page_serves_fixture_cards():
+    client = make_client()
+    response = client.get("/searchresults.html", params={"ss": "Paris", "checkin": "2025-12-12"})
+
+    assert response.status_code == 200
+    assert response.text.count('data-testid="property-card"') == 2
+    assert "/hotel/fr/hotel-du-louvre-paris.html?checkin=2025-12-12" in response.text
+    assert SearchScraper._extract_hotel_id(None, "/hotel/fr/hotel-du-louvre-paris.html?checkin=2025-12-12") == "hotel-du-louvre-paris"
+    print("Recherche simulee OK")
+
+
+def test_hotel_page_is_parseable_by_details_scraper():
+    client = make_client(lazy_sections=False)
+    html = client.get("/hotel/fr/le-grand-hotel-lyon.html").text
+
+    scraper = DetailsScraper()
+    json_ld = scraper._extract_all_json_ld(html)
+    assert json_ld[0]["name"] == "Le Grand Hotel Lyon"
+
+    images, main_image = scraper._extract_images_decoded(html, json_ld)
+    assert len(images) == 4 and "max1024x768" in main_image
+
+    policies = scraper._extract_policies(html)
+    assert policies.checkin_from == "14:00"
+    assert 'data-testid="poi-block-list"' in html
+    print("Page detail simulee OK")
+
+
+def test_lazy_sections_are_deferred():
+    client = make_client(lazy_sections=True)
+    html = client.get("/hotel/fr/le-grand-hotel-lyon.html").text
+
+    assert 'data-testid="poi-block-list"' not in html
+    assert 'data-mock-lazy="/_mock/section/fr/le-grand-hotel-lyon/nearby"' in html
+
+    section = client.get("/_mock/section/fr/le-grand-hotel-lyon/nearby")
+    assert 'data-testid="poi-block-list"' in section.text
+    assert client.get("/_mock/section/fr/le-grand-hotel-lyon/unknown").status_code == 404
+    print("Sections paresseuses OK")
+
+
+def test_fault_injection_and_stats():
+    client = make_client(throttle_rate=1.0, retry_after=7)
+    response = client.get("/hotel/fr/le-grand-hotel-lyon.html")
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "7"
+
+    client.post("/_mock/config", json={"throttle_rate": 0.0, "error_rate": 1.0})
+    assert client.get("/searchresults.html", params={"ss": "Lyon"}).status_code == 500
+
+    stats = client.get("/_mock/stats").json()
+    assert stats == {"requests": 2, "errors_injected": 1, "throttled": 1, "not_found": 0}
+    assert client.post("/_mock/config", json={"nope": 1}).status_code == 422
+    print("Injection de fautes OK")
+
+
+class MockPage:
+    """Page servie par le mock: un selecteur [attribut="valeur"] apparait s'il figure dans le HTML."""
+
+    def __init__(self, client: TestClient):
+        self.client = client
+        self.html = ""
+        self.url = ""
+
+    async def goto(self, url):
+        parts = urlsplit(url)
+        response = self.client.get(f"{parts.path}?{parts.query}")
+        self.html, self.url = response.text, url
+        return FakeResponse(response.status_code)
+
+    async def wait_for_selector(self, selector, state=None, timeout=None):
+        if selector.startswith("[") and selector[1:-1] in self.html:
+            return object()
+        await asyncio.sleep(timeout / 1000)
+        raise TimeoutError(selector)
+
+    async def set_extra_http_headers(self, headers):
+        pass
+
+    def on(self, event, handler):
+        pass
+
+    async def close(self):
+        pass
+
+
+def search_mock(client: TestClient, city: str):
+    page = MockPage(client)
+    scraper = SearchScraper()
+    scraper.context = SearchContext(page)
+
+    async def goto(page, url):
+        return await page.goto(url)
+
+    scraper.safe_goto = goto
+    request = HotelSearchRequest(city=city, checkin=date(2025, 12, 1), checkout=date(2025, 12, 3))
+    return asyncio.run(scraper.search_hotels(request)), page
+
+
+def test_unknown_city_serves_no_results_page():
+    client = make_client()
+    response = client.get("/searchresults.html", params={"ss": "Atlantis"})
+    assert response.status_code == 200
+    assert 'data-testid="no-results-message"' in response.text and 'data-testid="property-card"' not in response.text
+
+    # Le scraper conclut EMPTY sur la signature "aucun resultat", sans attendre les cartes
+    result, page = search_mock(client, "Atlantis")
+    assert result.hotels == [] and result.total_found == 0 and "no-results-message" in page.html
+
+    # Tests de charge sur des villes arbitraires: tout le catalogue, sur demande
+    catalogue = make_client(any_city=True).get("/searchresults.html", params={"ss": "Atlantis"})
+    assert catalogue.text.count('data-testid="property-card"') == 3
+    print("Ville inconnue -> aucun resultat OK")
+
+
+if __name__ == "__main__":
+    test_search_page_serves_fixture_cards()
+    test_hotel_page_is_parseable_by_details_scraper()
+    test_lazy_sections_are_deferred()
+    test_fault_injection_and_stats()
+    test_unknown_city_serves_no_results_page()
+    print("\nTous les tests passent!")
@@ -0,0 +1,168 @@
+"""Test du registre d'hotels (slug / id numerique / pays) et de sa resolution dans /hotel_details."""
+import sys
+import tempfile
+import threading
+from datetime import date
+from pathlib import Path
+
+# Ajouter le repertoire racine du projet au path Python
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from fastapi.testclient import TestClient
+
+from src.api.main import app
+from src.api.routes import details as details_route
+from src.api.routes import search as search_route
+from src.loadtest import MockBooking, MockSettings, create_app
+from src.models.hotel import Address, HotelDetails
+from src.models.search import HotelSearchRequest, HotelSearchResult
+from src.scrapers.interception import map_search_results
+from src.storage import HotelRegistry, SearchCache, get_hotel_registry
+
+
+def search_result(city: str) -> HotelSearchResult:
+    client = TestClient(create_app(MockBooking(MockSettings(seed=3))))
+    payload = client.post("/dml/graphql", json={"operationName": "FullSearch", "variables": {"city": city}}).json()
+    hotels = map_search_results([payload])
+    return HotelSearchResult(
+        request=HotelSearchRequest(city=city, checkin=date(2025, 12, 1), checkout=date(2025, 12, 3)),
+        hotels=hotels, total_found=len(hotels), scrape_timestamp="2025-11-20T10:00:00"
+    )
+
+
+def test_search_and_details_populate_persistent_registry():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = str(Path(tmp) / "hotels.sqlite")
+        registry = HotelRegistry(path)
+        result = search_result("Lyon")
+        assert registry.record_search(result) == 1
+
+        lyon = result.hotels[0]
+        record = registry.get(str(lyon.booking_id))
+        assert record.hotel_id == "le-grand-hotel-lyon" and record.country_code == "fr"
+        assert record.latitude == lyon.latitude and record.city == "Lyon"
+
+        # Une page detail (sans id numerique) complete sans effacer l'existant
+        registry.record_details(HotelDetails(
+            hotel_id="le-grand-hotel-lyon", name="Le Grand Hotel Lyon", url="u",
+            address=Address(city="Lyon 2e"), scrape_timestamp="2025-11-21T10:00:00"
+        ), "fr")
+
+        reopened = HotelRegistry(path)
+        record = reopened.get("le-grand-hotel-lyon")
+        assert record.booking_id == lyon.booking_id and record.city == "Lyon 2e"
+        assert reopened.get(str(lyon.booking_id)) == record
+        assert reopened.resolve(str(lyon.booking_id)) == ("le-grand-hotel-lyon", "fr")
+        assert reopened.resolve("some-slug", "gb") == ("some-slug", "gb")
+        print("Registre d'hotels OK")
+
+
+class RecordingScraper:
+    requests = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        pass
+
+    async def get_hotel_details(self, request):
+        RecordingScraper.requests.append(request)
+        return HotelDetails(hotel_id=request.hotel_id, name="Hotel", url="u", scrape_timestamp="t"), []
+
+
+def test_hotel_details_accepts_a_bare_numeric_id():
+    with tempfile.TemporaryDirectory() as tmp:
+        registry = HotelRegistry(str(Path(tmp) / "hotels.sqlite"))
+        result = search_result("Paris")
+        registry.record_search(result)
+        louvre = next(h for h in result.hotels if h.hotel_id == "hotel-du-louvre-paris")
+
+        app.dependency_overrides[get_hotel_registry] = lambda: registry
+        scraper_cls, details_route.DetailsScraper = details_route.DetailsScraper, RecordingScraper
+        try:
+            client = TestClient(app)
+            response = client.get("/api/v1/hotel_details", params={"hotel_id": str(louvre.booking_id)})
+            assert response.status_code == 200 and response.json()["hotel_id"] == "hotel-du-louvre-paris"
+            request = RecordingScraper.requests[-1]
+            assert (request.hotel_id, request.country_code) == ("hotel-du-louvre-paris", louvre.country_code)
+
+            assert client.get("/api/v1/hotel_details", params={"hotel_id": "999999"}).status_code == 404
+        finally:
+            details_route.DetailsScraper = scraper_cls
+            app.dependency_overrides.pop(get_hotel_registry, None)
+    print("Resolution par id numerique OK")
+
+
+class LockedRegistry(HotelRegistry):
+    threads = []
+
+    def record_details(self, details, country_code=None):
+        LockedRegistry.threads.append(threading.current_thread())
+        raise RuntimeError("database is locked")
+
+
+class LoopScraper(RecordingScraper):
+    loop_thread = None
+
+    async def get_hotel_details(self, request):
+        LoopScraper.loop_thread = threading.current_thread()
+        return await super().get_hotel_details(request)
+
+
+def test_registry_write_failure_does_not_fail_details():
+    with tempfile.TemporaryDirectory() as tmp:
+        registry = LockedRegistry(str(Path(tmp) / "hotels.sqlite"))
+        registry.record_search(search_result("Paris"))
+        app.dependency_overrides[get_hotel_registry] = lambda: registry
+        scraper_cls, details_route.DetailsScraper = details_route.DetailsScraper, LoopScraper
+        try:
+            response = TestClient(app).get("/api/v1/hotel_details", params={"hotel_id": "hotel-du-louvre-paris"})
+            assert response.status_code == 200 and response.json()["name"] == "Hotel"
+            # Ecriture SQLite faite hors de la boucle asyncio
+            assert LockedRegistry.threads and LoopScraper.loop_thread not in LockedRegistry.threads
+        finally:
+            details_route.DetailsScraper = scraper_cls
+            app.dependency_overrides.pop(get_hotel_registry, None)
+    print("Echec du registre sans echec de la requete OK")
+
+
+class ReadOnlyRegistry(HotelRegistry):
+    def record_search(self, result):
+        LockedRegistry.threads.append(threading.current_thread())
+        raise RuntimeError("attempt to write a readonly database")
+
+
+def test_registry_write_failure_does_not_fail_search():
+    from tests.test_search_cache import CountingScraper
+
+    class LoopCountingScraper(CountingScraper):
+        async def search_hotels(self, request, priority=None, deadline=None):
+            LoopScraper.loop_thread = threading.current_thread()
+            return await super().search_hotels(request, priority, deadline)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        registry = ReadOnlyRegistry(str(Path(tmp) / "hotels.sqlite"))
+        originals = (search_route.SearchScraper, search_route.get_hotel_registry, search_route.get_search_cache)
+        search_route.SearchScraper, search_route.get_hotel_registry = LoopCountingScraper, lambda: registry
+        search_route.get_search_cache = SearchCache
+        LockedRegistry.threads, calls = [], CountingScraper.calls
+        try:
+            response = TestClient(app).get("/api/v1/search_hotels", params={
+                "city": "Paris", "checkin": "2025-12-01", "checkout": "2025-12-03"})
+            assert response.status_code == 200 and len(response.json()["hotels"]) == 12
+            # Ecriture SQLite faite hors de la boucle asyncio
+            assert len(LockedRegistry.threads) == 1 and LockedRegistry.threads[0] is not LoopScraper.loop_thread
+        finally:
+            search_route.SearchScraper, search_route.get_hotel_registry, search_route.get_search_cache = originals
+            CountingScraper.calls = calls
+    print("Echec du registre sans echec de la recherche OK")
+
+
+if __name__ == "__main__":
+    test_search_and_details_populate_persistent_registry()
+    test_hotel_details_accepts_a_bare_numeric_id()
+    test_registry_write_failure_does_not_fail_details()
+    test_registry_write_failure_does_not_fail_search()
+    print("\nTous les tests passent!")
@@ -0,0 +1,78 @@
+"""Test du rejeu du journal des requetes (planning, percentiles, rejeu accelere)."""
+import asyncio
+import sys
+import time
+from datetime import date, datetime
+from pathlib import Path
+
+# Ajouter le repertoire racine du projet au path Python
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import httpx
+
+from src.api import main
+from src.loadtest.replay import load_schedule, percentile, replay, shift_query_dates
+from src.utils.request_log import RequestLog, get_request_log
+
+T0 = datetime(2025, 11, 20, 10, 0).timestamp()
+
+
+def test_schedule_keeps_inter_arrivals_and_shifts_dates():
+    entries = [
+        {"ts": T0 + 1.5, "method": "GET", "path": "/api/v1/hotel_details", "query": "hotel_id=x&checkin=2025-12-01&checkout=2025-12-03"},
+        {"ts": T0, "method": "GET", "path": "/api/v1/search_hotels", "query": "city=Paris&checkin=2025-12-01"},
+        {"ts": T0 + 0.25, "method": "GET", "path": "/api/v1/search_hotels", "query": "city=Lyon"},
+    ]
+
+    schedule = load_schedule(entries)
+    assert [r.offset for r in schedule] == [0, 0.25, 1.5]
+    assert [r.path for r in load_schedule(entries, path_prefix="/api/v1/hotel_details")] == ["/api/v1/hotel_details"]
+    assert len(load_schedule(entries, limit=2)) == 2
+
+    shifted = load_schedule(entries, shift_dates=True, today=date(2026, 1, 9))  # enregistre 50 jours plus tot
+    assert shifted[2].query == "hotel_id=x&checkin=2026-01-20&checkout=2026-01-22"
+    assert shift_query_dates("city=Lyon&checkin=bad", 3) == "city=Lyon&checkin=bad"
+
+    assert percentile([5, 1, 4, 2, 3], 50) == 3 and percentile([5, 1, 4, 2, 3], 99) == 5
+    assert percentile([], 50) is None
+    print("Planning de rejeu OK")
+
+
+async def _replay_against_api(schedule, speed):
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://api") as client:
+        return await replay(schedule, client, speed)
+
+
+def test_replay_is_open_loop_and_reports_per_endpoint():
+    entries = [
+        {"ts": T0 + i * 0.1, "method": "GET", "path": "/api/v1/hotels/nearby", "query": "lat=45.76&lon=4.83&radius_km=1"}
+        for i in range(10)
+    ] + [
+        {"ts": T0 + 0.05, "method": "GET", "path": "/api/v1/cache/warmer", "query": ""},
+        {"ts": T0 + 1.0, "method": "GET", "path": "/api/v1/unknown", "query": ""},
+    ]
+    main.get_request_log = lambda: RequestLog(None)
+    try:
+        start = time.monotonic()
+        report = asyncio.run(_replay_against_api(load_schedule(entries), speed=5))
+        elapsed = time.monotonic() - start
+    finally:
+        main.get_request_log = get_request_log
+
+    # 1s enregistree rejouee a x5
+    assert 0.18 <= elapsed < 1.0
+    endpoints = report.to_dict()["endpoints"]
+    nearby = endpoints["/api/v1/hotels/nearby"]
+    assert nearby["requests"] == 10 and nearby["statuses"] == {"200": 10} and nearby["errors"] == 0
+    assert nearby["p50_ms"] <= nearby["p99_ms"] <= nearby["max_ms"]
+    assert endpoints["/api/v1/unknown"]["statuses"] == {"404": 1}
+    assert report.to_dict()["total"]["requests"] == 12
+    print("Rejeu accelere OK")
+
+
+if __name__ == "__main__":
+    test_schedule_keeps_inter_arrivals_and_shifts_dates()
+    test_replay_is_open_loop_and_reports_per_endpoint()
+    print("\nTous les tests passent!")
@@ -0,0 +1,56 @@
+"""Test de la serialisation orjson et de la projection fields= des reponses."""
+import json
+import sys
+from pathlib import Path
+
+# Ajouter le repertoire racine du projet au path Python
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from fastapi.testclient import TestClient
+
+from src.api.main import app
+from src.api.responses import json_response, parse_fields
+from src.models.hotel import HotelDetails
+
+
+def load_details() -> HotelDetails:
+    return HotelDetails(**json.loads((project_root / "hotel_details_full.json").read_text(encoding="utf-8")))
+
+
+def test_fields_projection_descends_into_lists_and_models():
+    details = load_details()
+    include = parse_fields(HotelDetails, "name, rooms.price,rooms.room_type,address.city")
+
+    body = json.loads(json_response(details, include).body)
+
+    assert set(body) == {"name", "rooms", "address"}
+    assert body["rooms"] and all(set(room) == {"room_type", "price"} for room in body["rooms"])
+    assert body["address"] == {"city": details.address.city}
+    print("Projection fields= OK")
+
+
+def test_full_response_matches_model_dump():
+    details = load_details()
+    assert json.loads(json_response(details).body) == json.loads(details.model_dump_json())
+    print("Serialisation orjson complete OK")
+
+
+def test_unknown_fields_are_rejected_before_scraping():
+    client = TestClient(app)
+
+    response = client.get("/api/v1/hotel_details", params={"hotel_id": "x", "fields": "name,rooms.nope"})
+    assert response.status_code == 422 and "rooms.nope" in response.json()["detail"]
+
+    response = client.get("/api/v1/search_hotels", params={
+        "city": "Paris", "checkin": "2025-12-01", "checkout": "2025-12-05", "fields": "hotels.name.first"
+    })
+    assert response.status_code == 422
+    print("Champs inconnus rejetes OK")
+
+
+if __name__ == "__main__":
+    test_fields_projection_descends_into_lists_and_models()
+    test_full_response_matches_model_dump()
+    test_unknown_fields_are_rejected_before_scraping()
+    print("\nTous les tests passent!")
@@ -0,0 +1,128 @@
+"""Test du fetcher d'avis pagine (/reviewlist.html) contre le serveur simule."""
+import asyncio
+import sys
+from datetime import date
+from pathlib import Path
+
+# Ajouter le repertoire racine du projet au path Python
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from fastapi.testclient import TestClient
+
+from config.settings import settings
+from src.loadtest import MockBooking, MockSettings, create_app
+from src.scrapers.reviews import ReviewsFetcher, parse_review_list
+from src.scrapers.scheduler import Priority, ScrapeScheduler
+
+
+class FakeResponse:
+    def __init__(self, response):
+        self.status = response.status_code
+        self.ok = response.is_success
+        self._text = response.text
+
+    async def text(self):
+        return self._text
+
+
+class FakeRequest:
+    """Equivalent de `context.request` servi par le mock; mesure les requetes en vol."""
+
+    def __init__(self, client: TestClient):
+        self.client = client
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.offsets = []
+
+    async def get(self, url, params=None, timeout=None):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.01)
+            self.offsets.append(params["offset"])
+            path = url[len(settings.booking_base_url):]
+            return FakeResponse(self.client.get(path, params=params))
+        finally:
+            self.in_flight -= 1
+
+
+class FakeContext:
+    def __init__(self, client: TestClient):
+        self.request = FakeRequest(client)
+
+
+def make_context() -> FakeContext:
+    return FakeContext(TestClient(create_app(MockBooking(MockSettings(seed=1)))))
+
+
+def test_parse_review_list_fragment():
+    client = TestClient(create_app(MockBooking(MockSettings(seed=1))))
+    html = client.get("/reviewlist.html", params={"pagename": "le-grand-hotel-lyon", "offset": 0, "rows": 25}).text
+
+    reviews, last_page = parse_review_list(html)
+    assert len(reviews) == 25
+    assert last_page == 75  # 1874 avis / 25
+    assert reviews[0].reviewer_name and reviews[0].score > 0
+    assert reviews[0].tags
+    print("Parsing liste d'avis OK")
+
+
+def test_fetch_all_pages_with_bounded_fan_out():
+    context = make_context()
+    fetcher = ReviewsFetcher(context, concurrency=3, page_size=25)
+
+    reviews = asyncio.run(fetcher.fetch_reviews("hotel-du-louvre-paris", "fr", limit=200))
+    assert len(reviews) == 200
+    assert context.request.max_in_flight == 3
+    assert sorted(context.request.offsets) == list(range(0, 200, 25))
+    print(f"Fan-out borne OK ({len(reviews)} avis)")
+
+
+def test_since_stops_incremental_fetch():
+    context = make_context()
+    fetcher = ReviewsFetcher(context, concurrency=2, page_size=25)
+    reviews = asyncio.run(fetcher.fetch_reviews("le-grand-hotel-lyon", "fr"))
+    cutoff = date(2025, 6, 1)
+
+    context = make_context()
+    fetcher = ReviewsFetcher(context, concurrency=2, page_size=25)
+    recent = asyncio.run(fetcher.fetch_reviews("le-grand-hotel-lyon", "fr", since=cutoff))
+
+    assert len(reviews) == 1874
+    assert 0 < len(recent) < 200
+    assert len(context.request.offsets) < 12
+    print(f"Fetch incremental OK ({len(recent)} avis depuis {cutoff})")
+
+
+def test_slot_is_released_between_pages():
+    scheduler = ScrapeScheduler(slots=1)
+    context = make_context()
+    fetcher = ReviewsFetcher(context, concurrency=2, page_size=25,
+                             slot=lambda: scheduler.slot(Priority.INTERACTIVE))
+
+    async def consume_slowly():
+        held = []
+        reviews = fetcher.iter_reviews("le-grand-hotel-lyon", "fr", limit=100)
+        # Consommateur arrete en plein flux, sans aclose(): les pages en vol se terminent
+        # et aucun slot ne reste pris par le generateur suspendu
+        async for _ in reviews:
+            await asyncio.sleep(0.01)
+            held.append(scheduler.running)
+            if len(held) == 30:
+                break
+        await asyncio.sleep(0.3)
+        return held, scheduler.running, reviews
+
+    held, running, _ = asyncio.run(consume_slowly())
+    assert held[0] == 0 and running == 0
+    assert len(scheduler._completed) == len(context.request.offsets) == 4
+    print("Slot libere entre les pages OK")
+
+
+if __name__ == "__main__":
+    test_parse_review_list_fragment()
+    test_fetch_all_pages_with_bounded_fan_out()
+    test_since_stops_incremental_fetch()
+    test_slot_is_released_between_pages()
+    print("\nTous les tests passent!")
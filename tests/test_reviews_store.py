@@ -0,0 +1,139 @@
+"""Test du store d'avis et de l'endpoint /hotel_reviews (curseur + NDJSON)."""
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+# Ajouter le repertoire racine du projet au path Python
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from fastapi.testclient import TestClient
+
+from src.api.main import app
+from src.api.routes import details as details_route
+from src.models.hotel import GuestReview, HotelDetails
+from src.storage import HotelRegistry, ReviewsStore, get_hotel_registry, get_reviews_store
+from src.storage import refresh as refresh_module
+from src.utils.helpers import parse_review_date
+
+
+def make_reviews(count: int):
+    return [
+        GuestReview(
+            reviewer_name=f"Guest {i}",
+            reviewer_country="France",
+            review_date=f"{1 + i % 28} {('March', 'April', 'May')[i % 3]} 2025",
+            positive_text=f"Great stay {i}",
+            score=8.0,
+        )
+        for i in range(count)
+    ]
+
+
+def make_store(tmp: str, count: int) -> ReviewsStore:
+    store = ReviewsStore(str(Path(tmp) / "reviews.sqlite"))
+    store.add("hotel-a", make_reviews(count))
+    return store
+
+
+def test_store_is_idempotent_and_paginates_by_cursor():
+    with tempfile.TemporaryDirectory() as tmp:
+        store = make_store(tmp, 120)
+        assert store.add("hotel-a", make_reviews(130)) == 10
+        assert store.count("hotel-a") == 130
+        assert store.latest_date("hotel-a") == "2025-05-28"
+
+        seen, cursor = [], None
+        while True:
+            page, cursor = store.page("hotel-a", cursor, limit=50)
+            seen.extend(page)
+            if cursor is None:
+                break
+
+        assert len(seen) == 130
+        assert len({r.review_id for r in seen}) == 130
+        dates = [row[0] for row in store._rows("hotel-a", None, 200)]
+        assert dates == sorted(dates, reverse=True)
+        print("Store d'avis OK")
+
+
+def test_hotel_reviews_endpoint_json_and_ndjson():
+    with tempfile.TemporaryDirectory() as tmp:
+        store = make_store(tmp, 75)
+        app.dependency_overrides[get_reviews_store] = lambda: store
+        try:
+            client = TestClient(app)
+            first = client.get("/api/v1/hotel_reviews", params={"hotel_id": "hotel-a", "limit": 50}).json()
+            assert first["total"] == 75 and len(first["reviews"]) == 50 and first["next_cursor"]
+
+            second = client.get("/api/v1/hotel_reviews", params={
+                "hotel_id": "hotel-a", "limit": 50, "cursor": first["next_cursor"]
+            }).json()
+            assert len(second["reviews"]) == 25 and second["next_cursor"] is None
+
+            response = client.get("/api/v1/hotel_reviews", params={"hotel_id": "hotel-a", "format": "ndjson"})
+            assert response.headers["content-type"].startswith("application/x-ndjson")
+            lines = [json.loads(line) for line in response.text.splitlines()]
+            assert len(lines) == 75
+            assert [l["review_id"] for l in lines[:50]] == [r["review_id"] for r in first["reviews"]]
+
+            bad = client.get("/api/v1/hotel_reviews", params={"hotel_id": "hotel-a", "cursor": "nope"})
+            assert bad.status_code == 422
+        finally:
+            app.dependency_overrides.clear()
+        print("Endpoint /hotel_reviews OK")
+
+
+class ListingScraper:
+    """Details: les 10 avis les plus recents; liste paginee: tous les avis apres `since`."""
+    reviews = sorted(make_reviews(60), key=lambda r: parse_review_date(r.review_date), reverse=True)
+    since = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        pass
+
+    async def get_hotel_details(self, request, priority=None, deadline=None):
+        details = HotelDetails(hotel_id=request.hotel_id, name="Hotel A", url="u", scrape_timestamp="t")
+        return details, ListingScraper.reviews[:10]
+
+    async def iter_reviews(self, hotel_id, country_code, since=None, limit=None, priority=None):
+        ListingScraper.since.append(since)
+        for review in ListingScraper.reviews:
+            if since is None or parse_review_date(review.review_date) > since:
+                yield review
+
+
+def test_reviews_seeded_by_details_are_backfilled():
+    with tempfile.TemporaryDirectory() as tmp:
+        store = ReviewsStore(str(Path(tmp) / "reviews.sqlite"))
+        registry = HotelRegistry(str(Path(tmp) / "hotels.sqlite"))
+        app.dependency_overrides[get_reviews_store] = lambda: store
+        app.dependency_overrides[get_hotel_registry] = lambda: registry
+        originals = (details_route.DetailsScraper, details_route.get_reviews_store, refresh_module.DetailsScraper)
+        details_route.DetailsScraper = refresh_module.DetailsScraper = ListingScraper
+        details_route.get_reviews_store = lambda: store
+        try:
+            client = TestClient(app)
+            assert client.get("/api/v1/hotel_details", params={"hotel_id": "hotel-a", "country_code": "fr"}).status_code == 200
+            assert store.count("hotel-a") == 10 and store.fetched_at("hotel-a") is None
+
+            page = client.get("/api/v1/hotel_reviews", params={"hotel_id": "hotel-a", "limit": 100}).json()
+            assert page["total"] == 60 and len(page["reviews"]) == 60
+            # Liste parcourue une fois en entier: les rafraichissements suivants sont incrementaux
+            client.get("/api/v1/hotel_reviews", params={"hotel_id": "hotel-a", "refresh": True})
+            assert ListingScraper.since[0] is None and ListingScraper.since[1] is not None
+        finally:
+            details_route.DetailsScraper, details_route.get_reviews_store, refresh_module.DetailsScraper = originals
+            app.dependency_overrides.clear()
+        print("Avis anciens recuperes apres une page detail OK")
+
+
+if __name__ == "__main__":
+    test_store_is_idempotent_and_paginates_by_cursor()
+    test_hotel_reviews_endpoint_json_and_ndjson()
+    test_reviews_seeded_by_details_are_backfilled()
+    print("\nTous les tests passent!")
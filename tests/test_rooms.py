@@ -0,0 +1,95 @@
+"""Test de l'extraction groupee des chambres (tous les tarifs, groupes par type de chambre)."""
+import asyncio
+import copy
+import sys
+from pathlib import Path
+
+# Ajouter le repertoire racine du projet au path Python
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from fastapi.testclient import TestClient
+
+from src.loadtest import MockBooking, MockSettings, create_app
+from src.scrapers.details import DetailsScraper
+from src.scrapers.interception import map_rooms
+from src.scrapers.rooms import ROOM_ROWS_SELECTOR, group_rates
+from tests.test_extraction import FakePage
+
+
+def js_blocks(hotel):
+    """Ce que ROOM_BLOCKS_JS renvoie pour la table rendue par le mock (pages.render_rooms)."""
+    blocks = []
+    for i, room in enumerate(hotel["rooms"]):
+        room_id = f"{hotel['numeric_id']}0{i + 1}"
+        for j, rate in enumerate(room["rates"]):
+            conditions = [c for c in (rate.get("meal_plan"), rate["cancellation"]) if c]
+            blocks.append({
+                "room_id": room_id, "name": room["room_type"], "bed": room["bed"],
+                "facilities": [f"{room['room_size']} m²", "Free WiFi"], "block_id": f"{room_id}_{j + 1}",
+                "occupancy": f"Max. people: {rate['occupancy']}", "occupancy_icons": rate["occupancy"],
+                "price": f"€ {rate['price']:,.0f}", "meal": rate.get("meal_plan"),
+                "cancellation": rate["cancellation"], "conditions": conditions,
+            })
+    return blocks
+
+
+class TablePage(FakePage):
+    def __init__(self, blocks):
+        self.blocks = blocks
+        self.evaluations = 0
+
+    async def evaluate(self, script, arg=None):
+        assert arg == ROOM_ROWS_SELECTOR
+        self.evaluations += 1
+        return self.blocks
+
+
+def test_bulk_extraction_keeps_every_rate_plan():
+    hotel = copy.deepcopy(MockBooking(MockSettings()).hotel("le-grand-hotel-lyon"))
+    hotel["rooms"] = [{**room, "room_type": f"{room['room_type']} {i}"}
+                      for i in range(8) for room in hotel["rooms"]]  # bien plus de 30 lignes
+    rows = sum(len(room["rates"]) for room in hotel["rooms"])
+    assert rows > 30
+    page = TablePage(js_blocks(hotel))
+
+    rooms = asyncio.run(DetailsScraper()._extract_rooms_complete(page, ""))
+
+    assert page.evaluations == 1 and len(rooms) == rows
+    first = rooms[0]
+    assert first.price == hotel["rooms"][0]["rates"][0]["price"] and first.room_size.startswith(str(hotel["rooms"][0]["room_size"]))
+    assert first.amenities == ["Free WiFi"] and first.max_occupancy == hotel["rooms"][0]["rates"][0]["occupancy"]
+
+    room_types = group_rates(rooms)
+    assert [rt.room_type for rt in room_types] == [room["room_type"] for room in hotel["rooms"]]
+    assert [len(rt.rates) for rt in room_types] == [len(room["rates"]) for room in hotel["rooms"]]
+    assert all(rt.cheapest_price == min(r.price for r in rt.rates) for rt in room_types)
+    print("Extraction groupee des tarifs OK")
+
+
+def test_dom_and_json_paths_agree_on_rate_plans():
+    mock = MockBooking(MockSettings(seed=1))
+    hotel = mock.hotel("le-grand-hotel-lyon")
+    client = TestClient(create_app(mock))
+    payload = client.post("/dml/graphql", json={"operationName": "RoomsAvailability",
+                                                "variables": {"pagename": hotel["hotel_id"]}}).json()
+
+    from_json = group_rates(map_rooms([payload]))
+    from_dom = group_rates(asyncio.run(DetailsScraper()._extract_rooms_complete(TablePage(js_blocks(hotel)), "")))
+
+    keys = ("block_id", "price", "max_occupancy", "meal_plan", "breakfast_included",
+            "cancellation_policy", "cancellation_terms", "refundable")
+    assert [rt.room_id for rt in from_dom] == [rt.room_id for rt in from_json]
+    assert [[r.model_dump(include=set(keys)) for r in rt.rates] for rt in from_dom] == \
+           [[r.model_dump(include=set(keys)) for r in rt.rates] for rt in from_json]
+    assert any(r.refundable and "before" in r.cancellation_terms for rt in from_dom for r in rt.rates)
+
+    # Sans page.evaluate: repli ligne par ligne
+    assert asyncio.run(DetailsScraper()._extract_rooms_complete(FakePage(), "")) == []
+    print("Chemins DOM et JSON coherents OK")
+
+
+if __name__ == "__main__":
+    test_bulk_extraction_keeps_every_rate_plan()
+    test_dom_and_json_paths_agree_on_rate_plans()
+    print("\nTous les tests passent!")
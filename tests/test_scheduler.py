@@ -0,0 +1,115 @@
+"""Test de l'ordonnanceur des scrapes (classes de priorite, echeances, vieillissement)."""
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# Ajouter le repertoire racine du projet au path Python
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from fastapi.testclient import TestClient
+
+from src.api.main import app
+from src.api.routes import search as search_route
+from src.scrapers.scheduler import DeadlineExceeded, Priority, ScrapeScheduler
+from src.storage import SearchCache
+from tests.test_search_cache import CountingScraper
+
+
+async def order_of_service(scheduler: ScrapeScheduler, arrivals, hold: float = 0.0):
+    """Occupe tous les slots, met en file `arrivals` (priorite, delai avant arrivee), puis libere."""
+    served = []
+    release = asyncio.Event()
+
+    async def blocker():
+        async with scheduler.slot(Priority.INTERACTIVE):
+            await release.wait()
+
+    async def job(name, priority, delay):
+        await asyncio.sleep(delay)
+        async with scheduler.slot(priority):
+            served.append(name)
+
+    blockers = [asyncio.create_task(blocker()) for _ in range(scheduler.slots)]
+    await asyncio.sleep(0)
+    jobs = [asyncio.create_task(job(name, priority, delay)) for name, priority, delay in arrivals]
+    await asyncio.sleep(hold + max(delay for _, _, delay in arrivals) + 0.01)
+    assert scheduler.running == scheduler.slots
+    release.set()
+    await asyncio.gather(*blockers, *jobs)
+    return served
+
+
+def test_interactive_work_jumps_ahead_of_batch_and_background():
+    scheduler = ScrapeScheduler(slots=1, aging=60)
+    served = asyncio.run(order_of_service(scheduler, [
+        ("warm-1", Priority.BACKGROUND, 0), ("export", Priority.BATCH, 0.001),
+        ("warm-2", Priority.BACKGROUND, 0.002), ("ui-1", Priority.INTERACTIVE, 0.003),
+        ("ui-2", Priority.INTERACTIVE, 0.004),
+    ]))
+    assert served == ["ui-1", "ui-2", "export", "warm-1", "warm-2"]
+    assert scheduler.running == 0 and not any(scheduler.queued().values())
+    print("Ordre par priorite OK")
+
+
+def test_aged_background_work_is_not_starved():
+    scheduler = ScrapeScheduler(slots=1, aging=0.05)
+    # Le scrape de fond attend depuis plus de deux periodes: il passe devant l'interactif arrive ensuite
+    served = asyncio.run(order_of_service(scheduler, [
+        ("warm", Priority.BACKGROUND, 0), ("ui", Priority.INTERACTIVE, 0.11),
+    ], hold=0.01))
+    assert served == ["warm", "ui"]
+    print("Vieillissement anti-famine OK")
+
+
+def test_expired_work_is_dropped_from_the_queue():
+    scheduler = ScrapeScheduler(slots=1, deadlines={"background": 0.05})
+
+    async def run():
+        async with scheduler.slot(Priority.INTERACTIVE):
+            start = time.monotonic()
+            try:
+                async with scheduler.slot(Priority.BACKGROUND):
+                    raise AssertionError("slot attribue malgre l'echeance")
+            except DeadlineExceeded as e:
+                assert e.priority is Priority.BACKGROUND and time.monotonic() - start < 0.5
+            try:
+                async with scheduler.slot(Priority.INTERACTIVE, deadline=time.monotonic() - 1):
+                    raise AssertionError("echeance deja passee")
+            except DeadlineExceeded:
+                pass
+            assert not any(scheduler.queued().values())
+        # Les slots liberes restent utilisables
+        async with scheduler.slot(Priority.BACKGROUND):
+            return scheduler.running
+
+    assert asyncio.run(run()) == 1
+    assert scheduler.dropped == {"interactive": 1, "batch": 0, "background": 1} and scheduler.running == 0
+    print("Echeances OK")
+
+
+class SaturatedScraper(CountingScraper):
+    async def search_hotels(self, request, priority=None, deadline=None):
+        raise DeadlineExceeded(Priority.INTERACTIVE, 30.0)
+
+
+def test_search_route_reports_dropped_scrape_as_unavailable():
+    original, search_route.SearchScraper = search_route.SearchScraper, SaturatedScraper
+    cache_factory, search_route.get_search_cache = search_route.get_search_cache, SearchCache
+    try:
+        response = TestClient(app).get("/api/v1/search_hotels", params={
+            "city": "Paris", "checkin": "2025-12-01", "checkout": "2025-12-03"})
+        assert response.status_code == 503 and "Echeance" in response.json()["detail"]
+    finally:
+        search_route.SearchScraper = original
+        search_route.get_search_cache = cache_factory
+    print("Scrape abandonne -> 503 OK")
+
+
+if __name__ == "__main__":
+    test_interactive_work_jumps_ahead_of_batch_and_background()
+    test_aged_background_work_is_not_starved()
+    test_expired_work_is_dropped_from_the_queue()
+    test_search_route_reports_dropped_scrape_as_unavailable()
+    print("\nTous les tests passent!")
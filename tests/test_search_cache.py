@@ -0,0 +1,163 @@
+"""Test du cache de recherche et du re-filtrage local des sur-ensembles."""
+import asyncio
+import sys
+from datetime import date
+from pathlib import Path
+
+# Ajouter le repertoire racine du projet au path Python
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from fastapi.testclient import TestClient
+
+from src.api.main import app
+from src.api.routes import search as search_route
+from src.models.search import HotelSearchRequest, HotelSearchResult, HotelSummary
+from src.scrapers.scheduler import Priority
+from src.storage import get_search_cache
+from src.storage.search_cache import SearchCache, refine
+
+CHECKIN, CHECKOUT = date(2025, 12, 1), date(2025, 12, 3)
+
+
+def make_request(**filters) -> HotelSearchRequest:
+    return HotelSearchRequest(city="Paris", checkin=CHECKIN, checkout=CHECKOUT, **filters)
+
+
+def make_result(request: HotelSearchRequest, count: int) -> HotelSearchResult:
+    hotels = [
+        HotelSummary(hotel_id=f"h{i}", name=f"Hotel {i}", url=f"/hotel/fr/h{i}.html",
+                     price=None if i == 3 else 100.0 + (i * 37) % 300,  # prix du sejour (2 nuits)
+                     review_score=6.0 + (i * 7) % 40 / 10, rating=float(1 + i % 5))
+        for i in range(count)
+    ]
+    return HotelSearchResult(request=request, hotels=hotels, total_found=count, scrape_timestamp="2025-11-20T10:00:00")
+
+
+def test_complete_superset_is_filtered_and_sorted_locally():
+    superset = make_result(make_request(), 20)
+    request = make_request(min_price=80, star_rating=[3, 4, 5], sort_by="price", max_results=10)
+
+    refined = refine(superset, request)
+
+    expected = sorted(
+        (h for h in superset.hotels if h.price is not None and h.price / 2 >= 80 and int(h.rating) in (3, 4, 5)),
+        key=lambda h: h.price
+    )[:10]
+    assert [h.hotel_id for h in refined.hotels] == [h.hotel_id for h in expected]
+    assert refined.request == request and refined.total_found == len(expected)
+
+    by_score = refine(superset, make_request(min_review_score=8.0, sort_by="review_score"))
+    scores = [h.review_score for h in by_score.hotels]
+    assert scores == sorted(scores, reverse=True) and min(scores) >= 8.0
+
+    # Hotels sans prix ou sans note en fin de liste, dans les deux sens de tri
+    by_price = refine(superset, make_request(sort_by="price"))
+    assert by_price.hotels[-1].hotel_id == "h3" and len(by_price.hotels) == 20
+    superset.hotels[0].review_score = None
+    by_score = refine(superset, make_request(sort_by="review_score"))
+    assert by_score.hotels[-1].hotel_id == "h0"
+    print("Re-filtrage local OK")
+
+
+def test_truncated_or_narrower_supersets_are_insufficient():
+    truncated = make_result(make_request(), 25)
+    assert refine(truncated, make_request(sort_by="price")) is None
+    # Meme tri, filtre plus strict mais assez d'hotels restants: OK
+    assert len(refine(truncated, make_request(min_review_score=7.0, max_results=5)).hotels) == 5
+    assert refine(truncated, make_request(min_review_score=9.5)) is None
+
+    narrower = make_result(make_request(min_price=100), 10)
+    assert refine(narrower, make_request(min_price=50)) is None
+    assert refine(narrower, make_request()) is None
+    assert refine(make_result(make_request(), 10), make_request(sort_by="distance")) is None
+    print("Sur-ensembles insuffisants OK")
+
+
+def test_cache_groups_by_base_page_and_expires():
+    cache = SearchCache(ttl=60)
+    cache.put(make_result(make_request(), 10))
+
+    assert cache.lookup(make_request(max_price=120)) is not None
+    assert cache.lookup(make_request(free_wifi=True)) is None
+    assert cache.lookup(HotelSearchRequest(city="Paris", checkin=CHECKIN, checkout=date(2025, 12, 4))) is None
+
+    cache.ttl = 0
+    assert cache.lookup(make_request()) is None and len(cache) == 0
+    print("Cle de page de base et TTL OK")
+
+
+class CountingScraper:
+    calls = 0
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        pass
+
+    async def search_hotels(self, request, priority=None, deadline=None):
+        CountingScraper.calls += 1
+        return make_result(request, 12)
+
+
+def test_filter_only_changes_do_not_rescrape():
+    cache = SearchCache()
+    original, search_route.SearchScraper = search_route.SearchScraper, CountingScraper
+    search_route.get_search_cache = lambda: cache
+    try:
+        client = TestClient(app)
+        params = {"city": "Paris", "checkin": "2025-12-01", "checkout": "2025-12-03"}
+        first = client.get("/api/v1/search_hotels", params=params).json()
+        second = client.get("/api/v1/search_hotels", params={**params, "min_price": 90, "sort_by": "price"}).json()
+        assert CountingScraper.calls == 1
+        assert len(first["hotels"]) == 12
+        prices = [h["price"] for h in second["hotels"]]
+        assert prices == sorted(prices) and min(prices) >= 180
+
+        client.get("/api/v1/search_hotels", params={**params, "checkout": "2025-12-05"})
+        assert CountingScraper.calls == 2
+    finally:
+        search_route.SearchScraper = original
+        search_route.get_search_cache = get_search_cache
+    print("Pas de re-scrape pour un changement de filtre OK")
+
+
+def test_urgent_request_does_not_wait_for_background_scrape():
+    cache = SearchCache()
+    request = make_request()
+    scrapes = []
+
+    async def run():
+        background_done = asyncio.Event()
+
+        async def scrape(priority, gate=None):
+            scrapes.append(priority)
+            if gate is not None:
+                await gate.wait()
+            return make_result(request, 5)
+
+        warm = asyncio.create_task(cache.fetch(request, lambda: scrape(Priority.BACKGROUND, background_done),
+                                               Priority.BACKGROUND))
+        await asyncio.sleep(0)
+        # Un autre scrape de fond rejoint celui en cours
+        joined = asyncio.create_task(cache.fetch(request, lambda: scrape(Priority.BACKGROUND), Priority.BACKGROUND))
+        # La requete interactive lance le sien et n'attend pas le scrape de fond bloque
+        live = await asyncio.wait_for(cache.fetch(request, lambda: scrape(Priority.INTERACTIVE)), 1)
+        assert not warm.done() and len(live.hotels) == 5
+        background_done.set()
+        await asyncio.gather(warm, joined)
+        return cache._inflight
+
+    assert asyncio.run(run()) == {}
+    assert scrapes == [Priority.BACKGROUND, Priority.INTERACTIVE]
+    print("Pas d'inversion de priorite sur un scrape en cours OK")
+
+
+if __name__ == "__main__":
+    test_complete_superset_is_filtered_and_sorted_locally()
+    test_truncated_or_narrower_supersets_are_insufficient()
+    test_cache_groups_by_base_page_and_expires()
+    test_filter_only_changes_do_not_rescrape()
+    test_urgent_request_does_not_wait_for_background_scrape()
+    print("\nTous les tests passent!")
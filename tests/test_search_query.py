@@ -0,0 +1,81 @@
+"""Test du compilateur de requetes de recherche (nflt canonique, cles stables, regroupement)."""
+import asyncio
+import sys
+from datetime import date
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+# Ajouter le repertoire racine du projet au path Python
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.models.search import HotelSearchRequest, HotelSearchResult
+from src.scrapers.query import compile_search, request_key
+from src.scrapers.search import SearchScraper
+from src.storage.search_cache import SearchCache, base_key
+
+CHECKIN, CHECKOUT = date(2025, 12, 1), date(2025, 12, 3)
+
+
+def make_request(**fields) -> HotelSearchRequest:
+    return HotelSearchRequest(**{"city": "Paris", "checkin": CHECKIN, "checkout": CHECKOUT, **fields})
+
+
+def test_all_filters_land_in_one_canonical_nflt():
+    request = make_request(
+        property_types=["APARTMENT", "HOTEL", "all"], star_rating=[5, 4, 5], min_review_score=8.0,
+        min_price=50, max_price=200, distance_from_center=2, meal_plan="1",
+        free_cancellation=True, free_wifi=True, pool=True, sort_by="price",
+    )
+    url = SearchScraper()._build_search_url(request)
+    params = parse_qs(urlparse(url).query)
+
+    assert params["nflt"] == [
+        "ht_id=201;ht_id=204;class=4;class=5;review_score=80;price=EUR-50-200-1;distance=2000;"
+        "mealplan=1;fc=1;hotelfacility=107;hotelfacility=433"
+    ]
+    assert params["order"] == ["price"] and "min_price" not in params and "mealplan" not in params
+    assert list(params) == ["ss", "checkin", "checkout", "group_adults", "group_children", "no_rooms", "nflt", "order"]
+    assert "nflt" not in parse_qs(urlparse(compile_search(make_request()).url()).query)
+    print("nflt canonique OK")
+
+
+def test_equivalent_requests_share_url_and_keys():
+    a = make_request(city="  Paris ", star_rating=[5, 4], property_types=["HOTEL", "all"],
+                     meal_plan="all", distance_from_center=0, min_price=0)
+    b = make_request(city="paris", star_rating=[4, 5, 4], property_types=["HOTEL"])
+    assert compile_search(a).key == compile_search(b).key and request_key(a) == request_key(b)
+    assert compile_search(a).url() == compile_search(make_request(star_rating=[4, 5], property_types=["HOTEL"])).url()
+
+    # Page de base: les filtres re-applicables localement et le tri sont ignores
+    assert base_key(a) == base_key(make_request(property_types=["HOTEL"], min_price=90, sort_by="price"))
+    assert base_key(a) != base_key(make_request(property_types=["APARTMENT"]))
+    assert base_key(a) != base_key(make_request(free_wifi=True))
+    assert request_key(a) != request_key(b.model_copy(update={"max_results": 10}))
+    print("Cles canoniques OK")
+
+
+def test_concurrent_equivalent_misses_share_one_scrape():
+    cache = SearchCache()
+    calls = []
+
+    async def scrape(request):
+        calls.append(request)
+        await asyncio.sleep(0.05)
+        return HotelSearchResult(request=request, hotels=[], total_found=0, scrape_timestamp="2025-11-20T10:00:00")
+
+    async def run():
+        requests = [make_request(star_rating=[4, 5]), make_request(city="PARIS", star_rating=[5, 4]), make_request(star_rating=[3])]
+        return await asyncio.gather(*(cache.fetch(r, lambda r=r: scrape(r)) for r in requests)), requests
+
+    results, requests = asyncio.run(run())
+    assert len(calls) == 2 and len(cache) == 2
+    assert [r.request for r in results] == requests
+    print("Regroupement des scrapes OK")
+
+
+if __name__ == "__main__":
+    test_all_filters_land_in_one_canonical_nflt()
+    test_equivalent_requests_share_url_and_keys()
+    test_concurrent_equivalent_misses_share_one_scrape()
+    print("\nTous les tests passent!")
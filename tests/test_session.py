@@ -0,0 +1,215 @@
+"""Test du pool de sessions storage_state (echauffement, rotation, expiration)."""
+import asyncio
+import sys
+import tempfile
+import time
+from contextlib import asynccontextmanager
+from pathlib import Path
+
+# Ajouter le repertoire racine du projet au path Python
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.scrapers.scheduler import Priority, ScrapeScheduler
+from src.scrapers.session import CONSENT_ACCEPT, CONSENT_BANNER, SessionManager
+
+
+class FakeElement:
+    def __init__(self, page):
+        self.page = page
+
+    async def is_visible(self):
+        return True
+
+    async def click(self, timeout=None):
+        self.page.consent_clicks += 1
+
+
+class FakePage:
+    def __init__(self, banner=True):
+        self.banner = banner
+        self.consent_clicks = 0
+        self.visited = []
+
+    async def goto(self, url, wait_until=None, timeout=None):
+        self.visited.append(url)
+
+    async def wait_for_timeout(self, ms):
+        return None
+
+    async def query_selector(self, selector):
+        if self.banner and selector in (CONSENT_BANNER, CONSENT_ACCEPT):
+            return FakeElement(self)
+        return None
+
+
+class FakeContext:
+    def __init__(self, browser, options):
+        self.browser = browser
+        self.options = options
+        self.page = FakePage()
+
+    async def new_page(self):
+        return self.page
+
+    async def storage_state(self):
+        self.browser.captures += 1
+        return {"cookies": [{"name": "OptanonConsent", "value": str(self.browser.captures), "expires": -1}],
+                "origins": []}
+
+    async def close(self):
+        pass
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.captures = 0
+        self.contexts = []
+
+    async def new_context(self, **options):
+        self.contexts.append(FakeContext(self, options))
+        return self.contexts[-1]
+
+
+def launcher_for(browser):
+    @asynccontextmanager
+    async def launch():
+        yield browser
+    return launch
+
+
+def test_pool_is_warmed_then_rotated_and_persisted():
+    with tempfile.TemporaryDirectory() as tmp:
+        warmer, browser = FakeBrowser(), FakeBrowser()
+        manager = SessionManager(tmp, pool_size=2, launcher=launcher_for(warmer))
+
+        async def open_contexts(manager, count):
+            first = await manager.new_context(browser, locale="en-US")
+            await manager.warmed()
+            return [first] + [await manager.new_context(browser, locale="en-US") for _ in range(count)]
+
+        opened = asyncio.run(open_contexts(manager, 4))
+
+        # Pool vide: premier contexte sans etat, echauffement en fond sur le Chromium dedie
+        assert opened[0][1] is None and "storage_state" not in opened[0][0].options
+        assert warmer.captures == 2 and browser.captures == 0
+        assert len(warmer.contexts) == 2 and all(c.page.consent_clicks == 1 for c in warmer.contexts)
+        assert all(c.options == {"locale": "en-US"} for c in warmer.contexts)
+        # Puis rotation sur les deux etats
+        used = [state.state_id for _, state in opened[1:]]
+        assert used[2:] == used[:2] and used[0] != used[1]
+        assert opened[1][0].options["storage_state"]["cookies"][0]["name"] == "OptanonConsent"
+        assert opened[1][0].options["locale"] == "en-US"
+
+        # Un nouveau process relit le pool sur disque sans nouvel echauffement
+        restarted = SessionManager(tmp, pool_size=2, launcher=launcher_for(warmer))
+        asyncio.run(open_contexts(restarted, 1))
+        assert warmer.captures == 2
+        assert sorted(s.uses for s in restarted.states) == [3, 3]
+    print("Echauffement, rotation et persistance OK")
+
+
+def test_warmup_never_blocks_and_backs_off_after_failure():
+    with tempfile.TemporaryDirectory() as tmp:
+        launches = []
+        gate = asyncio.Event()
+
+        @asynccontextmanager
+        async def slow_then_broken():
+            launches.append(time.monotonic())
+            await gate.wait()
+            raise RuntimeError("Chromium indisponible")
+            yield
+
+        manager = SessionManager(tmp, pool_size=2, launcher=slow_then_broken)
+
+        async def run():
+            # Echauffement bloque: les contextes partent tout de suite, sans etat, un seul lancement
+            start = time.monotonic()
+            states = [await manager.acquire() for _ in range(5)]
+            await asyncio.sleep(0.01)
+            assert states == [None] * 5 and time.monotonic() - start < 0.5 and len(launches) == 1
+            gate.set()
+            await manager.warmed()
+            # Echec: pas de nouvel essai avant la fin du backoff
+            assert await manager.acquire() is None and len(launches) == 1
+            manager._retry_at = 0.0
+            await manager.acquire()
+            await manager.warmed()
+            return manager._failures
+
+        assert asyncio.run(run()) == 2 and len(launches) == 2
+    print("Echauffement en fond et backoff OK")
+
+
+def test_warmup_takes_a_background_slot():
+    with tempfile.TemporaryDirectory() as tmp:
+        launches = []
+        scheduler = ScrapeScheduler(slots=1, max_queue=1)
+
+        @asynccontextmanager
+        async def counted():
+            launches.append(scheduler.running)
+            yield FakeBrowser()
+
+        manager = SessionManager(tmp, pool_size=1, launcher=counted, scheduler=scheduler)
+
+        async def run():
+            # Slot occupe par un scrape: le Chromium d'echauffement attend son tour
+            async with scheduler.slot(Priority.INTERACTIVE):
+                assert await manager.acquire() is None
+                await asyncio.sleep(0.01)
+                assert launches == [] and scheduler.queued()["background"] == 1
+            await manager.warmed()
+            assert launches == [1] and scheduler.running == 0 and len(manager.states) == 1
+
+            # File pleine: l'echauffement est refuse et differe comme un echec
+            saturated = ScrapeScheduler(slots=1, max_queue=0)
+            refused = SessionManager(tmp, pool_size=2, launcher=counted, scheduler=saturated)
+            async with saturated.slot(Priority.INTERACTIVE):
+                await refused.acquire()
+                await refused.warmed()
+            assert refused._failures == 1 and refused._retry_at > time.monotonic()
+            return launches
+
+        assert asyncio.run(run()) == [1]
+    print("Echauffement soumis a l'ordonnanceur OK")
+
+
+def test_expired_states_are_replaced():
+    with tempfile.TemporaryDirectory() as tmp:
+        warmer, browser = FakeBrowser(), FakeBrowser()
+        manager = SessionManager(tmp, pool_size=1, max_age=60, launcher=launcher_for(warmer))
+
+        async def warmed_context():
+            await manager.new_context(browser)
+            await manager.warmed()
+            return await manager.new_context(browser)
+
+        _, state = asyncio.run(warmed_context())
+
+        # Bandeau de consentement de retour sur une page: l'etat ne fonctionne plus
+        page = FakePage(banner=True)
+        assert asyncio.run(manager.check(page, state)) is False
+        assert page.consent_clicks == 1 and manager.states == [] and not state.path.exists()
+        assert asyncio.run(manager.check(FakePage(banner=False), None)) is True
+
+        _, fresh = asyncio.run(warmed_context())
+        assert fresh.state_id != state.state_id and warmer.captures == 2
+
+        # Etat trop ancien ou cookies expires -> re-echauffement
+        fresh.created_at = time.time() - 120
+        _, renewed = asyncio.run(warmed_context())
+        assert renewed.state_id != fresh.state_id
+        renewed.storage_state["cookies"][0]["expires"] = time.time() - 1
+        _, last = asyncio.run(warmed_context())
+        assert last.state_id != renewed.state_id and warmer.captures == 4
+    print("Expiration des sessions OK")
+
+
+if __name__ == "__main__":
+    test_pool_is_warmed_then_rotated_and_persisted()
+    test_warmup_never_blocks_and_backs_off_after_failure()
+    test_warmup_takes_a_background_slot()
+    test_expired_states_are_replaced()
+    print("\nTous les tests passent!")
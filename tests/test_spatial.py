@@ -0,0 +1,124 @@
+"""Test de l'index spatial du registre et des endpoints /hotels/nearby et /hotels/bbox."""
+import random
+import sys
+import tempfile
+from pathlib import Path
+
+# Ajouter le repertoire racine du projet au path Python
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from fastapi.testclient import TestClient
+
+from config.settings import settings
+from src.api.main import app
+from src.api.routes import hotels as hotels_route
+from src.models.hotel import HotelRecord
+from src.storage import HotelRegistry, get_hotel_registry
+from src.storage.spatial import GridIndex, haversine_km
+from tests.test_registry import search_result
+
+LOUVRE = (48.8634, 2.3354)
+
+
+def test_grid_queries_match_brute_force():
+    rng = random.Random(7)
+    points = {f"h{i}": (48.7 + rng.random() * 0.4, 2.1 + rng.random() * 0.5) for i in range(5000)}
+    index = GridIndex()
+    for key, (lat, lon) in points.items():
+        index.insert(key, lat, lon)
+    index.insert("h0", *LOUVRE)  # deplacement d'un point
+    points["h0"] = LOUVRE
+
+    distances = sorted((haversine_km(*LOUVRE, lat, lon), key) for key, (lat, lon) in points.items())
+    assert [key for key, _ in index.nearby(*LOUVRE, radius_km=2)] == [key for d, key in distances if d <= 2]
+    assert [key for key, _ in index.nearest(*LOUVRE, k=15)] == [key for _, key in distances[:15]]
+
+    box = (48.85, 2.30, 48.87, 2.36)
+    expected = {k for k, (lat, lon) in points.items() if box[0] <= lat <= box[2] and box[1] <= lon <= box[3]}
+    assert set(index.within_bbox(*box)) == expected
+    print("Index en grille OK")
+
+
+def test_nearby_endpoint_serves_registry_and_refreshes_stale_areas():
+    with tempfile.TemporaryDirectory() as tmp:
+        registry = HotelRegistry(str(Path(tmp) / "hotels.sqlite"))
+        registry.record_search(search_result("Paris"))
+        refreshed = []
+
+        async def refresh_area(registry, city):
+            refreshed.append(city)
+            return registry.record_search(search_result(city))
+
+        app.dependency_overrides[get_hotel_registry] = lambda: registry
+        original, hotels_route.refresh_area = hotels_route.refresh_area, refresh_area
+        try:
+            client = TestClient(app)
+            near = client.get("/api/v1/hotels/nearby", params={"lat": LOUVRE[0], "lon": LOUVRE[1], "radius_km": 3}).json()
+            assert [h["hotel_id"] for h in near["hotels"]] == ["hotel-du-louvre-paris", "moder-flat-heart-of-iveme"]
+            assert near["hotels"][0]["distance_km"] == 0 and not near["stale"]
+
+            box = client.get("/api/v1/hotels/bbox", params={
+                "min_lat": 45.7, "min_lon": 4.78, "max_lat": 45.8, "max_lon": 4.9, "city": "Lyon"
+            }).json()
+            # Zone inconnue -> perimee -> recherche live sur la ville puis nouvelle requete locale
+            assert refreshed == ["Lyon"] and box["refreshed"] and not box["stale"]
+            assert [h["hotel_id"] for h in box["hotels"]] == ["le-grand-hotel-lyon"]
+
+            registry.upsert([HotelRecord(**{**registry.get("hotel-du-louvre-paris").model_dump(),
+                                            "last_seen": "2020-01-01T00:00:00"})])
+            old = client.get("/api/v1/hotels/nearby", params={"lat": LOUVRE[0], "lon": LOUVRE[1], "radius_km": 0.5}).json()
+            assert old["stale"] and not old["refreshed"] and old["total"] == 1
+        finally:
+            hotels_route.refresh_area = original
+            app.dependency_overrides.pop(get_hotel_registry, None)
+    print("Endpoints geographiques OK")
+
+
+def test_search_without_coordinates_is_not_repeated():
+    with tempfile.TemporaryDirectory() as tmp:
+        registry = HotelRegistry(str(Path(tmp) / "hotels.sqlite"))
+        refreshed = []
+
+        async def refresh_area(registry, city):
+            # Resultats DOM seulement: des hotels, mais aucune coordonnee
+            refreshed.append(city)
+            return 0
+
+        app.dependency_overrides[get_hotel_registry] = lambda: registry
+        original, hotels_route.refresh_area = hotels_route.refresh_area, refresh_area
+        try:
+            client = TestClient(app)
+            params = {"min_lat": 43.2, "min_lon": 5.3, "max_lat": 43.4, "max_lon": 5.5, "city": "Marseille"}
+            first = client.get("/api/v1/hotels/bbox", params=params).json()
+            assert first["refreshed"] and first["stale"] and not first["refresh_skipped"]
+
+            again = client.get("/api/v1/hotels/bbox", params={**params, "city": " marseille"}).json()
+            assert refreshed == ["Marseille"] and again["refresh_skipped"] and not again["refreshed"]
+
+            # Apres le delai, la ville est de nouveau recherchee
+            hotels_route._unlocated["marseille"] -= settings.spatial_refresh_cooldown
+            client.get("/api/v1/hotels/bbox", params=params)
+            assert refreshed == ["Marseille", "Marseille"]
+        finally:
+            hotels_route.refresh_area = original
+            hotels_route._unlocated.pop("marseille", None)
+            app.dependency_overrides.pop(get_hotel_registry, None)
+    print("Pas de re-recherche sans coordonnees OK")
+
+
+def test_inverted_bbox_is_rejected():
+    client = TestClient(app)
+    valid = {"min_lat": 45.7, "min_lon": 4.78, "max_lat": 45.8, "max_lon": 4.9}
+    for inverted in ({**valid, "min_lat": 45.9}, {**valid, "min_lon": 179.0, "max_lon": -179.0}):
+        response = client.get("/api/v1/hotels/bbox", params=inverted)
+        assert response.status_code == 422 and "antimeridien" in response.json()["detail"]
+    print("Rectangle inverse refuse OK")
+
+
+if __name__ == "__main__":
+    test_grid_queries_match_brute_force()
+    test_nearby_endpoint_serves_registry_and_refreshes_stale_areas()
+    test_search_without_coordinates_is_not_repeated()
+    test_inverted_bbox_is_rejected()
+    print("\nTous les tests passent!")
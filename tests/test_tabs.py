@@ -0,0 +1,242 @@
+"""Test du mode multi-onglets de DetailsScraper (limite d'onglets par la memoire mesuree, lots)."""
+import asyncio
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Ajouter le repertoire racine du projet au path Python
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from fastapi.testclient import TestClient
+
+from config.settings import settings
+from src.api.main import app
+from src.api.routes import details as details_route
+from src.models.hotel import HotelDetails, HotelDetailsRequest
+from src.scrapers.details import DetailsScraper
+from src.scrapers.tabs import TabPool, get_tab_pool, tab_heap_mb
+from src.loadtest import MockBooking, MockSettings
+from src.loadtest.pages import render_hotel_page
+from src.storage import HotelRegistry, get_hotel_registry
+from tests.test_extraction import FakeContext, FakePage, HangingPage
+
+
+class HeapPage(FakePage):
+    def __init__(self, used):
+        self.used = used
+
+    async def evaluate(self, script, arg=None):
+        return self.used
+
+
+class FakeCDPSession:
+    def __init__(self, metrics):
+        self.metrics = metrics
+        self.detached = False
+
+    async def send(self, method, params=None):
+        return {"metrics": self.metrics} if method == "Performance.getMetrics" else {}
+
+    async def detach(self):
+        self.detached = True
+
+
+class CDPPage(HeapPage):
+    def __init__(self, metrics, used=None):
+        super().__init__(used)
+        self.session = FakeCDPSession(metrics)
+        self.context = self
+
+    async def new_cdp_session(self, page):
+        return self.session
+
+
+def test_tab_limit_follows_measured_memory():
+    pool = TabPool(max_tabs=4, heap_budget_mb=300)
+    assert pool.limit == 4
+    pool.observe(asyncio.run(tab_heap_mb(HeapPage(150 * 2 ** 20))))
+    assert pool.tab_heap_mb == 150 and pool.limit == 2
+    pool.observe(None)  # mesure indisponible: limite inchangee
+    assert pool.limit == 2
+    for _ in range(10):
+        pool.observe(40)
+    assert pool.limit == 4  # jamais au-dela de max_tabs
+    pool.observe(5000)
+    assert pool.limit == 1  # toujours au moins un onglet
+
+    assert asyncio.run(tab_heap_mb(FakePage())) is None
+    assert asyncio.run(tab_heap_mb(HeapPage({"unexpected": True}))) is None
+
+    # Mesure CDP (tas alloue, non arrondi) preferee a performance.memory
+    page = CDPPage([{"name": "Nodes", "value": 900}, {"name": "JSHeapTotalSize", "value": 96 * 2 ** 20}],
+                   used=10 * 2 ** 20)
+    assert asyncio.run(tab_heap_mb(page)) == 96 and page.session.detached
+    assert asyncio.run(tab_heap_mb(CDPPage([], used=10 * 2 ** 20))) == 10
+
+    async def run():
+        pool = TabPool(max_tabs=3)
+        peak = []
+
+        async def tab():
+            async with pool.slot():
+                peak.append(pool.in_use)
+                await asyncio.sleep(0.01)
+
+        await asyncio.gather(*(tab() for _ in range(8)))
+        return max(peak), pool.in_use
+
+    assert asyncio.run(run()) == (3, 0)
+    print("Limite d'onglets OK")
+
+
+def test_tab_estimate_is_shared_by_the_process():
+    first, second = DetailsScraper(), DetailsScraper()
+    assert first.tabs is second.tabs is get_tab_pool()
+
+    # Le pool partage sert d'une boucle a l'autre (un asyncio.run par requete en test)
+    pool = TabPool(max_tabs=1)
+
+    async def use():
+        async with pool.slot():
+            await asyncio.sleep(0)
+        return pool.in_use
+
+    assert asyncio.run(use()) == 0 and asyncio.run(use()) == 0
+
+    async def wait_for_free_tab():
+        entered = []
+
+        async def tab(name):
+            async with pool.slot():
+                entered.append(name)
+                await asyncio.sleep(0.01)
+
+        holder = asyncio.create_task(tab("a"))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(tab("b"))
+        await asyncio.sleep(0)
+        assert entered == ["a"]
+        await asyncio.gather(holder, waiter)
+        return entered
+
+    assert asyncio.run(wait_for_free_tab()) == ["a", "b"]
+    print("Estimation partagee par le processus OK")
+
+
+def test_get_many_runs_hotels_as_parallel_tabs():
+    scraper = DetailsScraper()
+    scraper.tabs = TabPool(max_tabs=2)
+    running, peak = [0], [0]
+
+    async def get_hotel_details(request, priority=None, deadline=None):
+        running[0] += 1
+        peak[0] = max(peak[0], running[0])
+        await asyncio.sleep(0.02)
+        running[0] -= 1
+        if request.hotel_id == "broken":
+            raise RuntimeError("page cassee")
+        return HotelDetails(hotel_id=request.hotel_id, name="Hotel", url="u", scrape_timestamp="t"), []
+
+    scraper.get_hotel_details = get_hotel_details
+    ids = ["a", "broken", "c", "d", "e"]
+    outcomes = asyncio.run(scraper.get_many([HotelDetailsRequest(hotel_id=i, country_code="fr") for i in ids]))
+
+    assert peak[0] == 2
+    assert isinstance(outcomes[1], RuntimeError)
+    assert [o[0].hotel_id for i, o in enumerate(outcomes) if i != 1] == ["a", "c", "d", "e"]
+    print("Hotels en onglets paralleles OK")
+
+
+class UnmeasurablePage(HangingPage):
+    """Page dont la session CDP ne s'ouvre jamais (mesure memoire bloquee)."""
+
+    def __init__(self, html):
+        super().__init__(html)
+        self.context = self
+        self.measured = 0
+
+    async def new_cdp_session(self, page):
+        self.measured += 1
+        await asyncio.Event().wait()
+
+
+def test_heap_is_sampled_only_for_batches_and_pages_always_close():
+    html = render_hotel_page(MockBooking(MockSettings()).hotel("le-grand-hotel-lyon"), lazy_sections=False)
+    request = HotelDetailsRequest(hotel_id="le-grand-hotel-lyon", country_code="fr", sections=["rooms"])
+    budget, fast_path = settings.details_budget, settings.fast_path
+    settings.details_budget, settings.fast_path = 0.3, False
+    try:
+        single = UnmeasurablePage(html)
+        scraper = DetailsScraper()
+        scraper.context, scraper.SCROLL_TIMEOUT = FakeContext(single), 0.05
+        asyncio.run(scraper.get_hotel_details(request))
+        assert single.measured == 0 and single.closed.is_set()
+
+        batched = UnmeasurablePage(html)
+        scraper = DetailsScraper()
+        scraper.context, scraper.SCROLL_TIMEOUT, scraper.tabs = FakeContext(batched), 0.05, TabPool(max_tabs=2)
+        start = time.monotonic()
+        outcomes = asyncio.run(scraper.get_many([request]))
+        # Mesure abandonnee apres HEAP_SAMPLE_TIMEOUT, onglet ferme quand meme
+        assert batched.measured == 1 and batched.closed.is_set() and time.monotonic() - start < 2
+        assert not isinstance(outcomes[0], BaseException) and scraper.tabs.tab_heap_mb is None
+    finally:
+        settings.details_budget, settings.fast_path = budget, fast_path
+    print("Mesure memoire limitee aux lots OK")
+
+
+class BatchScraper:
+    requests = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        pass
+
+    async def get_many(self, requests):
+        BatchScraper.requests = requests
+        return [RuntimeError("timeout") if r.hotel_id == "slow-hotel" else
+                (HotelDetails(hotel_id=r.hotel_id, name="Hotel", url="u", scrape_timestamp="t"), [])
+                for r in requests]
+
+
+def test_batch_route_reports_each_hotel():
+    with tempfile.TemporaryDirectory() as tmp:
+        registry = HotelRegistry(str(Path(tmp) / "hotels.sqlite"))
+        app.dependency_overrides[get_hotel_registry] = lambda: registry
+        scraper_cls, details_route.DetailsScraper = details_route.DetailsScraper, BatchScraper
+        try:
+            client = TestClient(app)
+            response = client.post("/api/v1/hotel_details/batch", json={"hotels": [
+                {"hotel_id": "le-grand-hotel-lyon"},
+                {"hotel_id": "999999"},
+                {"hotel_id": "slow-hotel", "country_code": "gb", "checkin": "2025-12-12", "checkout": "2025-12-15"},
+            ]})
+            assert response.status_code == 200
+            body = response.json()
+            assert (body["succeeded"], body["failed"]) == (1, 2)
+            assert [r["hotel_id"] for r in body["results"]] == ["le-grand-hotel-lyon", "999999", "slow-hotel"]
+            assert body["results"][0]["details"]["hotel_id"] == "le-grand-hotel-lyon"
+            assert "inconnu" in body["results"][1]["error"] and "timeout" in body["results"][2]["error"]
+            assert [(r.hotel_id, r.country_code) for r in BatchScraper.requests] == [("le-grand-hotel-lyon", "fr"), ("slow-hotel", "gb")]
+            assert registry.get("le-grand-hotel-lyon") is not None
+
+            too_many = {"hotels": [{"hotel_id": f"hotel-{i}"} for i in range(100)]}
+            assert client.post("/api/v1/hotel_details/batch", json=too_many).status_code == 422
+            assert client.post("/api/v1/hotel_details/batch", json={"hotels": []}).status_code == 422
+        finally:
+            details_route.DetailsScraper = scraper_cls
+            app.dependency_overrides.pop(get_hotel_registry, None)
+    print("Route /hotel_details/batch OK")
+
+
+if __name__ == "__main__":
+    test_tab_limit_follows_measured_memory()
+    test_tab_estimate_is_shared_by_the_process()
+    test_get_many_runs_hotels_as_parallel_tabs()
+    test_heap_is_sampled_only_for_batches_and_pages_always_close()
+    test_batch_route_reports_each_hotel()
+    print("\nTous les tests passent!")
@@ -0,0 +1,76 @@
+"""Test des spans de scraping et de l'export OTLP/JSON."""
+import asyncio
+import sys
+from pathlib import Path
+
+# Ajouter le repertoire racine du projet au path Python
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.utils.tracing import Trace, span, traced
+
+
+@traced()
+async def _extract_something():
+    await asyncio.sleep(0.01)
+    return 42
+
+
+@traced("parse")
+def _parse():
+    return "ok"
+
+
+def test_spans_nest_and_summarize():
+    trace = Trace("hotel_details", hotel_id="abc")
+
+    async def scrape():
+        with trace.activate():
+            with trace.span("navigation", url="http://localhost"):
+                _parse()
+            return await _extract_something()
+
+    assert asyncio.run(scrape()) == 42
+
+    names = [s.name for s in trace.spans]
+    assert names == ["navigation", "parse", "extract_something"]
+    navigation, parse, extract = trace.spans
+    assert parse.parent_id == navigation.span_id
+    assert extract.parent_id == trace.root.span_id
+    assert extract.duration_ms >= 10
+
+    summary = trace.summary()
+    assert summary["trace_id"] == trace.trace_id
+    assert summary["spans"][0]["attributes"] == {"url": "http://localhost"}
+    print("Spans OK")
+
+
+def test_otel_export_and_errors():
+    trace = Trace("search_hotels")
+    try:
+        with trace.activate():
+            with trace.span("wait_results"):
+                raise TimeoutError("90s")
+    except TimeoutError:
+        pass
+
+    spans = trace.to_otel()["resourceSpans"][0]["scopeSpans"][0]["spans"]
+    assert [s["name"] for s in spans] == ["search_hotels", "wait_results"]
+    assert spans[1]["status"] == {"code": 2, "message": "TimeoutError: 90s"}
+    assert spans[1]["parentSpanId"] == spans[0]["spanId"]
+    assert len(spans[0]["traceId"]) == 32
+    print("Export OTLP OK")
+
+
+def test_span_without_trace_is_noop():
+    with span("orphan") as s:
+        assert s is None
+    assert _parse() == "ok"
+    print("Span sans trace OK")
+
+
+if __name__ == "__main__":
+    test_spans_nest_and_summarize()
+    test_otel_export_and_errors()
+    test_span_without_trace_is_noop()
+    print("\nTous les tests passent!")
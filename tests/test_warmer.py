@@ -0,0 +1,125 @@
+"""Test du journal des requetes et du prechauffage des caches qui s'en nourrit."""
+import asyncio
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+# Ajouter le repertoire racine du projet au path Python
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from fastapi.testclient import TestClient
+
+from src.api import main
+from src.api.routes import search as search_route
+from src.storage import HotelRegistry, ReviewsStore, SearchCache, get_search_cache
+from src.utils.request_log import RequestLog, get_request_log, read_request_log
+from src.warmer import CacheWarmer, plan_warmup
+from src.warmer import warmer as warmer_module
+from tests.test_search_cache import CountingScraper
+
+CHECKIN = date.today() + timedelta(days=30)
+CHECKOUT = CHECKIN + timedelta(days=2)
+
+
+def search_entry(city: str, ts: float, checkin: date = CHECKIN, status: int = 200, **filters) -> dict:
+    query = f"city={city}&checkin={checkin}&checkout={checkin + timedelta(days=2)}"
+    query += "".join(f"&{k}={v}" for k, v in filters.items())
+    return {"ts": ts, "method": "GET", "path": "/api/v1/search_hotels", "query": query, "status": status}
+
+
+def test_plan_ranks_frequent_future_combinations():
+    now = time.time()
+    entries = [
+        search_entry("Paris", now, sort_by="price"),
+        search_entry("paris", now, min_price=80, sort_by="price"),
+        search_entry("Paris", now, max_price=200),
+        search_entry("Lyon", now),
+        search_entry("Nice", now, checkin=date.today() - timedelta(days=3)),  # dates passees
+        search_entry("Nice", now, checkin=date.today() - timedelta(days=3)),
+        search_entry("Lille", now - 30 * 86400),                                # hors fenetre
+        search_entry("Lille", now, status=500),                                # en echec
+        {"ts": now, "path": "/api/v1/hotel_details", "query": "hotel_id=le-grand-hotel-lyon&country_code=fr", "status": 200},
+        {"ts": now, "path": "/api/v1/hotel_reviews", "query": "hotel_id=le-grand-hotel-lyon&limit=10", "status": 200},
+        {"ts": now, "path": "/api/v1/hotel_details", "query": "hotel_id=123", "status": 404},
+    ]
+
+    targets = plan_warmup(entries, now=now)
+
+    assert [(t.cache, t.count) for t in targets] == [("search", 3), ("reviews", 2), ("search", 1)]
+    paris = targets[0].search
+    assert paris.city == "Paris" and paris.sort_by == "price" and paris.max_results == 25
+    assert paris.min_price is None and paris.max_price is None
+    assert targets[1].key == "le-grand-hotel-lyon" and targets[1].country_code == "fr"
+    assert targets[2].search.city == "Lyon"
+    assert len(plan_warmup(entries, top=1, now=now)) == 1
+    print("Plan de prechauffage OK")
+
+
+def test_request_log_rotates_by_size():
+    with tempfile.TemporaryDirectory() as tmp:
+        log = RequestLog(str(Path(tmp) / "requests.jsonl"), max_bytes=1000)
+        now = time.time()
+        for i in range(40):
+            log.append(search_entry(f"City{i}", now))
+        log.close()
+
+        # Deux fichiers au plus, chacun borne: la relecture ne grossit plus avec l'historique
+        files = sorted(p.name for p in Path(tmp).iterdir())
+        assert files == ["requests.jsonl", "requests.jsonl.1"]
+        assert all((Path(tmp) / name).stat().st_size < 1000 + 200 for name in files)
+        cities = [e["query"].split("&")[0] for e in read_request_log(str(log.path))]
+        assert 0 < len(cities) < 40 and cities[-1] == "city=City39"
+        assert cities == sorted(cities, key=lambda c: int(c[len("city=City"):]))
+    print("Rotation du journal OK")
+
+
+def test_logged_traffic_is_prewarmed_and_warm_hits_reported():
+    with tempfile.TemporaryDirectory() as tmp:
+        log = RequestLog(str(Path(tmp) / "requests.jsonl"))
+        live_cache = SearchCache()
+        originals = (search_route.SearchScraper, warmer_module.SearchScraper)
+        main.get_request_log = lambda: log
+        search_route.SearchScraper = warmer_module.SearchScraper = CountingScraper
+        search_route.get_search_cache = lambda: live_cache
+        try:
+            client = TestClient(main.app)
+            params = {"city": "Paris", "checkin": str(CHECKIN), "checkout": str(CHECKOUT)}
+            client.get("/api/v1/search_hotels", params=params)
+            client.get("/api/v1/search_hotels", params={**params, "min_price": 60})
+            client.get("/api/v1/search_hotels", params={**params, "city": "Lyon"})
+            entries = list(read_request_log(str(log.path)))
+            assert [e["status"] for e in entries] == [200, 200, 200] and "city=Lyon" in entries[2]["query"]
+            assert log.in_flight == 0
+
+            # Redemarrage: caches vides, le warmer rejoue les combinaisons du journal
+            warmer = CacheWarmer(str(log.path), SearchCache(), ReviewsStore(str(Path(tmp) / "reviews.sqlite")),
+                                 HotelRegistry(str(Path(tmp) / "hotels.sqlite")), pause=0)
+            calls = CountingScraper.calls
+            assert asyncio.run(warmer.warm_once()) == 2
+            assert CountingScraper.calls == calls + 2 and len(warmer.search_cache) == 2
+            assert asyncio.run(warmer.warm_once()) == 0  # entrees encore fraiches
+
+            search_route.get_search_cache = lambda: warmer.search_cache
+            client.get("/api/v1/search_hotels", params={**params, "max_price": 150})
+            client.get("/api/v1/search_hotels", params={**params, "city": "Nice"})
+            assert CountingScraper.calls == calls + 3
+
+            report = warmer.report()
+            assert report["caches"]["search"]["warm_hits"] == 1 and report["caches"]["search"]["lookups"] == 2
+            assert report["warm_hit_ratio"] == 0.5 and report["runs"] == 2
+        finally:
+            search_route.SearchScraper, warmer_module.SearchScraper = originals
+            search_route.get_search_cache = get_search_cache
+            main.get_request_log = get_request_log
+            log.close()
+    print("Prechauffage et ratio de hits chauds OK")
+
+
+if __name__ == "__main__":
+    test_plan_ranks_frequent_future_combinations()
+    test_request_log_rotates_by_size()
+    test_logged_traffic_is_prewarmed_and_warm_hits_reported()
+    print("\nTous les tests passent!")